@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Agent Backends for Enhanced Agent System
+Pluggable execution of individual agent consultations
+
+The orchestrator hands every consultation to an AgentBackend, so all
+orchestration patterns run unchanged whether agents are simulated
+in-process, executed in a process pool across cores, or served over HTTP.
+
+Backends:
+- SimulatedBackend: the original canned responses after a fixed latency (default)
+- InProcessBackend: calls an agent handler directly on the event loop
+- ProcessPoolBackend: runs a picklable agent handler in a ProcessPoolExecutor
+- HTTPBackend: POSTs the YAML consultation request to an agent service
+
+SimulatedAgentServer is a local HTTP stand-in serving simulated responses.
+"""
+
+import asyncio
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Callable, Optional
+import yaml
+import logging
+from consultation_protocol import ConsultationRequest, AgentResponse
+from consultation_scheduler import time_remaining
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMULATED_LATENCY = 0.1  # seconds
+DEFAULT_HTTP_TIMEOUT = 30.0
+
+# Handlers run in worker processes, so they must be module-level functions
+AgentHandler = Callable[[str, Dict[str, Any], ConsultationRequest], AgentResponse]
+
+def complementary_agents(agent_spec: Dict[str, Any]) -> List[str]:
+    """Agents an agent's spec names as parallel collaborators or next steps"""
+    orchestration = agent_spec.get('orchestration_integration', {})
+
+    complementary = []
+
+    # Parallel collaboration agents
+    for collab in orchestration.get('parallel_collaboration', []):
+        if 'agent' in collab:
+            complementary.append(collab['agent'])
+
+    # Sequential workflow next steps
+    complementary.extend(orchestration.get('sequential_workflow', {}).get('next_steps', []))
+
+    return complementary[:3]  # Limit to 3 suggestions
+
+def simulated_agent_response(agent_name: str, agent_spec: Dict[str, Any],
+                             request: ConsultationRequest) -> AgentResponse:
+    """Canned methodology-flavoured response (in real implementation, this would use the agent's actual logic)"""
+    methodology = agent_spec.get('agent_identity', {}).get('methodology', 'Generic methodology')
+
+    return AgentResponse(
+        status="success",
+        result={
+            "primary_recommendation": f"Strategic recommendation from {agent_name} using {methodology}",
+            "methodology_applied": methodology,
+            "specific_guidance": f"Detailed guidance based on {methodology} framework"
+        },
+        metadata={
+            "confidence": 0.85,
+            "methodology_applied": methodology,
+            "agent_name": agent_name,
+            "processing_time": "0.1s"
+        },
+        recommendations={
+            "complementary_consultations": complementary_agents(agent_spec),
+            "implementation_approach": "Follow methodology-specific implementation steps"
+        },
+        scope_boundaries=agent_spec.get('scope_boundaries', {}),
+        potential_conflicts=agent_spec.get('potential_conflicts', {})
+    )
+
+class AgentBackend:
+    """Executes one agent consultation; subclasses implement consult()"""
+
+    async def consult(self, agent_name: str, agent_spec: Dict[str, Any],
+                      request: ConsultationRequest) -> AgentResponse:
+        raise NotImplementedError
+
+    def close(self):
+        """Release any workers or connections held by the backend"""
+
+class SimulatedBackend(AgentBackend):
+    """In-process simulation: fixed latency, then a canned response"""
+
+    def __init__(self, latency: float = DEFAULT_SIMULATED_LATENCY):
+        self.latency = latency
+
+    async def consult(self, agent_name: str, agent_spec: Dict[str, Any],
+                      request: ConsultationRequest) -> AgentResponse:
+        # Simulate agent processing time
+        await asyncio.sleep(self.latency)
+        return simulated_agent_response(agent_name, agent_spec, request)
+
+class InProcessBackend(AgentBackend):
+    """Runs an agent handler inline; suited to handlers that are cheap or mostly waiting"""
+
+    def __init__(self, handler: AgentHandler = simulated_agent_response):
+        self.handler = handler
+
+    async def consult(self, agent_name: str, agent_spec: Dict[str, Any],
+                      request: ConsultationRequest) -> AgentResponse:
+        return self.handler(agent_name, agent_spec, request)
+
+class ProcessPoolBackend(AgentBackend):
+    """
+    Runs a CPU-bound agent handler in a pool of worker processes
+
+    The handler, spec and request are pickled to the worker; agent specs
+    travel with their hot sections only and load cold sections from disk in
+    the worker if the handler needs them. The pool is created on first use.
+    """
+
+    def __init__(self, handler: AgentHandler = simulated_agent_response, max_workers: Optional[int] = None):
+        self.handler = handler
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    async def consult(self, agent_name: str, agent_spec: Dict[str, Any],
+                      request: ConsultationRequest) -> AgentResponse:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool(), self.handler, agent_name, agent_spec, request)
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+class HTTPBackend(AgentBackend):
+    """
+    Consults agents served over HTTP using the YAML protocol
+
+    POST {base_url}/agents/{agent_name}/consult with the consultation_request
+    YAML as body; the reply is a response YAML document. Transport errors
+    become failed responses so patterns degrade like any other agent failure.
+    """
+
+    def __init__(self, base_url: str, timeout: float = DEFAULT_HTTP_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, agent_name: str, body: bytes, timeout: float) -> AgentResponse:
+        http_request = urllib.request.Request(
+            f"{self.base_url}/agents/{agent_name}/consult",
+            data=body,
+            headers={"Content-Type": "application/x-yaml"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(http_request, timeout=timeout) as reply:
+                return AgentResponse.from_yaml(reply.read().decode())
+        except (urllib.error.URLError, OSError, yaml.YAMLError) as e:
+            logger.warning(f"HTTP consultation of {agent_name} failed: {e}")
+            return AgentResponse(status="failed", errors=str(e))
+
+    async def consult(self, agent_name: str, agent_spec: Dict[str, Any],
+                      request: ConsultationRequest) -> AgentResponse:
+        # The worker thread cannot be cancelled, so it never outlives the consultation's budget
+        remaining = time_remaining()
+        timeout = self.timeout if remaining is None else max(0.001, min(self.timeout, remaining))
+        return await asyncio.to_thread(self._post, agent_name, request.to_yaml().encode(), timeout)
+
+class SimulatedAgentServer:
+    """
+    Local HTTP stand-in for agent services, answering with simulated responses
+
+    Usage:
+        with SimulatedAgentServer(agent_specs) as server:
+            backend = HTTPBackend(server.url)
+    """
+
+    def __init__(self, agent_specs: Dict[str, Dict[str, Any]], host: str = "127.0.0.1", port: int = 0):
+        specs = agent_specs
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) != 3 or parts[0] != "agents" or parts[2] != "consult":
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                data = yaml.safe_load(self.rfile.read(length)) or {}
+                try:
+                    request = ConsultationRequest.from_dict(data)
+                except ValueError as e:
+                    self.send_error(400, str(e))
+                    return
+                body = simulated_agent_response(parts[1], specs.get(parts[1], {}), request).to_yaml().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-yaml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'SimulatedAgentServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'SimulatedAgentServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
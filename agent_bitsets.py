@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Agent Bitsets for Enhanced Agent System
+Integer bitmask encoding of which agents cover which areas
+
+Each area (a scope area or an expertise trigger) gets a bit position, as
+does each agent. An agent is encoded as the int mask of its areas and an
+area as the int mask of its agents, so:
+
+- the areas two agents share are one AND of their masks,
+- the agents overlapping an agent are the OR of its areas' agent masks,
+- all overlapping pairs are found by visiting only the agents that actually
+  share an area, instead of intersecting sets for every pair of agents.
+
+Python ints are arbitrary-precision bitsets, so thousands of agents or areas
+need no extra dependencies.
+"""
+
+from typing import Dict, List, Iterable, Iterator, Optional, Set, Tuple
+from dataclasses import dataclass
+
+def _bits(mask: int) -> Iterator[int]:
+    """Positions of the set bits in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+@dataclass(frozen=True)
+class AgentBitIndex:
+    """Agents and the areas they cover, as int bitmasks in both directions"""
+    agents: Tuple[str, ...]                  # Bit position -> agent
+    areas: Tuple[str, ...]                   # Bit position -> area
+    agent_masks: Tuple[int, ...]             # Agent bit -> mask of area bits
+    area_members: Tuple[int, ...]            # Area bit -> mask of agent bits
+    agent_bits: Dict[str, int]
+    area_bits: Dict[str, int]
+
+    @classmethod
+    def build(cls, coverage: Dict[str, Iterable[str]]) -> 'AgentBitIndex':
+        """Encode agent -> areas; bit positions follow first appearance"""
+        agents = tuple(coverage)
+        agent_bits = {agent_name: bit for bit, agent_name in enumerate(agents)}
+        area_bits: Dict[str, int] = {}
+        agent_masks = []
+        area_members: List[int] = []
+        for agent_bit, agent_name in enumerate(agents):
+            mask = 0
+            for area in coverage[agent_name]:
+                area_bit = area_bits.get(area)
+                if area_bit is None:
+                    area_bit = area_bits[area] = len(area_members)
+                    area_members.append(0)
+                mask |= 1 << area_bit
+                area_members[area_bit] |= 1 << agent_bit
+            agent_masks.append(mask)
+        return cls(agents, tuple(area_bits), tuple(agent_masks), tuple(area_members), agent_bits, area_bits)
+
+    def areas_of(self, mask: int) -> List[str]:
+        return [self.areas[bit] for bit in _bits(mask)]
+
+    def agents_of(self, mask: int) -> List[str]:
+        return [self.agents[bit] for bit in _bits(mask)]
+
+    def agent_mask(self, agent_name: str) -> int:
+        bit = self.agent_bits.get(agent_name)
+        return self.agent_masks[bit] if bit is not None else 0
+
+    def shared_areas(self, agent1: str, agent2: str) -> List[str]:
+        return self.areas_of(self.agent_mask(agent1) & self.agent_mask(agent2))
+
+    def shared_area_masks(self) -> List[Tuple[str, int]]:
+        """Areas covered by more than one agent, with their agent masks"""
+        return [(area, members) for area, members in zip(self.areas, self.area_members)
+                if members.bit_count() > 1]
+
+    def overlapping_mask(self, agent_name: str) -> int:
+        """Agent bits of every other agent sharing at least one area with agent_name"""
+        bit = self.agent_bits.get(agent_name)
+        if bit is None:
+            return 0
+        mask = 0
+        for area_bit in _bits(self.agent_masks[bit]):
+            mask |= self.area_members[area_bit]
+        return mask & ~(1 << bit)
+
+    def overlap_pairs(self, among: Optional[Set[str]] = None) -> List[Tuple[str, str, List[str]]]:
+        """
+        Every pair of agents sharing areas, in agent order, with the shared areas
+
+        With among, only pairs involving those agents are returned.
+        """
+        among_mask = None
+        if among is not None:
+            among_mask = sum(1 << self.agent_bits[name] for name in among if name in self.agent_bits)
+
+        pairs = []
+        for bit, agent_name in enumerate(self.agents):
+            partners = self.overlapping_mask(agent_name) >> (bit + 1) << (bit + 1)  # Later agents only
+            if among_mask is not None and not (among_mask >> bit) & 1:
+                partners &= among_mask
+            mask = self.agent_masks[bit]
+            for partner in _bits(partners):
+                shared = mask & self.agent_masks[partner]
+                pairs.append((agent_name, self.agents[partner], sorted(self.areas_of(shared))))
+        return pairs
@@ -0,0 +1,716 @@
+#!/usr/bin/env python3
+"""
+Agent Registry for Enhanced Agent System
+Compiled, process-wide snapshot of the agent registry and agent specifications
+
+The Meta-Orchestrator, Intelligence Engine and Methodology Validator all share
+one snapshot instead of each re-reading the registry and agent files. Compiled
+snapshots, including the Intelligence Engine indexes, are cached on disk keyed
+by a content hash of the source files so warm starts skip parsing entirely.
+
+Agent specs are held as LazyAgentSpec proxies: the routing sections stay
+resident while large cold sections are read back from disk on first access.
+
+RegistryWatcher detects edited spec files by stat signature so a running
+process can re-parse only those files and patch its snapshot incrementally.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from dataclasses import dataclass, replace
+from pathlib import Path
+import logging
+from request_routing import RoutingIndex, build_routing_index
+from agent_bitsets import AgentBitIndex
+
+logger = logging.getLogger(__name__)
+
+# Default locations, resolved relative to this module rather than the working directory
+DEFAULT_BASE_PATH = Path(__file__).resolve().parent
+REGISTRY_FILENAME = "enhanced-agent-registry.json"
+AGENTS_DIRNAME = "agents"
+AGENT_SPEC_GLOB = "enhanced-*.json"
+DEFAULT_CACHE_DIRECTORY = DEFAULT_BASE_PATH / ".cache" / "agent-registry"
+
+# Bump whenever the snapshot or index layout changes to invalidate old cache files
+CACHE_FORMAT_VERSION = 8
+
+# Spec sections needed for routing and simulated consultation; everything else is cold
+HOT_SPEC_SECTIONS = (
+    "agent_identity",
+    "usage_triggers",
+    "orchestration_integration",
+    "scope_boundaries",
+    "potential_conflicts"
+)
+
+@dataclass(frozen=True)
+class RegistryIndexes:
+    """Context-independent indexes derived from the registered agent specs"""
+    expertise_areas: Dict[str, List[str]]
+    methodology_families: Dict[str, List[str]]
+    conflict_patterns: Dict[str, List[Dict[str, Any]]]
+    relevance_matrices: Dict[str, List[str]]
+    scope_coverage: Dict[str, List[str]]
+    scope_overlaps: List[Tuple[str, str, List[str]]]
+    scope_bits: AgentBitIndex
+    expertise_bits: AgentBitIndex
+
+class LazyAgentSpec(Mapping):
+    """
+    Read-only agent spec with a hot/cold split
+
+    Hot routing sections are held in memory. Cold sections such as
+    methodology_engine, output_schema and example_consultation are parsed
+    from the source file on first access and kept until release_cold().
+    """
+
+    __slots__ = ("source_path", "source_digest", "_hot", "_sections", "_cold")
+
+    def __init__(self, source_path: str, source_digest: str,
+                 hot: Dict[str, Any], sections: Tuple[str, ...]):
+        self.source_path = source_path
+        self.source_digest = source_digest
+        self._hot = hot
+        self._sections = sections
+        self._cold: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_spec(cls, source_path: str, source_digest: str, spec: Dict[str, Any]) -> 'LazyAgentSpec':
+        """Split a fully parsed spec, keeping only the hot sections resident"""
+        hot = {key: spec[key] for key in HOT_SPEC_SECTIONS if key in spec}
+        return cls(source_path, source_digest, hot, tuple(spec.keys()))
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._hot:
+            return self._hot[key]
+        if key in self._sections:
+            return self._load_cold()[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._sections
+
+    def __repr__(self) -> str:
+        return f"LazyAgentSpec({self.source_path!r}, cold_loaded={self.cold_loaded})"
+
+    @property
+    def cold_loaded(self) -> bool:
+        """Whether cold sections are currently resident"""
+        return self._cold is not None
+
+    def _load_cold(self) -> Dict[str, Any]:
+        """Parse the source file and keep only the cold sections"""
+        if self._cold is None:
+            raw = Path(self.source_path).read_bytes()
+            if _digest_bytes(raw) != self.source_digest:
+                logger.warning(f"Agent spec {self.source_path} changed since the registry was compiled")
+            spec = json.loads(raw)
+            self._cold = {key: value for key, value in spec.items() if key not in self._hot}
+        return self._cold
+
+    def release_cold(self):
+        """Drop resident cold sections; they are re-read on next access"""
+        self._cold = None
+
+    def __getstate__(self):
+        # Cold sections are never persisted; they always come from the source file
+        return (self.source_path, self.source_digest, self._hot, self._sections)
+
+    def __setstate__(self, state):
+        self.source_path, self.source_digest, self._hot, self._sections = state
+        self._cold = None
+
+@dataclass(frozen=True)
+class AgentRegistrySnapshot:
+    """
+    Immutable compiled view of the registry and all agent specifications
+
+    Snapshots are shared between every consumer in the process, so the
+    contained dictionaries must be treated as read-only.
+    """
+    registry_path: str
+    agents_directory: str
+    registry: Dict[str, Any]
+    agent_specs: Dict[str, LazyAgentSpec]       # Keyed by agent_identity.name
+    registered_specs: Dict[str, LazyAgentSpec]  # Keyed by registry entry (enhanced-*)
+    indexes: RegistryIndexes
+    routing: RoutingIndex                        # Inverted trigger index over agent_specs
+    source_digests: Dict[str, str]               # Source file path -> content digest
+    fingerprint: str
+    source_signature: tuple = ()                 # Stat signature observed before reading sources
+
+    @property
+    def registered_agent_names(self) -> List[str]:
+        """Agent entries listed in the registry categories, in registry order"""
+        names = []
+        for category_data in self.registry.get("agent_categories", {}).values():
+            names.extend(category_data.get("agents", []))
+        return names
+
+# Process-wide snapshot cache keyed by resolved (registry_path, agents_directory)
+_snapshots: Dict[Tuple[str, str], AgentRegistrySnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+def build_expertise_graph(agent_specs: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Build trigger -> agents and methodology family -> agents relationships"""
+    expertise_areas = {}
+    methodology_families = {}
+
+    for agent_name, spec in agent_specs.items():
+        # Extract expertise areas
+        usage_triggers = spec.get("usage_triggers", [])
+        methodology = spec.get("agent_identity", {}).get("methodology", "")
+
+        for trigger in usage_triggers:
+            if trigger not in expertise_areas:
+                expertise_areas[trigger] = []
+            expertise_areas[trigger].append(agent_name)
+
+        # Group by methodology families
+        if methodology:
+            family = methodology.split()[0] if methodology else "general"
+            if family not in methodology_families:
+                methodology_families[family] = []
+            methodology_families[family].append(agent_name)
+
+    return expertise_areas, methodology_families
+
+def build_conflict_patterns(agent_specs: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Build known conflict patterns from agent specs"""
+    patterns = {}
+
+    for agent_name, spec in agent_specs.items():
+        potential_conflicts = spec.get("potential_conflicts", {})
+        for conflict_key, conflict_desc in potential_conflicts.items():
+            if conflict_key not in patterns:
+                patterns[conflict_key] = []
+            patterns[conflict_key].append({
+                "agent": agent_name,
+                "description": conflict_desc
+            })
+
+    return patterns
+
+def build_relevance_matrices(agent_specs: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Build context relevance matrices for each agent"""
+    relevance_matrices = {}
+
+    for agent_name, spec in agent_specs.items():
+        # Extract relevant context types from input schema
+        input_schema = spec.get("input_schema", {}).get("consultation_request", {})
+        context_schema = input_schema.get("context", {})
+
+        relevant_contexts = []
+        if isinstance(context_schema, dict):
+            relevant_contexts = list(context_schema.keys())
+
+        relevance_matrices[agent_name] = relevant_contexts
+
+    return relevance_matrices
+
+def build_scope_coverage(agent_specs: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Areas each agent's scope_boundaries say it covers"""
+    scope_coverage = {}
+    for agent_name, spec in agent_specs.items():
+        covers = spec.get("scope_boundaries", {}).get("covers", "")
+        if covers:
+            scope_coverage[agent_name] = covers.split(", ")
+    return scope_coverage
+
+def build_expertise_bits(expertise_areas: Dict[str, List[str]], agents: Iterable[str]) -> AgentBitIndex:
+    """Bitset form of the trigger -> agents graph, with agent bits in registry order"""
+    coverage: Dict[str, List[str]] = {agent_name: [] for agent_name in agents}
+    for trigger, trigger_agents in expertise_areas.items():
+        for agent_name in trigger_agents:
+            coverage.setdefault(agent_name, []).append(trigger)
+    return AgentBitIndex.build(coverage)
+
+def build_registry_indexes(agent_specs: Dict[str, Dict[str, Any]]) -> RegistryIndexes:
+    """Build every context-independent index over the given specs"""
+    expertise_areas, methodology_families = build_expertise_graph(agent_specs)
+    scope_coverage = build_scope_coverage(agent_specs)
+    scope_bits = AgentBitIndex.build(scope_coverage)
+    return RegistryIndexes(
+        expertise_areas=expertise_areas,
+        methodology_families=methodology_families,
+        conflict_patterns=build_conflict_patterns(agent_specs),
+        relevance_matrices=build_relevance_matrices(agent_specs),
+        scope_coverage=scope_coverage,
+        scope_overlaps=scope_bits.overlap_pairs(),
+        scope_bits=scope_bits,
+        expertise_bits=build_expertise_bits(expertise_areas, agent_specs)
+    )
+
+def _resolve_paths(registry_path: Optional[str] = None,
+                   agents_directory: Optional[str] = None) -> Tuple[Path, Path]:
+    """Resolve registry and agents directory, defaulting to the repository layout"""
+    if registry_path is None:
+        registry = DEFAULT_BASE_PATH / REGISTRY_FILENAME
+    else:
+        registry = Path(registry_path)
+
+    if agents_directory is None:
+        agents = registry.parent / AGENTS_DIRNAME
+    else:
+        agents = Path(agents_directory)
+
+    return registry.resolve(), agents.resolve()
+
+def _read_source_files(registry_file: Path, agents_dir: Path) -> Dict[str, bytes]:
+    """Read the raw bytes of the registry and every agent spec file"""
+    sources = {}
+    try:
+        sources[str(registry_file)] = registry_file.read_bytes()
+    except FileNotFoundError:
+        logger.warning(f"Agent registry not found at {registry_file}")
+
+    for agent_file in sorted(agents_dir.glob(AGENT_SPEC_GLOB)):
+        sources[str(agent_file)] = agent_file.read_bytes()
+
+    return sources
+
+def _stat_sources(registry_file: Path, agents_dir: Path) -> Dict[str, Tuple[int, int, int]]:
+    """Map each existing source file to its (size, mtime, inode), registry first"""
+    paths = [registry_file] + sorted(agents_dir.glob(AGENT_SPEC_GLOB))
+    stats = {}
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        stats[str(path)] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    return stats
+
+def _stat_signature(registry_file: Path, agents_dir: Path) -> Tuple[Tuple[str, int, int, int], ...]:
+    """Cheap (path, size, mtime, inode) signature of all source files"""
+    return tuple((path,) + stat for path, stat in _stat_sources(registry_file, agents_dir).items())
+
+def _digest_bytes(raw: bytes) -> str:
+    """Content digest of a single source file"""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def _fingerprint_digests(source_digests: Dict[str, str]) -> str:
+    """Content hash of all source files, including their paths and the cache format"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode())
+    for path in sorted(source_digests):
+        digest.update(path.encode())
+        digest.update(b"\0")
+        digest.update(source_digests[path].encode())
+    return digest.hexdigest()
+
+def _fingerprint_sources(sources: Dict[str, bytes]) -> str:
+    """Content hash of raw source files"""
+    return _fingerprint_digests({path: _digest_bytes(raw) for path, raw in sources.items()})
+
+def _cache_prefix(registry_file: Path, agents_dir: Path) -> str:
+    """Stable per-location prefix so stale cache files for the same paths can be pruned"""
+    location = f"{registry_file}\0{agents_dir}".encode()
+    return hashlib.blake2b(location, digest_size=8).hexdigest()
+
+def _compile_from_sources(registry_file: Path, agents_dir: Path,
+                          sources: Dict[str, bytes], signature: tuple = ()) -> AgentRegistrySnapshot:
+    """Parse source bytes and build the snapshot with its indexes"""
+    source_digests = {path: _digest_bytes(raw) for path, raw in sources.items()}
+
+    # Load the registry
+    registry = {}
+    if str(registry_file) in sources:
+        registry = json.loads(sources[str(registry_file)])
+
+    # Parse each agent spec file exactly once
+    full_specs = {}
+    specs_by_file = {}
+    for path, raw in sources.items():
+        if path != str(registry_file):
+            spec = json.loads(raw)
+            full_specs[Path(path).stem] = spec
+            specs_by_file[Path(path).stem] = LazyAgentSpec.from_spec(path, source_digests[path], spec)
+
+    # Orchestrator view: keyed by the agent's own name
+    agent_specs = {}
+    for spec in specs_by_file.values():
+        agent_specs[spec['agent_identity']['name']] = spec
+
+    # Intelligence view: agents listed in the registry, keyed by registry entry
+    registered_specs = {}
+    for category_data in registry.get("agent_categories", {}).values():
+        for agent_name in category_data.get("agents", []):
+            if agent_name in specs_by_file:
+                registered_specs[agent_name] = specs_by_file[agent_name]
+            else:
+                logger.warning(f"Agent spec not found: {agent_name}")
+
+    # Indexes need cold sections (input_schema), so build them before the full specs are dropped
+    indexes = build_registry_indexes({name: full_specs[name] for name in registered_specs})
+
+    logger.info(f"Compiled agent registry with {len(agent_specs)} agent specs from {agents_dir}")
+
+    return AgentRegistrySnapshot(
+        registry_path=str(registry_file),
+        agents_directory=str(agents_dir),
+        registry=registry,
+        agent_specs=agent_specs,
+        registered_specs=registered_specs,
+        indexes=indexes,
+        routing=build_routing_index(agent_specs),
+        source_digests=source_digests,
+        fingerprint=_fingerprint_digests(source_digests),
+        source_signature=signature
+    )
+
+def compile_agent_registry(registry_path: Optional[str] = None,
+                           agents_directory: Optional[str] = None) -> AgentRegistrySnapshot:
+    """Read the registry and every agent spec once and compile them into a snapshot"""
+    registry_file, agents_dir = _resolve_paths(registry_path, agents_directory)
+    signature = _stat_signature(registry_file, agents_dir)
+    return _compile_from_sources(registry_file, agents_dir, _read_source_files(registry_file, agents_dir), signature)
+
+def _load_stat_index(index_file: Path) -> Tuple[tuple, Optional[str]]:
+    """Load the (stat signature, content fingerprint) pair recorded for a location"""
+    try:
+        with open(index_file, 'rb') as f:
+            version, signature, fingerprint = pickle.load(f)
+        if version != CACHE_FORMAT_VERSION:
+            return (), None
+        return signature, fingerprint
+    except FileNotFoundError:
+        return (), None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable registry cache index {index_file}: {e}")
+        return (), None
+
+def _store_stat_index(index_file: Path, signature: tuple, fingerprint: str):
+    """Record which content fingerprint the current stat signature maps to"""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=index_file.parent, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((CACHE_FORMAT_VERSION, signature, fingerprint), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, index_file)
+    except OSError as e:
+        logger.warning(f"Could not write registry cache index {index_file}: {e}")
+
+def _load_cached_snapshot(cache_file: Path) -> Optional[AgentRegistrySnapshot]:
+    """Load a pickled snapshot, treating any unreadable cache file as a miss"""
+    try:
+        with open(cache_file, 'rb') as f:
+            snapshot = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable registry cache {cache_file}: {e}")
+        return None
+
+    return snapshot if isinstance(snapshot, AgentRegistrySnapshot) else None
+
+def _store_cached_snapshot(cache_dir: Path, prefix: str, snapshot: AgentRegistrySnapshot):
+    """Atomically write the snapshot cache and prune stale entries for the same location"""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache_file = cache_dir / f"{prefix}-{snapshot.fingerprint}.pickle"
+
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_file)
+
+        for stale in cache_dir.glob(f"{prefix}-*.pickle"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not write registry cache to {cache_dir}: {e}")
+
+def load_agent_registry_snapshot(registry_path: Optional[str] = None,
+                                 agents_directory: Optional[str] = None,
+                                 cache_directory: Optional[str] = None,
+                                 use_cache: bool = True) -> AgentRegistrySnapshot:
+    """
+    Load a snapshot from the on-disk cache, compiling and caching it on a miss
+
+    The cache key is a hash of the registry and agent spec contents, so editing
+    any spec invalidates it automatically. A small stat index maps unchanged
+    file (size, mtime, inode) signatures to their content hash, so a warm start
+    only stats the sources and unpickles the snapshot; no JSON is parsed and no
+    index is built.
+    """
+    registry_file, agents_dir = _resolve_paths(registry_path, agents_directory)
+
+    if not use_cache:
+        return compile_agent_registry(str(registry_file), str(agents_dir))
+
+    cache_dir = Path(cache_directory) if cache_directory else DEFAULT_CACHE_DIRECTORY
+    prefix = _cache_prefix(registry_file, agents_dir)
+    index_file = cache_dir / f"{prefix}.index"
+
+    # Fast path: unchanged file stats mean the recorded content hash still applies
+    signature = _stat_signature(registry_file, agents_dir)
+    recorded_signature, fingerprint = _load_stat_index(index_file)
+    sources = None
+    if fingerprint is None or recorded_signature != signature:
+        sources = _read_source_files(registry_file, agents_dir)
+        fingerprint = _fingerprint_sources(sources)
+
+    snapshot = _load_cached_snapshot(cache_dir / f"{prefix}-{fingerprint}.pickle")
+    if snapshot is not None:
+        if recorded_signature != signature:
+            _store_stat_index(index_file, signature, fingerprint)
+        logger.info(f"Loaded agent registry from cache ({len(snapshot.agent_specs)} agent specs)")
+        return replace(snapshot, source_signature=signature)
+
+    if sources is None:
+        sources = _read_source_files(registry_file, agents_dir)
+
+    snapshot = _compile_from_sources(registry_file, agents_dir, sources, signature)
+    _store_cached_snapshot(cache_dir, prefix, snapshot)
+    _store_stat_index(index_file, signature, snapshot.fingerprint)
+    return snapshot
+
+def get_agent_registry(registry_path: Optional[str] = None,
+                       agents_directory: Optional[str] = None,
+                       reload: bool = False,
+                       cache_directory: Optional[str] = None,
+                       use_cache: bool = True) -> AgentRegistrySnapshot:
+    """
+    Return the shared registry snapshot, loading it on first use
+
+    Subsequent calls with the same paths return the same snapshot object
+    without touching the filesystem.
+    """
+    key = tuple(str(path) for path in _resolve_paths(registry_path, agents_directory))
+
+    snapshot = _snapshots.get(key)
+    if snapshot is not None and not reload:
+        return snapshot
+
+    with _snapshots_lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None or reload:
+            snapshot = load_agent_registry_snapshot(*key, cache_directory=cache_directory,
+                                                    use_cache=use_cache)
+            _snapshots[key] = snapshot
+        return snapshot
+
+def store_agent_registry_snapshot(snapshot: AgentRegistrySnapshot,
+                                  signature: Optional[tuple] = None,
+                                  cache_directory: Optional[str] = None):
+    """
+    Persist a snapshot (for example after a hot reload) to the on-disk cache
+
+    Pass the stat signature observed before the sources were read so a file
+    edited mid-reload can never be mapped to the older content hash.
+    """
+    registry_file, agents_dir = Path(snapshot.registry_path), Path(snapshot.agents_directory)
+    cache_dir = Path(cache_directory) if cache_directory else DEFAULT_CACHE_DIRECTORY
+    prefix = _cache_prefix(registry_file, agents_dir)
+
+    _store_cached_snapshot(cache_dir, prefix, snapshot)
+    if signature is not None:
+        _store_stat_index(cache_dir / f"{prefix}.index", signature, snapshot.fingerprint)
+
+def publish_agent_registry(snapshot: AgentRegistrySnapshot):
+    """Make a snapshot the shared one returned by get_agent_registry for its paths"""
+    with _snapshots_lock:
+        _snapshots[(snapshot.registry_path, snapshot.agents_directory)] = snapshot
+
+def patch_registry_indexes(indexes: RegistryIndexes, registered_specs: Dict[str, Dict[str, Any]],
+                           removed: List[str], updated: Dict[str, Dict[str, Any]]) -> RegistryIndexes:
+    """
+    Incrementally patch indexes for removed and re-parsed agents
+
+    The result matches a full compile of registered_specs, including the
+    order of every key and list. Indexes over hot sections are rebuilt in
+    registry order, which reads no spec files; relevance matrices (cold
+    input_schema) and scope overlaps (pairwise) are patched and re-ordered.
+    Containers are never mutated, so the previous indexes stay valid for
+    anything still reading them.
+    """
+    stale = set(removed) | set(updated)
+
+    expertise_areas, methodology_families = build_expertise_graph(registered_specs)
+
+    additions = build_relevance_matrices(updated)
+    relevance_matrices = {name: additions[name] if name in stale else indexes.relevance_matrices[name]
+                          for name in registered_specs}
+
+    # Unchanged pairs are kept; pairs involving re-parsed agents are recomputed against everyone
+    scope_coverage = build_scope_coverage(registered_specs)
+    scope_bits = AgentBitIndex.build(scope_coverage)
+    bit_of = scope_bits.agent_bits
+    scope_overlaps = [(agent1, agent2, areas) if bit_of[agent1] < bit_of[agent2] else (agent2, agent1, areas)
+                      for agent1, agent2, areas in indexes.scope_overlaps
+                      if agent1 not in stale and agent2 not in stale]
+    scope_overlaps.extend(scope_bits.overlap_pairs(among=set(updated)))
+    # Registry edits can reorder agents, so pairs are oriented and sorted by bit order like overlap_pairs
+    scope_overlaps.sort(key=lambda pair: (bit_of[pair[0]], bit_of[pair[1]]))
+
+    return RegistryIndexes(
+        expertise_areas=expertise_areas,
+        methodology_families=methodology_families,
+        conflict_patterns=build_conflict_patterns(registered_specs),
+        relevance_matrices=relevance_matrices,
+        scope_coverage=scope_coverage,
+        scope_overlaps=scope_overlaps,
+        scope_bits=scope_bits,
+        expertise_bits=build_expertise_bits(expertise_areas, registered_specs)
+    )
+
+@dataclass(frozen=True)
+class RegistryChanges:
+    """Source files that changed since the watcher's last synchronized state"""
+    added: Tuple[str, ...] = ()
+    modified: Tuple[str, ...] = ()
+    removed: Tuple[str, ...] = ()
+    registry_changed: bool = False
+    signature: tuple = ()
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.removed or self.registry_changed)
+
+class RegistryWatcher:
+    """
+    Stat-based change detector for the registry and agent spec files
+
+    Compares (size, mtime, inode) so both in-place edits and atomic
+    rename-over saves are detected without reading file contents.
+    """
+
+    def __init__(self, snapshot: AgentRegistrySnapshot):
+        self.registry_file = Path(snapshot.registry_path)
+        self.agents_directory = Path(snapshot.agents_directory)
+        # Start from the state the snapshot was read at, so edits made since are picked up
+        if snapshot.source_signature:
+            self._stats = {entry[0]: tuple(entry[1:]) for entry in snapshot.source_signature}
+        else:
+            self._stats = _stat_sources(self.registry_file, self.agents_directory)
+
+    def poll(self) -> RegistryChanges:
+        """Report changed files without adopting them; call synchronize() once applied"""
+        current = _stat_sources(self.registry_file, self.agents_directory)
+        registry_key = str(self.registry_file)
+
+        added, modified, removed = [], [], []
+        for path, stat in current.items():
+            if path == registry_key:
+                continue
+            if path not in self._stats:
+                added.append(path)
+            elif self._stats[path] != stat:
+                modified.append(path)
+        for path in self._stats:
+            if path != registry_key and path not in current:
+                removed.append(path)
+
+        return RegistryChanges(
+            added=tuple(added),
+            modified=tuple(modified),
+            removed=tuple(removed),
+            registry_changed=current.get(registry_key) != self._stats.get(registry_key),
+            signature=tuple((path,) + stat for path, stat in current.items())
+        )
+
+    def synchronize(self, changes: RegistryChanges):
+        """Adopt the file state observed by poll() after it has been applied"""
+        self._stats = {entry[0]: tuple(entry[1:]) for entry in changes.signature}
+
+def apply_registry_changes(snapshot: AgentRegistrySnapshot, changes: RegistryChanges) -> AgentRegistrySnapshot:
+    """
+    Build a new snapshot by re-parsing only the changed files
+
+    The previous snapshot is left untouched so consultations already running
+    against it keep a consistent view; callers swap in the returned snapshot.
+    """
+    registry_file = Path(snapshot.registry_path)
+    source_digests = dict(snapshot.source_digests)
+
+    registry = snapshot.registry
+    if changes.registry_changed:
+        try:
+            raw = registry_file.read_bytes()
+            registry = json.loads(raw)
+            source_digests[str(registry_file)] = _digest_bytes(raw)
+        except FileNotFoundError:
+            logger.warning(f"Agent registry not found at {registry_file}")
+            registry = {}
+            source_digests.pop(str(registry_file), None)
+
+    # Unchanged specs are carried over as the same objects
+    specs_by_file = {Path(spec.source_path).stem: spec for spec in snapshot.agent_specs.values()}
+    for path in changes.removed:
+        specs_by_file.pop(Path(path).stem, None)
+        source_digests.pop(path, None)
+
+    full_updates = {}
+    for path in changes.added + changes.modified:
+        raw = Path(path).read_bytes()
+        spec = json.loads(raw)
+        source_digests[path] = _digest_bytes(raw)
+        full_updates[Path(path).stem] = spec
+        specs_by_file[Path(path).stem] = LazyAgentSpec.from_spec(path, source_digests[path], spec)
+
+    agent_specs = {}
+    for stem in sorted(specs_by_file):
+        spec = specs_by_file[stem]
+        agent_specs[spec['agent_identity']['name']] = spec
+
+    registered_specs = {}
+    for category_data in registry.get("agent_categories", {}).values():
+        for agent_name in category_data.get("agents", []):
+            if agent_name in specs_by_file:
+                registered_specs[agent_name] = specs_by_file[agent_name]
+            else:
+                logger.warning(f"Agent spec not found: {agent_name}")
+
+    # Only agents whose spec or registration changed are re-indexed
+    previously_registered = set(snapshot.registered_specs)
+    removed = [name for name in previously_registered
+               if name not in registered_specs or name in full_updates]
+    updated = {}
+    for name, spec in registered_specs.items():
+        if name in full_updates:
+            updated[name] = full_updates[name]
+        elif name not in previously_registered:
+            updated[name] = dict(spec)  # Newly registered: needs cold sections for indexing
+
+    indexes = snapshot.indexes
+    if removed or updated or list(registered_specs) != list(snapshot.registered_specs):
+        indexes = patch_registry_indexes(snapshot.indexes, registered_specs, removed, updated)
+
+    # The trigger automaton is global, so it is recompiled rather than patched
+    routing = snapshot.routing
+    if full_updates or changes.removed:
+        routing = build_routing_index(agent_specs)
+
+    logger.info(f"Reloaded agent registry: {len(changes.added)} added, {len(changes.modified)} modified, "
+                f"{len(changes.removed)} removed")
+
+    return AgentRegistrySnapshot(
+        registry_path=snapshot.registry_path,
+        agents_directory=snapshot.agents_directory,
+        registry=registry,
+        agent_specs=agent_specs,
+        registered_specs=registered_specs,
+        indexes=indexes,
+        routing=routing,
+        source_digests=source_digests,
+        fingerprint=_fingerprint_digests(source_digests),
+        source_signature=changes.signature
+    )
+
+def clear_agent_registry_cache():
+    """Drop all in-process snapshots so the next lookup reloads from disk"""
+    with _snapshots_lock:
+        _snapshots.clear()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Batch Routing for Enhanced Agent System
+Streams consultation requests from JSONL and writes routing decisions as JSONL
+
+Records are either consultation requests ({"objective", "context", ...}) or
+work orders ({"request_id", "title", "body"}). Input is read and routed in
+bounded chunks, so files of any size are processed in constant memory.
+
+Usage: python batch_routing.py requests.jsonl decisions.jsonl
+"""
+
+import json
+import sys
+import time
+from itertools import islice
+from typing import Dict, Any, Iterator, Optional, Tuple
+import logging
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest, DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+def read_consultation_requests(input_path: str, stats: Optional[Dict[str, int]] = None
+                               ) -> Iterator[Tuple[Any, ConsultationRequest]]:
+    """Yield (record id, request) pairs, skipping blank lines and counting malformed or wrongly typed ones"""
+    with open(input_path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                request = ConsultationRequest.from_dict(record)
+            except (ValueError, TypeError, AttributeError) as e:
+                logger.warning(f"Skipping {input_path}:{line_number}: {e}")
+                if stats is not None:
+                    stats["skipped"] += 1
+                continue
+            yield record.get("request_id", record.get("id", line_number)), request
+
+def routing_decision_record(record_id: Any, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-serializable routing decision for one request"""
+    return {
+        "request_id": record_id,
+        "orchestration_pattern": analysis["orchestration_pattern"].value,
+        "complexity": analysis["complexity"],
+        "domains": analysis["domains"],
+        "agent_candidates": analysis["agent_candidates"],
+        "agent_scores": {agent: round(score, 4) for agent, score in analysis["agent_scores"].items()},
+        "decomposition_strategy": analysis["decomposition_strategy"]
+    }
+
+def route_jsonl(input_path: str, output_path: str, orchestrator: Optional[MetaOrchestrator] = None,
+                chunk_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+    """Route every request in input_path and write one decision per line to output_path"""
+    orchestrator = orchestrator or MetaOrchestrator()
+    stats = {"routed": 0, "skipped": 0}
+    records = read_consultation_requests(input_path, stats)
+
+    start = time.perf_counter()
+    with open(output_path, "w") as out:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            analyses = orchestrator.analyze_many((request for _, request in chunk), chunk_size)
+            lines = [json.dumps(routing_decision_record(record_id, analysis), separators=(",", ":"))
+                     for (record_id, _), analysis in zip(chunk, analyses)]
+            out.write("\n".join(lines) + "\n")
+            stats["routed"] += len(lines)
+    elapsed = time.perf_counter() - start
+
+    stats["seconds"] = elapsed
+    stats["requests_per_second"] = stats["routed"] / elapsed if elapsed else 0.0
+    logger.info(f"Routed {stats['routed']} requests ({stats['skipped']} skipped) "
+                f"at {stats['requests_per_second']:.0f} requests/s")
+    return stats
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(2)
+
+    logging.basicConfig(level=logging.INFO)
+    route_jsonl(sys.argv[1], sys.argv[2])
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Meta-Orchestrator Benchmarks
+Measures registry startup cost and orchestration hot paths
+"""
+
+import time
+import random
+import asyncio
+import tempfile
+import statistics
+import logging
+from typing import Dict, List, Any
+from agent_registry import load_agent_registry_snapshot, get_agent_registry
+from agent_bitsets import AgentBitIndex
+from request_routing import build_routing_index, routing_tokens
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest, OrchestrationPattern
+from agent_backends import SimulatedBackend
+
+# Representative routing workload
+ROUTING_REQUESTS = [
+    ConsultationRequest(
+        objective="Help me price my design services",
+        context={"business_type": "design agency", "current_pricing": "hourly rates"}
+    ),
+    ConsultationRequest(
+        objective="Launch a complete brand identity and website for a tech startup that builds trust with enterprise clients",
+        context={
+            "business_type": "B2B SaaS startup",
+            "target_audience": "enterprise clients",
+            "competitive_landscape": "crowded market",
+            "timeline": "3 months to launch"
+        }
+    ),
+    ConsultationRequest(
+        objective="Compare value-based pricing and package-based pricing for our agency",
+        context={"current_challenges": "inconsistent pricing, client objections"}
+    )
+]
+
+class BaselineRouter:
+    """
+    Request analysis as it was before single-pass feature extraction
+
+    Kept verbatim so the routing benchmark measures against the original
+    per-signal code: every signal re-lowercases the request, and pattern
+    selection and decomposition re-derive complexity, domains and candidates.
+    """
+
+    def __init__(self, agent_specs: Dict[str, Dict[str, Any]]):
+        self.agent_specs = agent_specs
+
+    def analyze_consultation_request(self, request: ConsultationRequest) -> Dict[str, Any]:
+        return {
+            "complexity": self._assess_complexity(request),
+            "domains": self._identify_domains(request),
+            "agent_candidates": self._identify_candidate_agents(request),
+            "orchestration_pattern": self._select_orchestration_pattern(request),
+            "decomposition_strategy": self._plan_task_decomposition(request)
+        }
+
+    def _assess_complexity(self, request: ConsultationRequest) -> str:
+        objective = request.objective.lower()
+        context_size = len(str(request.context))
+
+        domain_keywords = [
+            "brand", "design", "marketing", "sales", "pricing", "strategy",
+            "website", "technical", "user", "content", "social", "email"
+        ]
+        domain_count = sum(1 for keyword in domain_keywords if keyword in objective)
+
+        if domain_count >= 3 or context_size > 1000:
+            return "complex"
+        elif domain_count >= 2 or context_size > 500:
+            return "moderate"
+        else:
+            return "simple"
+
+    def _identify_domains(self, request: ConsultationRequest) -> List[str]:
+        objective = request.objective.lower()
+        context_text = str(request.context).lower()
+        full_text = f"{objective} {context_text}"
+
+        domains = []
+        if any(word in full_text for word in ["pricing", "sales", "proposal", "client", "business"]):
+            domains.append("business_strategy_sales")
+        if any(word in full_text for word in ["design", "visual", "brand", "logo", "website", "ui", "ux"]):
+            domains.append("design_visual")
+        if any(word in full_text for word in ["technical", "performance", "seo", "accessibility", "responsive"]):
+            domains.append("technical_architecture")
+        if any(word in full_text for word in ["content", "copy", "marketing", "social", "email"]):
+            domains.append("content_communication")
+        if any(word in full_text for word in ["research", "analysis", "operations", "project", "conversion"]):
+            domains.append("analysis_operations")
+
+        return domains if domains else ["business_strategy_sales"]
+
+    def _identify_candidate_agents(self, request: ConsultationRequest) -> List[str]:
+        objective = request.objective.lower()
+        context_text = str(request.context).lower()
+        full_text = f"{objective} {context_text}"
+
+        candidates = []
+        for agent_name, agent_spec in self.agent_specs.items():
+            for trigger in agent_spec.get('usage_triggers', []):
+                trigger_words = trigger.lower().split()
+                if any(word in full_text for word in trigger_words if len(word) > 3):
+                    candidates.append(agent_name)
+                    break
+
+        return candidates if candidates else ["sales-specialist"]
+
+    def _select_orchestration_pattern(self, request: ConsultationRequest) -> OrchestrationPattern:
+        complexity = self._assess_complexity(request)
+        domain_count = len(self._identify_domains(request))
+        candidate_count = len(self._identify_candidate_agents(request))
+
+        if "compare" in request.objective.lower() or "validate" in request.objective.lower():
+            return OrchestrationPattern.CONSENSUS
+        elif candidate_count > 3 and domain_count > 2:
+            return OrchestrationPattern.MAPREDUCE
+        elif complexity == "complex" and domain_count > 1:
+            return OrchestrationPattern.SEQUENTIAL
+        else:
+            return OrchestrationPattern.SEQUENTIAL
+
+    def _plan_task_decomposition(self, request: ConsultationRequest) -> Dict[str, Any]:
+        pattern = self._select_orchestration_pattern(request)
+        candidates = self._identify_candidate_agents(request)
+
+        if pattern == OrchestrationPattern.SEQUENTIAL:
+            return {
+                "type": "vertical",
+                "steps": [{"agent": agent, "depends_on": candidates[i-1] if i > 0 else None}
+                         for i, agent in enumerate(candidates[:3])]
+            }
+        elif pattern == OrchestrationPattern.MAPREDUCE:
+            return {"type": "horizontal", "parallel_agents": candidates[:4], "aggregation": "synthesis"}
+        elif pattern == OrchestrationPattern.CONSENSUS:
+            return {"type": "consensus", "agents": candidates[:3], "resolution": "user_choice"}
+        else:
+            return {
+                "type": "hierarchical",
+                "supervisor": candidates[0] if candidates else "sales-specialist",
+                "workers": candidates[1:3]
+            }
+
+def _measure(fn, iterations: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def benchmark_registry_startup(iterations: int = 30):
+    """Cold compile (parse + index build) versus warm start from the content-hashed cache"""
+    print("\n=== REGISTRY STARTUP BENCHMARK ===")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold = _measure(lambda: load_agent_registry_snapshot(use_cache=False), iterations)
+
+        # Prime the cache once, then every load is a warm start
+        load_agent_registry_snapshot(cache_directory=cache_dir)
+        warm = _measure(lambda: load_agent_registry_snapshot(cache_directory=cache_dir), iterations)
+
+    print(f"Cold start (parse + build indexes): {cold:.2f} ms")
+    print(f"Warm start (stat + load cache):     {warm:.2f} ms")
+    print(f"Speedup: {cold / warm:.1f}x")
+
+def benchmark_request_routing(iterations: int = 2000):
+    """Current request analysis versus the original per-signal implementation"""
+    print("\n=== REQUEST ROUTING BENCHMARK ===")
+
+    orchestrator = MetaOrchestrator(analysis_cache_size=0)
+    cached_orchestrator = MetaOrchestrator()
+    baseline = BaselineRouter(orchestrator.agent_specs)
+
+    # Both sides must reach the same decisions for the timings to be comparable;
+    # candidates are now ranked by score rather than listed in registry order
+    for request in ROUTING_REQUESTS:
+        analysis = orchestrator.analyze_consultation_request(request)
+        expected = baseline.analyze_consultation_request(request)
+        for key in ("complexity", "domains", "orchestration_pattern"):
+            assert analysis[key] == expected[key]
+        assert sorted(analysis["agent_candidates"]) == sorted(expected["agent_candidates"])
+
+    def original():
+        for request in ROUTING_REQUESTS:
+            baseline.analyze_consultation_request(request)
+
+    def current():
+        for request in ROUTING_REQUESTS:
+            orchestrator.analyze_consultation_request(request)
+
+    def cached():
+        for request in ROUTING_REQUESTS:
+            cached_orchestrator.analyze_consultation_request(request)
+
+    per_request = len(ROUTING_REQUESTS) / 1000  # ms -> us per request
+    before = _measure(original, iterations) / per_request
+    now = _measure(current, iterations) / per_request
+    cache_hit = _measure(cached, iterations) / per_request
+
+    print(f"Original routing:    {before:.1f} us/request")
+    print(f"Current routing:     {now:.1f} us/request")
+    print(f"Cached routing:      {cache_hit:.1f} us/request "
+          f"(hit rate {cached_orchestrator.analysis_cache_stats()['hit_rate']:.1%})")
+    print(f"Speedup: {before / now:.1f}x uncached, {before / cache_hit:.1f}x cached")
+
+def benchmark_batch_routing(request_count: int = 3000):
+    """Per-request analysis versus chunked analyze_many over a templated request stream"""
+    print("\n=== BATCH ROUTING BENCHMARK ===")
+
+    # Same objective templates with distinct context values, as in bulk traffic
+    requests = [
+        ConsultationRequest(objective=template.objective,
+                            context={**template.context, "client_reference": f"client-{i}"})
+        for i in range(request_count)
+        for template in (ROUTING_REQUESTS[i % len(ROUTING_REQUESTS)],)
+    ]
+    orchestrator = MetaOrchestrator(analysis_cache_size=0)
+
+    per_request = _measure(lambda: [orchestrator.analyze_consultation_request(r) for r in requests], 5)
+    batched = _measure(lambda: list(orchestrator.analyze_many(requests)), 5)
+
+    print(f"Per-request: {request_count / per_request * 1000:8.0f} requests/s")
+    print(f"Batched:     {request_count / batched * 1000:8.0f} requests/s")
+
+def benchmark_batch_execution(request_count: int = 100):
+    """execute_consultation in a loop versus execute_many with batch-wide agent call sharing"""
+    print("\n=== BATCH EXECUTION BENCHMARK ===")
+
+    requests = [ROUTING_REQUESTS[i % len(ROUTING_REQUESTS)] for i in range(request_count)]
+    orchestrator = MetaOrchestrator(backend=SimulatedBackend(latency=0.01))
+
+    async def loop():
+        return [await orchestrator.execute_consultation(request) for request in requests]
+
+    async def batch(stats):
+        return [item async for item in orchestrator.execute_many(requests, stats=stats)]
+
+    start = time.perf_counter()
+    asyncio.run(loop())
+    looped = time.perf_counter() - start
+    stats = {}
+    asyncio.run(batch(stats))
+
+    print(f"Loop:         {request_count / looped:8.0f} consultations/s")
+    print(f"execute_many: {stats['consultations_per_second']:8.0f} consultations/s "
+          f"({stats['agent_calls']} agent calls, {stats['shared_agent_calls']} shared)")
+
+def _synthetic_catalog(scale: int):
+    """Replicate the agent catalog with distinct trigger vocabularies per copy"""
+    catalog = {}
+    for copy in range(scale):
+        for agent_name, spec in get_agent_registry().agent_specs.items():
+            triggers = [" ".join(f"{word}{copy}" if copy else word for word in trigger.split())
+                        for trigger in spec.get("usage_triggers", [])]
+            catalog[f"{agent_name}-{copy}"] = {"usage_triggers": triggers}
+    return catalog
+
+def benchmark_trigger_matching(iterations: int = 300):
+    """Per-word substring scanning versus the compiled automaton as the catalog grows"""
+    print("\n=== TRIGGER MATCHING SCALING BENCHMARK ===")
+
+    text = f"{ROUTING_REQUESTS[1].objective} {ROUTING_REQUESTS[1].context}".lower()
+    for scale in (1, 10, 30):
+        catalog = _synthetic_catalog(scale)
+        routing = build_routing_index(catalog)
+
+        def naive():
+            return [name for name, spec in catalog.items()
+                    if any(word in text for trigger in spec["usage_triggers"] for word in routing_tokens(trigger))]
+
+        naive_time = _measure(naive, iterations) * 1000
+        automaton_time = _measure(lambda: routing.agents_for_words(routing.match_words(text)), iterations) * 1000
+        print(f"{len(catalog):5d} agents: per-word scan {naive_time:8.1f} us, automaton {automaton_time:6.1f} us")
+
+def benchmark_scope_overlaps(iterations: int = 3):
+    """Pairwise set intersection versus bitset overlap pairs for growing scope catalogs"""
+    print("\n=== SCOPE OVERLAP SCALING BENCHMARK ===")
+
+    rng = random.Random(0)
+    for agent_count in (100, 1000, 2000):
+        areas = [f"area {i}" for i in range(agent_count * 2)]
+        coverage = {f"agent-{i}": rng.sample(areas, 5) for i in range(agent_count)}
+
+        def pairwise():
+            agents = list(coverage)
+            covered = {agent_name: set(agent_areas) for agent_name, agent_areas in coverage.items()}
+            return [(agent1, agent2, sorted(covered[agent1] & covered[agent2]))
+                    for i, agent1 in enumerate(agents) for agent2 in agents[i+1:]
+                    if covered[agent1] & covered[agent2]]
+
+        bitset_pairs = AgentBitIndex.build(coverage).overlap_pairs()
+        assert bitset_pairs == pairwise()
+        pairwise_time = _measure(pairwise, iterations)
+        bitset_time = _measure(lambda: AgentBitIndex.build(coverage).overlap_pairs(), iterations)
+        print(f"{agent_count:5d} agents ({len(bitset_pairs)} pairs): "
+              f"pairwise sets {pairwise_time:8.2f} ms, bitsets {bitset_time:6.2f} ms")
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+
+    benchmark_registry_startup()
+    benchmark_request_routing()
+    benchmark_batch_routing()
+    benchmark_batch_execution()
+    benchmark_trigger_matching()
+    benchmark_scope_overlaps()
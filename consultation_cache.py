@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Consultation Caching for Enhanced Agent System
+Bounded LRU/TTL caches for routing decisions and agent responses
+
+Consultation traffic is dominated by near-identical requests (same objective
+template, same context keys), so the orchestrator caches each routing
+analysis under a canonical fingerprint of the request and the registry
+snapshot it was computed against.
+
+Agent responses can be cached too: ResponseCache keeps recent responses in a
+size-bounded in-memory LRU and, optionally, in a pruned sqlite file shared
+across processes and restarts, with a TTL per agent.
+"""
+
+from typing import Dict, Any, Optional, Hashable, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ENTRIES = 1024
+DEFAULT_CACHE_TTL = 300.0  # seconds
+DEFAULT_RESPONSE_CACHE_BYTES = 16 * 1024 * 1024
+
+# Disk tier bounds; rows outlive their TTL so stale answers can stand in for unavailable agents
+DEFAULT_DISK_CACHE_ENTRIES = 100_000
+DEFAULT_DISK_CACHE_MAX_AGE = 7 * 24 * 3600.0  # seconds
+DISK_PRUNE_INTERVAL = 256  # Stores between disk prunes
+
+def request_fingerprint(objective: str, context: Dict[str, Any], *scope: str) -> str:
+    """
+    Canonical hash of a consultation request
+
+    The objective is case- and edge-whitespace-insensitive (routing lowercases
+    it anyway) and context is serialized with sorted keys, so requests that
+    differ only in key order share a fingerprint. Extra scope strings, such as
+    the registry fingerprint, partition the key space.
+    """
+    try:
+        context_repr = json.dumps(context, sort_keys=True, default=str, separators=(",", ":"))
+    except TypeError:
+        context_repr = repr(context)  # Mixed-type keys cannot be sorted
+
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (objective.strip().lower(), context_repr, *scope):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+@dataclass
+class CacheStats:
+    """Counters reported by a TTLCache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a fixed TTL
+
+    Lookups refresh recency but not age, so an entry is recomputed at least
+    once per TTL even when it stays hot.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES, ttl: Optional[float] = DEFAULT_CACHE_TTL):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def clear(self):
+        """Invalidate every entry"""
+        with self._lock:
+            if self._entries:
+                self._stats.invalidations += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics plus current occupancy"""
+        with self._lock:
+            report = asdict(self._stats)
+            report["hit_rate"] = self._stats.hit_rate
+            report["size"] = len(self._entries)
+            report["max_entries"] = self.max_entries
+            return report
+
+def consultation_key(agent_name: str, request: Any, *scope: str) -> str:
+    """Canonical hash of one agent consultation: the agent plus everything its request carries"""
+    details = {
+        "context": request.context,
+        "constraints": request.constraints,
+        "output_format": request.output_format,
+        "success_criteria": request.success_criteria
+    }
+    return request_fingerprint(request.objective, details, agent_name, *scope)
+
+@dataclass
+class ResponseCacheStats:
+    """Counters reported by a ResponseCache"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    disk_pruned: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+class ResponseCache:
+    """
+    Two-tier cache of agent responses keyed by consultation_key()
+
+    The memory tier is an LRU bounded by the pickled size of its entries;
+    the optional disk tier is a sqlite table that survives restarts and is
+    shared by processes pointing at the same file. Disk hits are promoted to
+    memory. Entries are stored pickled, so every hit returns a fresh copy.
+    Ages use wall-clock time because disk entries outlive the process.
+
+    agent_ttls overrides ttl for individual agents; a TTL of None never expires.
+    Expired entries are kept until replaced or evicted, so get_stale() can
+    still serve them while an agent is unavailable. The disk tier is pruned
+    every DISK_PRUNE_INTERVAL stores (and when opened) of rows older than
+    disk_max_age and of the oldest rows past disk_max_entries.
+
+    get_async(), get_stale_async() and put_async() run disk I/O in a worker
+    thread, so callers on an event loop never block on sqlite; memory hits
+    are answered without leaving the loop.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RESPONSE_CACHE_BYTES,
+                 ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 agent_ttls: Optional[Dict[str, Optional[float]]] = None,
+                 disk_path: Optional[str] = None,
+                 disk_max_entries: Optional[int] = DEFAULT_DISK_CACHE_ENTRIES,
+                 disk_max_age: Optional[float] = DEFAULT_DISK_CACHE_MAX_AGE):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if disk_max_entries is not None and disk_max_entries < 1:
+            raise ValueError("disk_max_entries must be at least 1")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.agent_ttls = dict(agent_ttls or {})
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_age = disk_max_age
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()     # Memory tier and stats
+        self._db_lock = threading.Lock()  # Disk tier, held without blocking memory lookups
+        self._stats = ResponseCacheStats()
+        self._stores_since_prune = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path is not None:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS responses "
+                             "(key TEXT PRIMARY KEY, agent TEXT, stored_at REAL, payload BLOB)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+            self.prune_disk()
+
+    def ttl_for(self, agent_name: str) -> Optional[float]:
+        return self.agent_ttls.get(agent_name, self.ttl)
+
+    def _expired(self, agent_name: str, stored_at: float) -> bool:
+        ttl = self.ttl_for(agent_name)
+        return ttl is not None and time.time() - stored_at > ttl
+
+    def _remember(self, key: str, stored_at: float, payload: bytes):
+        """Insert into the memory tier, evicting least recently used entries past max_bytes"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous[1])
+        if len(payload) > self.max_bytes:
+            return  # Larger than the whole tier; disk only
+        self._entries[key] = (stored_at, payload)
+        self._bytes += len(payload)
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._stats.evictions += 1
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, bytes]]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            return self._db.execute("SELECT stored_at, payload FROM responses WHERE key = ?", (key,)).fetchone()
+
+    def _write_disk(self, agent_name: str, key: str, stored_at: float, payload: bytes):
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                             (key, agent_name, stored_at, payload))
+            self._stores_since_prune += 1
+            if self._stores_since_prune < DISK_PRUNE_INTERVAL:
+                return
+        self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """Delete disk rows older than disk_max_age and the oldest past disk_max_entries; returns rows deleted"""
+        with self._db_lock:
+            if self._db is None:
+                return 0
+            self._stores_since_prune = 0
+            deleted = 0
+            if self.disk_max_age is not None:
+                deleted += self._db.execute("DELETE FROM responses WHERE stored_at < ?",
+                                            (time.time() - self.disk_max_age,)).rowcount
+            if self.disk_max_entries is not None:
+                deleted += self._db.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,)).rowcount
+        if deleted:
+            with self._lock:
+                self._stats.disk_pruned += deleted
+            logger.debug(f"Pruned {deleted} responses from the disk cache")
+        return deleted
+
+    def _lookup(self, agent_name: str, key: str, entry: Optional[Tuple[float, bytes]],
+                from_disk: bool) -> Optional[Any]:
+        """Finish a lookup of entry (None on a miss), promoting disk hits; call with the memory lock held"""
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        stored_at, payload = entry
+        if self._expired(agent_name, stored_at):
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        if from_disk:
+            self._remember(key, stored_at, payload)  # Promote
+            self._stats.disk_hits += 1
+        else:
+            self._entries.move_to_end(key)
+            self._stats.memory_hits += 1
+        return pickle.loads(payload)
+
+    def get(self, agent_name: str, key: str) -> Optional[Any]:
+        """Cached response for key, or None on a miss or expired entry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None or self._db is None:
+                return self._lookup(agent_name, key, entry, from_disk=False)
+        entry = self._read_disk(key)
+        with self._lock:
+            return self._lookup(agent_name, key, entry, from_disk=True)
+
+    async def get_async(self, agent_name: str, key: str) -> Optional[Any]:
+        """get() with any disk read run in a worker thread"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None or self._db is None:
+                return self._lookup(agent_name, key, entry, from_disk=False)
+        entry = await asyncio.to_thread(self._read_disk, key)
+        with self._lock:
+            return self._lookup(agent_name, key, entry, from_disk=True)
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Cached response for key even if expired, for use while the agent is unavailable"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            entry = self._read_disk(key)
+        return pickle.loads(entry[1]) if entry is not None else None
+
+    async def get_stale_async(self, key: str) -> Optional[Any]:
+        """get_stale() with any disk read run in a worker thread"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._read_disk, key)
+        return pickle.loads(entry[1]) if entry is not None else None
+
+    def _store(self, key: str, response: Any) -> Tuple[float, bytes]:
+        payload = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, payload)
+            self._stats.stores += 1
+        return stored_at, payload
+
+    def put(self, agent_name: str, key: str, response: Any):
+        """Store response in both tiers"""
+        stored_at, payload = self._store(key, response)
+        if self._db is not None:
+            self._write_disk(agent_name, key, stored_at, payload)
+
+    async def put_async(self, agent_name: str, key: str, response: Any):
+        """put() with the disk write run in a worker thread"""
+        stored_at, payload = self._store(key, response)
+        if self._db is not None:
+            await asyncio.to_thread(self._write_disk, agent_name, key, stored_at, payload)
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+
+    def close(self):
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier hit counts plus memory and disk occupancy"""
+        with self._lock:
+            report = asdict(self._stats)
+            report["hit_rate"] = self._stats.hit_rate
+            report["size"] = len(self._entries)
+            report["bytes"] = self._bytes
+            report["max_bytes"] = self.max_bytes
+        with self._db_lock:
+            if self._db is not None:
+                report["disk_size"] = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                report["disk_max_entries"] = self.disk_max_entries
+        return report
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Consultation Dependency Graphs for Enhanced Agent System
+Builds execution DAGs from each agent's orchestration_integration relations
+
+An edge A -> B means A's output feeds B: A is listed in B's
+sequential_workflow.prerequisites, or B is listed in A's next_steps.
+parallel_collaboration partners get no edge and may run concurrently. Only
+relations among the agents selected for a consultation are considered, so
+independent branches run side by side and latency follows the critical path.
+"""
+
+from typing import Dict, List, Any, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _workflow(spec: Dict[str, Any]) -> Dict[str, Any]:
+    return spec.get("orchestration_integration", {}).get("sequential_workflow", {})
+
+def build_dependency_graph(agents: Sequence[str], agent_specs: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Map each selected agent to its prerequisites among the selected agents
+
+    Specs can declare cycles (A before B and B before A). A cycle is broken
+    by dropping the remaining prerequisites of the earliest-ranked agent
+    still blocked, so higher-ranked agents run as early as possible.
+    """
+    selected = set(agents)
+    prerequisites: Dict[str, List[str]] = {agent: [] for agent in agents}
+
+    for agent in agents:
+        workflow = _workflow(agent_specs.get(agent, {}))
+        for upstream in workflow.get("prerequisites", []):
+            if upstream in selected and upstream != agent and upstream not in prerequisites[agent]:
+                prerequisites[agent].append(upstream)
+        for downstream in workflow.get("next_steps", []):
+            if downstream in selected and downstream != agent and agent not in prerequisites[downstream]:
+                prerequisites[downstream].append(agent)
+
+    # Keep prerequisites in ranking order for stable plans
+    rank = {agent: position for position, agent in enumerate(agents)}
+    for agent in agents:
+        prerequisites[agent].sort(key=rank.__getitem__)
+
+    # Break cycles
+    while True:
+        order = topological_order(prerequisites, agents)
+        if len(order) == len(agents):
+            return prerequisites
+        blocked = next(agent for agent in agents if agent not in set(order))
+        logger.debug(f"Breaking dependency cycle at {blocked}: dropping {prerequisites[blocked]}")
+        prerequisites[blocked] = [upstream for upstream in prerequisites[blocked] if upstream in set(order)]
+
+def topological_order(prerequisites: Dict[str, List[str]], agents: Sequence[str]) -> List[str]:
+    """Agents whose prerequisites all come first, ties broken by rank; agents in a cycle are left out"""
+    remaining = {agent: len(prerequisites.get(agent, [])) for agent in agents}
+    dependents: Dict[str, List[str]] = {agent: [] for agent in agents}
+    for agent in agents:
+        for upstream in prerequisites.get(agent, []):
+            dependents[upstream].append(agent)
+
+    order = []
+    ready = [agent for agent in agents if remaining[agent] == 0]
+    while ready:
+        agent = ready.pop(0)
+        order.append(agent)
+        for downstream in dependents[agent]:
+            remaining[downstream] -= 1
+            if remaining[downstream] == 0:
+                ready.append(downstream)
+        ready.sort(key=list(agents).index)
+    return order
+
+def critical_path(prerequisites: Dict[str, List[str]], order: Sequence[str]) -> List[str]:
+    """Longest prerequisite chain, assuming unit latency per consultation"""
+    longest: Dict[str, List[str]] = {}
+    for agent in order:
+        upstream_paths = [longest[upstream] for upstream in prerequisites.get(agent, [])]
+        longest[agent] = max(upstream_paths, key=len, default=[]) + [agent]
+    return max(longest.values(), key=len, default=[])
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Consultation Protocol for Enhanced Agent System
+Request and response structures exchanged between the orchestrator and agents
+
+Kept free of orchestration logic so agent backends, worker processes and
+HTTP agent services can share the protocol without importing the
+orchestrator.
+"""
+
+import yaml
+from typing import Dict, Any
+from dataclasses import dataclass, field
+
+@dataclass
+class ConsultationRequest:
+    """Structured consultation request following article's communication protocol"""
+    objective: str
+    context: Dict[str, Any] = field(default_factory=dict)
+    constraints: Dict[str, Any] = field(default_factory=dict)
+    output_format: str = "consultation"
+    success_criteria: str = ""
+    
+    def to_yaml(self) -> str:
+        """Convert to YAML format as specified in article"""
+        data = {
+            "consultation_request": {
+                "objective": self.objective,
+                "context": self.context,
+                "constraints": self.constraints,
+                "output_format": self.output_format,
+                "success_criteria": self.success_criteria
+            }
+        }
+        return yaml.dump(data, default_flow_style=False)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ConsultationRequest':
+        """Build from a request record; title/body records become objective/context"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Request record must be an object, not {type(data).__name__}")
+        data = data.get("consultation_request", data)
+        if not isinstance(data, dict):
+            raise ValueError("consultation_request must be an object")
+        if "objective" in data:
+            request = cls(
+                objective=data["objective"],
+                context=data.get("context", {}),
+                constraints=data.get("constraints", {}),
+                output_format=data.get("output_format", "consultation"),
+                success_criteria=data.get("success_criteria", "")
+            )
+        elif "title" in data:
+            request = cls(objective=data["title"], context={"details": data.get("body", "")})
+        else:
+            raise ValueError("Request record has neither an objective nor a title")
+        request.validate()
+        return request
+    
+    def validate(self):
+        """Raise ValueError unless the fields have the types routing relies on"""
+        if not isinstance(self.objective, str) or not self.objective.strip():
+            raise ValueError("objective must be a non-empty string")
+        for name in ("context", "constraints"):
+            if not isinstance(getattr(self, name), dict):
+                raise ValueError(f"{name} must be an object")
+        for name in ("output_format", "success_criteria"):
+            if not isinstance(getattr(self, name), str):
+                raise ValueError(f"{name} must be a string")
+
+@dataclass
+class AgentResponse:
+    """Structured agent response following article's protocol"""
+    status: str
+    result: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    recommendations: Dict[str, Any] = field(default_factory=dict)
+    scope_boundaries: Dict[str, Any] = field(default_factory=dict)
+    potential_conflicts: Dict[str, Any] = field(default_factory=dict)
+    errors: str = ""
+    
+    @classmethod
+    def from_yaml(cls, yaml_str: str) -> 'AgentResponse':
+        """Parse agent response from YAML"""
+        data = yaml.safe_load(yaml_str)
+        response_data = data.get('response', {})
+        return cls(
+            status=response_data.get('status', 'failed'),
+            result=response_data.get('result', {}),
+            metadata=response_data.get('metadata', {}),
+            recommendations=response_data.get('recommendations', {}),
+            scope_boundaries=response_data.get('scope_boundaries', {}),
+            potential_conflicts=response_data.get('potential_conflicts', {}),
+            errors=response_data.get('errors', '')
+        )
+    
+    def to_yaml(self) -> str:
+        """Convert to the YAML response format parsed by from_yaml"""
+        data = {
+            "response": {
+                "status": self.status,
+                "result": self.result,
+                "metadata": self.metadata,
+                "recommendations": self.recommendations,
+                "scope_boundaries": self.scope_boundaries,
+                "potential_conflicts": self.potential_conflicts,
+                "errors": self.errors
+            }
+        }
+        return yaml.safe_dump(data, default_flow_style=False)
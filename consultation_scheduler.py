@@ -0,0 +1,704 @@
+#!/usr/bin/env python3
+"""
+Consultation Scheduler for Enhanced Agent System
+Bounded concurrency for agent consultations across all running orchestrations
+
+Every agent call goes through one scheduler, which enforces a global cap on
+in-flight consultations plus a per-agent cap, and records queue depth and
+wait times. Callers waiting on a busy agent do not hold a global slot, so a
+single hot agent cannot starve the others.
+
+Per-agent caps adapt (AIMD): each agent's limit grows by one per limit's
+worth of healthy calls and halves when calls fail or run much slower than
+the agent's usual latency. A per-agent circuit breaker stops admitting calls
+to an agent whose recent calls mostly failed; callers get CircuitOpenError
+at once instead of queueing behind a sick agent, and one trial call is let
+through after a cooldown.
+
+Consultation deadlines live here too: deadline_scope() sets the time budget
+for everything the current task spawns, the scheduler refuses to admit calls
+once it has expired, and backends can bound their own I/O by time_remaining().
+
+Global slots are handed out by priority class first, then by weighted fair
+queueing across flows (tenants, or each consultation on its own), so a
+consultation fanning out to many agents cannot starve small ones queued
+behind it. priority_scope() sets the class and tenant for everything the
+current task spawns; with max_consultations set, whole consultations are
+admitted the same way.
+
+SingleFlight coalesces concurrent identical calls, so duplicates await the
+call already in flight instead of queueing for a slot of their own. The
+shared call runs under no caller's deadline and is queued at the highest
+priority class of the callers waiting on it.
+"""
+
+from typing import Dict, List, Any, Awaitable, Callable, Hashable, Optional, Tuple, TypeVar
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass
+import asyncio
+import copy
+import heapq
+import itertools
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_AGENT_CONCURRENCY = 4
+
+# Landed calls a retaining SingleFlight keeps for reuse, and the result statuses worth reusing
+DEFAULT_RETAINED_FLIGHTS = 4096
+RETAINED_STATUSES = ("success", "partial")
+
+# Highest priority first; a class is served only when no higher class is waiting
+PRIORITY_CLASSES = ("interactive", "normal", "batch")
+DEFAULT_PRIORITY = "normal"
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() deadline of the consultation running in the current task
+_consultation_deadline: ContextVar[Optional[float]] = ContextVar("consultation_deadline", default=None)
+
+# (priority class, flow) of the consultation running in the current task
+_consultation_class: ContextVar[Tuple[str, Hashable]] = ContextVar("consultation_class",
+                                                                  default=(DEFAULT_PRIORITY, None))
+
+class CallClass:
+    """Priority class and flow of a shared call, raised while it is queued as higher-class callers join"""
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.flow = object()  # Its own flow, not the first caller's
+        self._promoted: Optional[asyncio.Future] = None
+
+    def promote(self, priority: str):
+        if PRIORITY_CLASSES.index(priority) >= PRIORITY_CLASSES.index(self.priority):
+            return
+        self.priority = priority
+        if self._promoted is not None and not self._promoted.done():
+            self._promoted.set_result(None)
+
+    def promotion(self) -> asyncio.Future:
+        """Future resolved the next time the class is raised"""
+        self._promoted = asyncio.get_running_loop().create_future()
+        return self._promoted
+
+# Class of the shared call running in the current task, which overrides _consultation_class
+_shared_call_class: ContextVar[Optional[CallClass]] = ContextVar("shared_call_class", default=None)
+
+class ConsultationDeadlineExceeded(asyncio.TimeoutError):
+    """The consultation's time budget ran out before the work could start"""
+
+class CircuitOpenError(Exception):
+    """The agent's circuit breaker is open, so the call was not attempted"""
+
+    def __init__(self, agent_name: str):
+        super().__init__(f"Circuit open for {agent_name}")
+        self.agent_name = agent_name
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]):
+    """Give the current task (and every task it spawns) at most timeout seconds; nested scopes only tighten"""
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + timeout
+    outer = _consultation_deadline.get()
+    token = _consultation_deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _consultation_deadline.reset(token)
+
+@contextmanager
+def priority_scope(priority: Optional[str] = None, tenant: Optional[Hashable] = None):
+    """
+    Queue the current task's work (and every task it spawns) as priority, fairly shared with tenant's other work
+
+    Without a tenant the scope is its own flow, so each consultation gets
+    its fair share. priority=None keeps the enclosing class.
+    """
+    outer_priority, _ = _consultation_class.get()
+    priority = priority or outer_priority
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class {priority!r}; expected one of {PRIORITY_CLASSES}")
+    token = _consultation_class.set((priority, tenant if tenant is not None else object()))
+    try:
+        yield
+    finally:
+        _consultation_class.reset(token)
+
+def _current_class() -> Tuple[str, Hashable, Optional[CallClass]]:
+    """(priority class, flow, shared call class) to queue the current task's agent call under"""
+    call_class = _shared_call_class.get()
+    if call_class is not None:
+        return call_class.priority, call_class.flow, call_class
+    priority, flow = _consultation_class.get()
+    return priority, flow, None
+
+def time_remaining() -> Optional[float]:
+    """Seconds left in the current consultation's budget, or None when unbounded"""
+    deadline = _consultation_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await under the current deadline, cancelling the work and raising TimeoutError when it expires"""
+    remaining = time_remaining()
+    if remaining is None:
+        return await awaitable
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise ConsultationDeadlineExceeded("Consultation deadline already passed")
+    return await asyncio.wait_for(awaitable, remaining)
+
+@dataclass(frozen=True)
+class AIMDPolicy:
+    """
+    Additive-increase/multiplicative-decrease rule for per-agent limits
+
+    A call counts as congested when it fails or takes longer than
+    latency_tolerance times the agent's smoothed latency. The limit shrinks
+    by decrease_factor at most once per smoothed latency, so one burst of
+    slow calls counts as a single congestion signal.
+    """
+    min_limit: int = 1
+    decrease_factor: float = 0.5
+    latency_tolerance: float = 2.0
+    latency_smoothing: float = 0.1
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """Open after failure_threshold of the last window calls (at least min_calls) failed; retry after cooldown seconds"""
+    window: int = 20
+    min_calls: int = 5
+    failure_threshold: float = 0.5
+    cooldown: float = 5.0
+
+class AgentLimit:
+    """
+    Resizable per-agent concurrency limit
+
+    Waiters are served like the global slots, by priority class and then
+    weighted fair queueing, so a busy agent cannot invert priorities.
+    """
+
+    def __init__(self, max_limit: int, policy: Optional[AIMDPolicy],
+                 weights: Optional[Dict[Hashable, float]] = None):
+        self.max_limit = max_limit
+        self.policy = policy
+        self.limit = float(max_limit)
+        self.latency: Optional[float] = None  # Smoothed latency of successful calls
+        self._last_decrease = 0.0
+        self._slots = FairQueue(max_limit, weights)
+
+    @property
+    def in_flight(self) -> int:
+        return self._slots.in_use
+
+    def reset(self):
+        """Forget waiters bound to a finished event loop; learned limits carry over"""
+        self._slots.reset()
+
+    async def acquire(self, priority: str = DEFAULT_PRIORITY, flow: Hashable = None,
+                      call_class: Optional['CallClass'] = None):
+        await self._slots.acquire(priority, flow, call_class)
+
+    def release(self):
+        self._slots.release()
+
+    def _resize(self, limit: float):
+        self.limit = limit
+        self._slots.capacity = int(limit)
+        self._slots._dispatch()  # Grown: admit waiters into the new slots
+
+    def record(self, latency: float, failed: bool):
+        """Adjust the limit from one completed call"""
+        policy = self.policy
+        if policy is None:
+            return
+        congested = failed or (self.latency is not None and latency > policy.latency_tolerance * self.latency)
+        now = time.monotonic()
+        if congested:
+            if now - self._last_decrease >= (self.latency or 0.0):
+                self._resize(max(float(policy.min_limit), self.limit * policy.decrease_factor))
+                self._last_decrease = now
+        else:
+            self._resize(min(float(self.max_limit), self.limit + 1.0 / self.limit))
+        if not failed:
+            self.latency = latency if self.latency is None else (
+                self.latency + policy.latency_smoothing * (latency - self.latency))
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over an agent's recent call outcomes"""
+
+    def __init__(self, policy: CircuitBreakerPolicy):
+        self.policy = policy
+        self.state = "closed"
+        self._outcomes: deque = deque(maxlen=policy.window)
+        self._opened_at = 0.0
+        self._tickets = itertools.count()
+        self._trial: Optional[int] = None  # Ticket of the half-open trial call in flight
+
+    def allow(self) -> Optional[int]:
+        """Ticket for a call that may be attempted now, or None; in half-open state only one trial at a time"""
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.policy.cooldown:
+                return None
+            self.state = "half_open"
+        ticket = next(self._tickets)
+        if self.state == "half_open":
+            if self._trial is not None:
+                return None
+            self._trial = ticket
+        return ticket
+
+    def record(self, ticket: int, failed: bool):
+        """Outcome of the call admitted with ticket"""
+        if ticket == self._trial:
+            self._trial = None
+            if failed:
+                self._open()
+            else:
+                self.state = "closed"
+                self._outcomes.clear()
+            return
+        if self.state != "closed":
+            return  # Admitted before the circuit opened; only the trial decides when it closes
+        self._outcomes.append(failed)
+        if (len(self._outcomes) >= self.policy.min_calls
+                and sum(self._outcomes) / len(self._outcomes) >= self.policy.failure_threshold):
+            self._open()
+
+    def abandon(self, ticket: int):
+        """The call admitted with ticket was cancelled without an outcome"""
+        if ticket == self._trial:
+            self._trial = None
+
+    def _open(self):
+        self.state = "open"
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+
+@dataclass
+class ClassQueueStats:
+    """Admission counters for one priority class"""
+    queued: int = 0
+    peak_queued: int = 0
+    admitted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "admitted": self.admitted,
+            "average_wait_ms": self.total_wait / self.admitted * 1000 if self.admitted else 0.0,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
+class FairQueue:
+    """
+    Fixed number of slots granted by strict priority, then weighted fair queueing
+
+    Within a class each flow's requests get virtual finish tags spaced
+    1/weight apart, starting no earlier than the class's virtual clock; the
+    smallest tag is served next. A flow that just arrived therefore goes
+    ahead of the backlog of a flow that queued many requests at once.
+    """
+
+    def __init__(self, capacity: int, weights: Optional[Dict[Hashable, float]] = None):
+        self.capacity = capacity
+        self.weights = weights or {}
+        self.in_use = 0
+        self.stats: Dict[str, ClassQueueStats] = {priority: ClassQueueStats() for priority in PRIORITY_CLASSES}
+        self.reset()
+
+    def reset(self):
+        """Forget waiters bound to a finished event loop; counters carry over"""
+        self.in_use = 0
+        self._waiting: Dict[str, List[tuple]] = {priority: [] for priority in PRIORITY_CLASSES}
+        self._virtual_time: Dict[str, float] = {priority: 0.0 for priority in PRIORITY_CLASSES}
+        self._last_finish: Dict[Tuple[str, Hashable], float] = {}
+        self._sequence = itertools.count()
+        for stats in self.stats.values():
+            stats.queued = 0
+
+    @asynccontextmanager
+    async def admit(self, priority: str, flow: Hashable, call_class: Optional[CallClass] = None,
+                    enqueued_at: Optional[float] = None):
+        await self.acquire(priority, flow, call_class, enqueued_at)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: str, flow: Hashable, call_class: Optional[CallClass] = None,
+                      enqueued_at: Optional[float] = None):
+        """
+        Wait for a slot; with call_class, a queued request moves up whenever its class is raised
+
+        The recorded wait runs from enqueued_at (time.perf_counter(), default
+        now), so time spent queued elsewhere first can be counted too.
+        """
+        if enqueued_at is None:
+            enqueued_at = time.perf_counter()
+        while True:
+            stats = self.stats[priority]
+            weight = self.weights.get(flow, 1.0)
+            start = max(self._virtual_time[priority], self._last_finish.get((priority, flow), 0.0))
+            finish = self._last_finish[(priority, flow)] = start + 1.0 / weight
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiting[priority], (finish, next(self._sequence), waiter))
+            stats.queued += 1
+            stats.peak_queued = max(stats.peak_queued, stats.queued)
+            if self.in_use < self.capacity:
+                self._dispatch()  # Free slot: admitted at once
+            promoted = call_class.promotion() if call_class is not None and not waiter.done() else None
+            try:
+                if promoted is None:
+                    await waiter
+                else:
+                    await asyncio.wait((waiter, promoted), return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self.release()  # Granted just as we were cancelled: pass the slot on
+                else:
+                    stats.queued -= 1
+                    waiter.cancel()  # Skipped when it reaches the front
+                raise
+            finally:
+                if promoted is not None:
+                    promoted.cancel()
+            if waiter.done():
+                break
+            # Raised while queued: withdraw and queue again under the higher class
+            stats.queued -= 1
+            waiter.cancel()
+            priority = call_class.priority
+        wait = time.perf_counter() - enqueued_at
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+
+    def release(self):
+        self.in_use -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        for priority in PRIORITY_CLASSES:
+            waiting = self._waiting[priority]
+            while waiting and self.in_use < self.capacity:
+                finish, _, waiter = heapq.heappop(waiting)
+                if waiter.done():
+                    continue  # Cancelled while queued
+                self._virtual_time[priority] = finish
+                self.in_use += 1
+                self.stats[priority].queued -= 1
+                self.stats[priority].admitted += 1
+                waiter.set_result(None)
+            if self.in_use >= self.capacity:
+                break
+        if len(self._last_finish) > 1024:
+            # Flows whose tags the clock has passed would restart from the clock anyway
+            self._last_finish = {key: finish for key, finish in self._last_finish.items()
+                                 if finish > self._virtual_time[key[0]]}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {priority: stats.to_dict() for priority, stats in self.stats.items()}
+
+class AgentCall:
+    """Handle for one admitted call; run() marks calls whose result reports failure"""
+    failed = False
+
+@dataclass
+class AgentQueueStats:
+    """Queue-depth and latency counters for one agent"""
+    queued: int = 0
+    in_flight: int = 0
+    peak_queued: int = 0
+    completed: int = 0
+    failed: int = 0
+    short_circuited: int = 0
+    total_wait: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        started = self.completed + self.failed + self.in_flight
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "peak_queued": self.peak_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "short_circuited": self.short_circuited,
+            "average_wait_ms": self.total_wait / started * 1000 if started else 0.0
+        }
+
+class ConsultationScheduler:
+    """
+    Global and per-agent concurrency limits for agent consultations
+
+    Semaphores are bound to the event loop that first uses them, so the
+    scheduler recreates its limits when it sees a new loop (for example one
+    asyncio.run() per test). Counters and learned agent limits carry over.
+
+    per_agent_concurrency is the ceiling of each agent's adaptive limit;
+    pass aimd=None for fixed limits and circuit_breaker=None to never
+    short-circuit. tenant_weights gives tenants larger fair shares, and
+    max_consultations (None: unlimited) caps whole consultations in flight.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 per_agent_concurrency: int = DEFAULT_PER_AGENT_CONCURRENCY,
+                 aimd: Optional[AIMDPolicy] = AIMDPolicy(),
+                 circuit_breaker: Optional[CircuitBreakerPolicy] = CircuitBreakerPolicy(),
+                 tenant_weights: Optional[Dict[Hashable, float]] = None,
+                 max_consultations: Optional[int] = None):
+        if max_concurrency < 1 or per_agent_concurrency < 1 or (max_consultations is not None and max_consultations < 1):
+            raise ValueError("Concurrency limits must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.per_agent_concurrency = per_agent_concurrency
+        self.aimd = aimd
+        self.circuit_breaker = circuit_breaker
+        self.tenant_weights = dict(tenant_weights or {})
+        self.max_consultations = max_consultations
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global_slots = FairQueue(max_concurrency, self.tenant_weights)
+        self._consultation_slots = (FairQueue(max_consultations, self.tenant_weights)
+                                    if max_consultations is not None else None)
+        self._agent_limits: Dict[str, AgentLimit] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._agent_stats: Dict[str, AgentQueueStats] = {}
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._queued = 0
+        self._peak_queued = 0
+
+    def _bind_loop(self):
+        """Reset slot queues the first time a new event loop schedules work"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_slots.reset()
+            if self._consultation_slots is not None:
+                self._consultation_slots.reset()
+            for limit in self._agent_limits.values():
+                limit.reset()
+
+    def _agent_limit(self, agent_name: str) -> AgentLimit:
+        limit = self._agent_limits.get(agent_name)
+        if limit is None:
+            limit = self._agent_limits[agent_name] = AgentLimit(self.per_agent_concurrency, self.aimd,
+                                                                self.tenant_weights)
+        return limit
+
+    def _breaker(self, agent_name: str) -> Optional[CircuitBreaker]:
+        if self.circuit_breaker is None:
+            return None
+        breaker = self._breakers.get(agent_name)
+        if breaker is None:
+            breaker = self._breakers[agent_name] = CircuitBreaker(self.circuit_breaker)
+        return breaker
+
+    @asynccontextmanager
+    async def slot(self, agent_name: str):
+        """Hold one agent slot and one global slot for the duration of a consultation"""
+        remaining = time_remaining()
+        if remaining is not None and remaining <= 0:
+            raise ConsultationDeadlineExceeded(f"Deadline passed before {agent_name} was admitted")
+        self._bind_loop()
+        stats = self._agent_stats.setdefault(agent_name, AgentQueueStats())
+        breaker = self._breaker(agent_name)
+        ticket = breaker.allow() if breaker is not None else None
+        if breaker is not None and ticket is None:
+            stats.short_circuited += 1
+            raise CircuitOpenError(agent_name)
+        agent_limit = self._agent_limit(agent_name)
+
+        stats.queued += 1
+        stats.peak_queued = max(stats.peak_queued, stats.queued)
+        self._queued += 1
+        self._peak_queued = max(self._peak_queued, self._queued)
+        enqueued_at = time.perf_counter()
+        acquired = False
+        outcome: Optional[bool] = None  # Failed?, once the call finishes
+        try:
+            # Agent slot first: callers queued on a busy agent hold no global slot. Both
+            # queues serve by class and fair share; the class wait covers both
+            await agent_limit.acquire(*_current_class())
+            try:
+                async with self._global_slots.admit(*_current_class(), enqueued_at=enqueued_at):
+                    stats.queued -= 1
+                    self._queued -= 1
+                    acquired = True
+                    started_at = time.perf_counter()
+                    stats.total_wait += started_at - enqueued_at
+                    stats.in_flight += 1
+                    self._in_flight += 1
+                    self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+                    call = AgentCall()
+                    try:
+                        yield call
+                    except Exception:
+                        stats.failed += 1
+                        outcome = True
+                        raise
+                    except BaseException:
+                        stats.failed += 1  # Cancelled: no signal about the agent's health
+                        raise
+                    else:
+                        stats.completed += 1
+                        outcome = call.failed
+                    finally:
+                        stats.in_flight -= 1
+                        self._in_flight -= 1
+                        if outcome is not None:
+                            agent_limit.record(time.perf_counter() - started_at, outcome)
+            finally:
+                agent_limit.release()
+        finally:
+            if not acquired:  # Cancelled while queued
+                stats.queued -= 1
+                self._queued -= 1
+            if breaker is not None:
+                if outcome is None:
+                    breaker.abandon(ticket)
+                else:
+                    was_open = breaker.state == "open"
+                    breaker.record(ticket, outcome)
+                    if breaker.state == "open" and not was_open:
+                        logger.warning(f"Circuit opened for {agent_name}")
+
+    @asynccontextmanager
+    async def consultation_slot(self):
+        """Admit one whole consultation of the current priority class and flow"""
+        if self._consultation_slots is None:
+            yield
+            return
+        self._bind_loop()
+        async with self._consultation_slots.admit(*_consultation_class.get()):
+            yield
+
+    async def run(self, agent_name: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run call() once a slot for agent_name is available; results with status "failed" count as failures"""
+        async with self.slot(agent_name) as admitted:
+            result = await call()
+            admitted.failed = getattr(result, "status", None) == "failed"
+            return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current and peak queue depth, in-flight counts and per-agent wait times"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_agent_concurrency": self.per_agent_concurrency,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "queued": self._queued,
+            "peak_queued": self._peak_queued,
+            "agents": {name: self._agent_metrics(name, stats) for name, stats in self._agent_stats.items()},
+            "priority_classes": self._global_slots.metrics(),
+            "consultation_classes": (self._consultation_slots.metrics()
+                                     if self._consultation_slots is not None else {})
+        }
+
+    def _agent_metrics(self, agent_name: str, stats: AgentQueueStats) -> Dict[str, Any]:
+        report = stats.to_dict()
+        limit = self._agent_limits.get(agent_name)
+        if limit is not None:
+            report["limit"] = int(limit.limit)
+            report["latency_ms"] = limit.latency * 1000 if limit.latency is not None else None
+        breaker = self._breakers.get(agent_name)
+        report["circuit"] = breaker.state if breaker is not None else "closed"
+        return report
+
+class _Flight:
+    """One shared call, the class it is queued under, and the number of callers still awaiting it"""
+
+    def __init__(self, task: asyncio.Task, call_class: CallClass):
+        self.task = task
+        self.call_class = call_class
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single execution
+
+    The first caller starts the call as a task; callers arriving while it
+    runs await the same task. The task runs in a copy of the first caller's
+    context without its deadline, since each caller bounds its own wait, and
+    is queued at the highest priority class among its callers. A caller
+    that is cancelled stops waiting without cancelling the others; the call
+    itself is cancelled only once no caller is left. Calls on different
+    event loops are never shared.
+
+    With retain=True, successful calls stay in the table after they land, so
+    later duplicates reuse the result too (for example within one batch).
+    Results reporting a status other than "success" or "partial" are not
+    kept, and every caller, the first included, gets its own copy, so the
+    kept result cannot be changed by a caller. At most max_retained landed
+    calls are kept, least recently used first out, so the table stays
+    bounded however long the batch runs.
+    """
+
+    def __init__(self, retain: bool = False, max_retained: int = DEFAULT_RETAINED_FLIGHTS):
+        if max_retained < 1:
+            raise ValueError("max_retained must be at least 1")
+        self.retain = retain
+        self.max_retained = max_retained
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._retained: "OrderedDict[Hashable, None]" = OrderedDict()  # Landed keys, least recent first
+        self.executed = 0
+        self.coalesced = 0
+        self.evicted = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Result of call(), started now or already in flight, and whether it was shared"""
+        flight = self._flights.get(key)
+        shared = flight is not None and flight.task.get_loop() is asyncio.get_running_loop()
+        priority, _ = _consultation_class.get()
+        if shared:
+            self.coalesced += 1
+            flight.call_class.promote(priority)
+            if key in self._retained:
+                self._retained.move_to_end(key)
+        else:
+            self._retained.pop(key, None)  # Superseded, e.g. by a call on another event loop
+            call_class = CallClass(priority)
+            context = copy_context()
+            context.run(_consultation_deadline.set, None)
+            context.run(_shared_call_class.set, call_class)
+            flight = self._flights[key] = _Flight(context.run(asyncio.ensure_future, call()), call_class)
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+            self.executed += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+            return (copy.deepcopy(result) if self.retain else result), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _land(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is not flight:
+            return
+        if (not self.retain or flight.task.cancelled() or flight.task.exception() is not None
+                or getattr(flight.task.result(), "status", "success") not in RETAINED_STATUSES):
+            del self._flights[key]
+            return
+        self._retained[key] = None
+        self._retained.move_to_end(key)
+        while len(self._retained) > self.max_retained:
+            evicted, _ = self._retained.popitem(last=False)
+            del self._flights[evicted]
+            self.evicted += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Calls executed, calls that joined one in flight, calls in flight now and landed calls retained"""
+        in_flight = sum(1 for flight in self._flights.values() if not flight.task.done())
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": in_flight,
+                "retained": len(self._retained), "evicted": self.evicted}
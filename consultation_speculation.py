@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Speculative Execution Policies for Enhanced Agent System
+Decides when worker results computed ahead of supervisor guidance can be kept
+
+In the hierarchical pattern, workers normally wait for the supervisor because
+they receive its guidance. Speculative execution starts them on the base
+context immediately; once guidance lands, each speculative worker is judged by
+how much of the guidance is already reflected in what it saw and produced.
+Workers that clear the threshold are kept, the rest are cancelled and re-run
+with the guidance.
+"""
+
+from typing import Dict, Any, Callable, Set
+from dataclasses import dataclass
+import re
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+
+# Words shorter than this carry too little meaning to compare on
+MIN_SIMILARITY_WORD_LENGTH = 4
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+def content_words(value: Any) -> Set[str]:
+    """Lowercased content words of any (nested) value's text"""
+    return {word for word in _WORD.findall(str(value).lower()) if len(word) >= MIN_SIMILARITY_WORD_LENGTH}
+
+def guidance_coverage(guidance: Dict[str, Any], basis: Any) -> float:
+    """Fraction of the guidance's content words already present in basis"""
+    guidance_words = content_words(guidance)
+    if not guidance_words:
+        return 1.0  # Empty guidance changes nothing
+    return len(guidance_words & content_words(basis)) / len(guidance_words)
+
+@dataclass
+class SpeculationPolicy:
+    """
+    Similarity rule for accepting speculative worker results
+
+    similarity(guidance, basis) scores how well a worker's basis (its input
+    context plus its result, or just the context while it is still running)
+    already covers the supervisor guidance; results scoring at least
+    similarity_threshold are accepted.
+    """
+    similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD
+    similarity: Callable[[Dict[str, Any], Any], float] = guidance_coverage
+
+    def accepts(self, guidance: Dict[str, Any], basis: Any) -> bool:
+        return self.similarity(guidance, basis) >= self.similarity_threshold
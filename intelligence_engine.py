@@ -4,13 +4,16 @@ Intelligence Engine for Enhanced Agent System
 Advanced overlap detection, conflict resolution, and quality optimization
 """
 
-import json
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
 from methodology_validator import MethodologyValidator, MethodologyValidationResult
+from agent_registry import (AgentRegistrySnapshot, RegistryIndexes, get_agent_registry,
+                            build_expertise_graph, build_conflict_patterns, build_relevance_matrices,
+                            build_scope_coverage, build_expertise_bits)
+from agent_bitsets import AgentBitIndex
 
 logger = logging.getLogger(__name__)
 
@@ -66,45 +69,23 @@ class QualityMetrics:
 class IntelligenceEngine:
     """Advanced intelligence and optimization engine"""
     
-    def __init__(self, agent_registry_path: str = "/workspaces/JoineryAgency/enhanced-agent-registry.json"):
-        self.agent_registry = self._load_agent_registry(agent_registry_path)
-        self.agent_specs = self._load_all_agent_specs()
-        
-        # Intelligence capabilities
-        self.overlap_detector = OverlapDetector(self.agent_specs)
-        self.conflict_analyzer = ConflictAnalyzer(self.agent_specs)
+    def __init__(self, agent_registry_path: Optional[str] = None,
+                 registry: Optional[AgentRegistrySnapshot] = None):
+        # Shared compiled snapshot - no per-instance file reads
+        self.registry = registry or get_agent_registry(agent_registry_path)
+        self.agent_registry = self.registry.registry
+        self.agent_specs = self.registry.registered_specs
+        
+        # Intelligence capabilities, reusing the snapshot's prebuilt indexes
+        indexes = self.registry.indexes
+        self.overlap_detector = OverlapDetector(self.agent_specs, indexes)
+        self.conflict_analyzer = ConflictAnalyzer(self.agent_specs, indexes)
         self.quality_assessor = QualityAssessor(self.agent_specs)
-        self.context_optimizer = ContextOptimizer(self.agent_specs)
-        self.methodology_validator = MethodologyValidator(agent_registry_path)
+        self.context_optimizer = ContextOptimizer(self.agent_specs, indexes)
+        self.methodology_validator = MethodologyValidator(registry=self.registry)
         
         logger.info(f"Intelligence Engine initialized with {len(self.agent_specs)} agents")
     
-    def _load_agent_registry(self, registry_path: str) -> Dict[str, Any]:
-        """Load the agent registry"""
-        try:
-            with open(registry_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning(f"Agent registry not found at {registry_path}")
-            return {}
-    
-    def _load_all_agent_specs(self) -> Dict[str, Dict[str, Any]]:
-        """Load all agent specifications"""
-        agent_specs = {}
-        
-        # Load from registry if available
-        if self.agent_registry:
-            for category_data in self.agent_registry.get("agent_categories", {}).values():
-                for agent_name in category_data.get("agents", []):
-                    try:
-                        agent_path = f"/workspaces/JoineryAgency/agents/{agent_name}.json"
-                        with open(agent_path, 'r') as f:
-                            agent_specs[agent_name] = json.load(f)
-                    except FileNotFoundError:
-                        logger.warning(f"Agent spec not found: {agent_name}")
-        
-        return agent_specs
-    
     async def analyze_agent_overlap(self, consultation_context: Dict[str, Any]) -> List[AgentOverlap]:
         """Detect and analyze agent overlaps for given context"""
         return await self.overlap_detector.detect_overlaps(consultation_context)
@@ -126,33 +107,78 @@ class IntelligenceEngine:
         return await self.methodology_validator.validate_agent_methodology(agent_name, consultation_result)
 
 class OverlapDetector:
-    """Advanced overlap detection system"""
-    
-    def __init__(self, agent_specs: Dict[str, Dict[str, Any]]):
+    """
+    Advanced overlap detection system
+    
+    Methodology-family and scope-boundary overlaps do not depend on the
+    consultation, so they are built once per registry and shared by every
+    call (treat returned overlaps as read-only). Only expertise-area matching
+    looks at the consultation context. Agent coverage of scope areas and
+    expertise triggers is held as bitsets, so per-agent overlap queries are
+    a few integer ANDs.
+    """
+    
+    def __init__(self, agent_specs: Dict[str, Dict[str, Any]], indexes: Optional[RegistryIndexes] = None):
         self.agent_specs = agent_specs
-        self._build_expertise_graph()
+        if indexes is not None:
+            self.expertise_areas = indexes.expertise_areas
+            self.methodology_families = indexes.methodology_families
+            self.scope_bits = indexes.scope_bits
+            self.expertise_bits = indexes.expertise_bits
+            scope_overlaps = indexes.scope_overlaps
+        else:
+            self._build_expertise_graph()
+            self.scope_bits = AgentBitIndex.build(build_scope_coverage(agent_specs))
+            self.expertise_bits = build_expertise_bits(self.expertise_areas, agent_specs)
+            scope_overlaps = self.scope_bits.overlap_pairs()
+        self._build_static_overlaps(scope_overlaps)
     
     def _build_expertise_graph(self):
         """Build expertise relationship graph"""
-        self.expertise_areas = {}
-        self.methodology_families = {}
-        
-        for agent_name, spec in self.agent_specs.items():
-            # Extract expertise areas
-            usage_triggers = spec.get("usage_triggers", [])
-            methodology = spec.get("agent_identity", {}).get("methodology", "")
-            
-            for trigger in usage_triggers:
-                if trigger not in self.expertise_areas:
-                    self.expertise_areas[trigger] = []
-                self.expertise_areas[trigger].append(agent_name)
-            
-            # Group by methodology families
-            if methodology:
-                family = methodology.split()[0] if methodology else "general"
-                if family not in self.methodology_families:
-                    self.methodology_families[family] = []
-                self.methodology_families[family].append(agent_name)
+        self.expertise_areas, self.methodology_families = build_expertise_graph(self.agent_specs)
+    
+    def _build_static_overlaps(self, scope_overlaps: List[Tuple[str, str, List[str]]]):
+        """Precompute the context-independent overlap tables"""
+        self.shared_expertise_areas = [(area, area.lower(), self.expertise_areas[area])
+                                       for area, _ in self.expertise_bits.shared_area_masks()]
+        
+        self.methodology_overlaps = [
+            AgentOverlap(
+                agents=agents,
+                overlap_type="methodology_family",
+                overlap_areas=[f"{family}_methodology"],
+                confidence=0.9,
+                resolution_strategy="consensus_validation",
+                impact_assessment={
+                    "methodology_consistency": "high",
+                    "expert_authority": "preserved",
+                    "user_clarity": "enhanced"
+                }
+            )
+            for family, agents in self.methodology_families.items() if len(agents) > 1
+        ]
+        
+        self.scope_overlaps = [
+            AgentOverlap(
+                agents=[agent1, agent2],
+                overlap_type="scope_boundary",
+                overlap_areas=overlap_areas,
+                confidence=0.7,
+                resolution_strategy="clear_delegation",
+                impact_assessment={
+                    "boundary_clarity": "needs_definition",
+                    "user_confusion_risk": "moderate",
+                    "coordination_benefit": "high"
+                }
+            )
+            for agent1, agent2, overlap_areas in scope_overlaps
+        ]
+    
+    def overlapping_agents(self, agent_name: str) -> List[str]:
+        """Agents sharing an expertise trigger or a scope area with agent_name"""
+        related = set(self.expertise_bits.agents_of(self.expertise_bits.overlapping_mask(agent_name)))
+        related.update(self.scope_bits.agents_of(self.scope_bits.overlapping_mask(agent_name)))
+        return [name for name in self.agent_specs if name in related]
     
     async def detect_overlaps(self, consultation_context: Dict[str, Any]) -> List[AgentOverlap]:
         """Detect overlaps based on consultation context"""
@@ -162,24 +188,20 @@ class OverlapDetector:
         expertise_overlaps = self._detect_expertise_overlaps(consultation_context)
         overlaps.extend(expertise_overlaps)
         
-        # Detect methodology overlaps
-        methodology_overlaps = self._detect_methodology_overlaps(consultation_context)
-        overlaps.extend(methodology_overlaps)
-        
-        # Detect scope boundary overlaps
-        scope_overlaps = self._detect_scope_overlaps(consultation_context)
-        overlaps.extend(scope_overlaps)
+        # Methodology and scope overlaps are precomputed
+        overlaps.extend(self.methodology_overlaps)
+        overlaps.extend(self.scope_overlaps)
         
         return overlaps
     
     def _detect_expertise_overlaps(self, context: Dict[str, Any]) -> List[AgentOverlap]:
         """Detect overlapping expertise areas"""
         overlaps = []
-        consultation_type = context.get("consultation_type", "")
+        consultation_type = context.get("consultation_type", "").lower()
         
         # Find agents with overlapping triggers
-        for area, agents in self.expertise_areas.items():
-            if len(agents) > 1 and area.lower() in consultation_type.lower():
+        for area, area_lower, agents in self.shared_expertise_areas:
+            if area_lower in consultation_type:
                 overlap = AgentOverlap(
                     agents=agents,
                     overlap_type="expertise_area",
@@ -198,82 +220,25 @@ class OverlapDetector:
     
     def _detect_methodology_overlaps(self, context: Dict[str, Any]) -> List[AgentOverlap]:
         """Detect methodology family overlaps"""
-        overlaps = []
-        
-        for family, agents in self.methodology_families.items():
-            if len(agents) > 1:
-                overlap = AgentOverlap(
-                    agents=agents,
-                    overlap_type="methodology_family",
-                    overlap_areas=[f"{family}_methodology"],
-                    confidence=0.9,
-                    resolution_strategy="consensus_validation",
-                    impact_assessment={
-                        "methodology_consistency": "high",
-                        "expert_authority": "preserved",
-                        "user_clarity": "enhanced"
-                    }
-                )
-                overlaps.append(overlap)
-        
-        return overlaps
+        return list(self.methodology_overlaps)
     
     def _detect_scope_overlaps(self, context: Dict[str, Any]) -> List[AgentOverlap]:
         """Detect scope boundary overlaps"""
-        overlaps = []
-        
-        # Check for known scope overlaps from agent specs
-        scope_boundaries = {}
-        for agent_name, spec in self.agent_specs.items():
-            scope = spec.get("scope_boundaries", {})
-            covers = scope.get("covers", "")
-            if covers:
-                scope_boundaries[agent_name] = covers.split(", ")
-        
-        # Find overlapping scopes
-        agents_list = list(scope_boundaries.keys())
-        for i, agent1 in enumerate(agents_list):
-            for agent2 in agents_list[i+1:]:
-                overlap_areas = set(scope_boundaries[agent1]) & set(scope_boundaries[agent2])
-                if overlap_areas:
-                    overlap = AgentOverlap(
-                        agents=[agent1, agent2],
-                        overlap_type="scope_boundary",
-                        overlap_areas=list(overlap_areas),
-                        confidence=0.7,
-                        resolution_strategy="clear_delegation",
-                        impact_assessment={
-                            "boundary_clarity": "needs_definition",
-                            "user_confusion_risk": "moderate",
-                            "coordination_benefit": "high"
-                        }
-                    )
-                    overlaps.append(overlap)
-        
-        return overlaps
+        return list(self.scope_overlaps)
 
 class ConflictAnalyzer:
     """Advanced conflict analysis and resolution"""
     
-    def __init__(self, agent_specs: Dict[str, Dict[str, Any]]):
+    def __init__(self, agent_specs: Dict[str, Dict[str, Any]], indexes: Optional[RegistryIndexes] = None):
         self.agent_specs = agent_specs
-        self.conflict_patterns = self._build_conflict_patterns()
+        if indexes is not None:
+            self.conflict_patterns = indexes.conflict_patterns
+        else:
+            self.conflict_patterns = self._build_conflict_patterns()
     
     def _build_conflict_patterns(self) -> Dict[str, Any]:
         """Build known conflict patterns from agent specs"""
-        patterns = {}
-        
-        for agent_name, spec in self.agent_specs.items():
-            potential_conflicts = spec.get("potential_conflicts", {})
-            for conflict_key, conflict_desc in potential_conflicts.items():
-                if conflict_key not in patterns:
-                    patterns[conflict_key] = []
-                patterns[conflict_key].append({
-                    "agent": agent_name,
-                    "description": conflict_desc
-                })
-        
-        return patterns
+        return build_conflict_patterns(self.agent_specs)
     
     async def analyze_conflicts(self, agent_responses: List[Dict[str, Any]]) -> List[ConflictAnalysis]:
         """Comprehensive conflict analysis"""
@@ -500,24 +465,16 @@ class QualityAssessor:
 class ContextOptimizer:
     """Context optimization and filtering system"""
     
-    def __init__(self, agent_specs: Dict[str, Dict[str, Any]]):
+    def __init__(self, agent_specs: Dict[str, Dict[str, Any]], indexes: Optional[RegistryIndexes] = None):
         self.agent_specs = agent_specs
-        self._build_relevance_matrices()
+        if indexes is not None:
+            self.relevance_matrices = indexes.relevance_matrices
+        else:
+            self._build_relevance_matrices()
     
     def _build_relevance_matrices(self):
         """Build context relevance matrices for each agent"""
-        self.relevance_matrices = {}
-        
-        for agent_name, spec in self.agent_specs.items():
-            # Extract relevant context types from input schema
-            input_schema = spec.get("input_schema", {}).get("consultation_request", {})
-            context_schema = input_schema.get("context", {})
-            
-            relevant_contexts = []
-            if isinstance(context_schema, dict):
-                relevant_contexts = list(context_schema.keys())
-            
-            self.relevance_matrices[agent_name] = relevant_contexts
+        self.relevance_matrices = build_relevance_matrices(self.agent_specs)
     
     async def optimize_context(self, context: Dict[str, Any], selected_agents: List[str]) -> Dict[str, Dict[str, Any]]:
         """Optimize context for each selected agent"""
@@ -11,26 +11,69 @@ Implements the "Primary Agent" pattern from agentic AI best practices:
 Following the article's two-tier architecture exactly.
 """
 
-import json
-import yaml
+import copy
+import time
 import asyncio
-from typing import Dict, List, Any, Optional, Union
+import contextvars
+from typing import Dict, List, Any, Optional, Union, Set, Iterable, Iterator, FrozenSet, Tuple, AsyncIterator
 from dataclasses import dataclass, field
+from collections import deque
+from itertools import islice
 from enum import Enum
 import logging
+from contextvars import ContextVar
 from intelligence_engine import IntelligenceEngine, QualityMetrics, ConflictAnalysis, AgentOverlap
+from agent_registry import (AgentRegistrySnapshot, RegistryChanges, RegistryWatcher, get_agent_registry,
+                            apply_registry_changes, publish_agent_registry, store_agent_registry_snapshot)
+from consultation_cache import (TTLCache, ResponseCache, request_fingerprint, consultation_key,
+                                DEFAULT_CACHE_ENTRIES, DEFAULT_CACHE_TTL)
+from consultation_scheduler import (ConsultationScheduler, SingleFlight, CircuitOpenError, deadline_scope,
+                                    priority_scope, within_deadline)
+from consultation_graph import build_dependency_graph, topological_order, critical_path
+from consultation_protocol import ConsultationRequest, AgentResponse
+from agent_backends import AgentBackend, SimulatedBackend, complementary_agents
+from consultation_speculation import SpeculationPolicy
 from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Requests routed together when analyzing a stream
+DEFAULT_BATCH_SIZE = 256
+
+# Consultations of one execute_many batch running at the same time
+DEFAULT_BATCH_CONCURRENCY = 64
+
+# Distinct contexts whose overlap analysis one execute_many batch keeps for reuse
+DEFAULT_BATCH_OVERLAP_ENTRIES = 1024
+
+# (orchestrator, registry snapshot, intelligence engine) pinned by the consultation
+# running in the current task, so a hot reload mid-consultation never mixes old
+# and new agent specs
+_pinned_registry: ContextVar[Optional[tuple]] = ContextVar("pinned_registry", default=None)
+
+# Progress of the consultation running in the current task, if any
+_active_run: ContextVar[Optional['ConsultationRun']] = ContextVar("active_run", default=None)
+
+# Work shared by every consultation of the execute_many batch running in the current task
+_active_batch: ContextVar[Optional['ConsultationBatch']] = ContextVar("active_batch", default=None)
+
+def _copy_analysis(value: Any) -> Any:
+    """Fresh containers for a cached analysis so callers can mutate what they get back"""
+    if isinstance(value, dict):
+        return {key: _copy_analysis(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_analysis(item) for item in value]
+    return value
+
 class OrchestrationPattern(Enum):
     """Orchestration patterns from the article"""
     SEQUENTIAL = "sequential"
     MAPREDUCE = "mapreduce" 
     CONSENSUS = "consensus"
     HIERARCHICAL = "hierarchical"
+    DAG = "dag"  # Sequential workflow run as a prerequisite graph
 
 class TaskStatus(Enum):
     """Task execution status"""
@@ -41,52 +84,48 @@ class TaskStatus(Enum):
     PARTIAL = "partial"
 
 @dataclass
-class ConsultationRequest:
-    """Structured consultation request following article's communication protocol"""
-    objective: str
-    context: Dict[str, Any] = field(default_factory=dict)
-    constraints: Dict[str, Any] = field(default_factory=dict)
-    output_format: str = "consultation"
-    success_criteria: str = ""
-    
-    def to_yaml(self) -> str:
-        """Convert to YAML format as specified in article"""
-        data = {
-            "consultation_request": {
-                "objective": self.objective,
-                "context": self.context,
-                "constraints": self.constraints,
-                "output_format": self.output_format,
-                "success_criteria": self.success_criteria
-            }
-        }
-        return yaml.dump(data, default_flow_style=False)
+class RequestFeatures:
+    """Routing signals extracted from a consultation request in a single pass"""
+    objective_text: str
+    context_text: str
+    full_text: str
+    context_size: int
+    complexity: str = "simple"
+    domains: List[str] = field(default_factory=list)
+    matched_trigger_words: Set[str] = field(default_factory=set)
+    candidate_agents: List[str] = field(default_factory=list)    # Best BM25 score first
+    agent_scores: Dict[str, float] = field(default_factory=dict)
 
 @dataclass
-class AgentResponse:
-    """Structured agent response following article's protocol"""
-    status: str
-    result: Dict[str, Any] = field(default_factory=dict)
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    recommendations: Dict[str, Any] = field(default_factory=dict)
-    scope_boundaries: Dict[str, Any] = field(default_factory=dict)
-    potential_conflicts: Dict[str, Any] = field(default_factory=dict)
-    errors: str = ""
-    
-    @classmethod
-    def from_yaml(cls, yaml_str: str) -> 'AgentResponse':
-        """Parse agent response from YAML"""
-        data = yaml.safe_load(yaml_str)
-        response_data = data.get('response', {})
-        return cls(
-            status=response_data.get('status', 'failed'),
-            result=response_data.get('result', {}),
-            metadata=response_data.get('metadata', {}),
-            recommendations=response_data.get('recommendations', {}),
-            scope_boundaries=response_data.get('scope_boundaries', {}),
-            potential_conflicts=response_data.get('potential_conflicts', {}),
-            errors=response_data.get('errors', '')
-        )
+class RoutingMemo:
+    """Routing work shared by the requests of one batch"""
+    objective_matches: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+    rankings: Dict[FrozenSet[str], List[Tuple[str, float]]] = field(default_factory=dict)
+
+@dataclass
+class ConsultationEvent:
+    """
+    Incremental update from a streaming consultation
+    
+    kind is one of "analysis", "agent_response", "agent_failed", "conflicts"
+    or "synthesis"; the final event is always the synthesis.
+    """
+    kind: str
+    payload: Any = None
+    agent: Optional[str] = None
+
+@dataclass
+class ConsultationRun:
+    """Progress of one consultation, shared by every task it spawns"""
+    events: Optional[asyncio.Queue] = None                        # Set when streaming
+    completed: List[Dict[str, Any]] = field(default_factory=list)  # {"agent", "response"} as agents finish
+
+@dataclass
+class ConsultationBatch:
+    """Agent calls and overlap analyses shared across the consultations of one batch"""
+    calls: SingleFlight = field(default_factory=lambda: SingleFlight(retain=True))
+    overlaps: TTLCache = field(  # By context fingerprint, least recently used out
+        default_factory=lambda: TTLCache(max_entries=DEFAULT_BATCH_OVERLAP_ENTRIES, ttl=None))
 
 class MetaOrchestrator:
     """
@@ -100,38 +139,149 @@ class MetaOrchestrator:
     - Error handling and fallback strategies
     """
     
-    def __init__(self, agents_directory: str = "agents"):
-        self.agents_directory = Path(agents_directory)
-        self.agents_registry = {}
+    def __init__(self, agents_directory: Optional[str] = None,
+                 registry: Optional[AgentRegistrySnapshot] = None,
+                 registry_path: Optional[str] = None,
+                 analysis_cache_size: int = DEFAULT_CACHE_ENTRIES,
+                 analysis_cache_ttl: Optional[float] = DEFAULT_CACHE_TTL,
+                 scheduler: Optional[ConsultationScheduler] = None,
+                 dependency_graph_execution: bool = False,
+                 backend: Optional[AgentBackend] = None,
+                 speculation_policy: Optional[SpeculationPolicy] = None,
+                 consultation_timeout: Optional[float] = None,
+                 consensus_quorum: Optional[int] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 single_flight: bool = True):
+        # Compiled registry is shared process-wide; constructing an orchestrator reads no files
+        self.registry = registry or get_agent_registry(registry_path, agents_directory)
+        self.agents_directory = Path(self.registry.agents_directory)
         self.conversation_context = {}
         self.active_tasks = {}
-        self.load_agent_registry()
+        self._registry_watcher: Optional[RegistryWatcher] = None
+        
+        # Routing decisions for repeated requests; a size of 0 disables caching
+        self.analysis_cache = TTLCache(analysis_cache_size, analysis_cache_ttl) if analysis_cache_size > 0 else None
+        
+        # Agent responses for repeated consultations; None always consults the agent
+        self.response_cache = response_cache
+        
+        # Concurrent identical agent calls share one consultation
+        self.single_flight = SingleFlight() if single_flight else None
+        
+        # Every agent call is admitted through the scheduler; pass one in to share limits
+        self.scheduler = scheduler or ConsultationScheduler()
+        
+        # Opt-in: run sequential workflows as prerequisite DAGs so independent steps overlap.
+        # Off by default, since later steps then only see the output of declared prerequisites
+        self.dependency_graph_execution = dependency_graph_execution
+        
+        # Where agent consultations actually run; simulated in-process by default
+        self.backend = backend or SimulatedBackend()
+        
+        # Start hierarchical workers before the supervisor finishes; None waits for guidance
+        self.speculation_policy = speculation_policy
+        
+        # Default time budget per consultation in seconds; None is unbounded
+        self.consultation_timeout = consultation_timeout
+        
+        # Consensus returns once this many agents agree (or agreement is impossible); None waits for all
+        self.consensus_quorum = consensus_quorum
         
         # Initialize Intelligence Engine for advanced capabilities
-        try:
-            self.intelligence_engine = IntelligenceEngine()
+        self._intelligence_engine = self._build_intelligence_engine(self.registry)
+        if self._intelligence_engine:
             logger.info("Intelligence Engine integrated successfully")
-        except Exception as e:
-            logger.warning(f"Intelligence Engine initialization failed: {e}")
-            self.intelligence_engine = None
         
         logger.info(f"Meta-Orchestrator initialized with {len(self.agents_registry)} agents")
     
+    @property
+    def agent_specs(self) -> Dict[str, Any]:
+        """Agent specs of the pinned consultation snapshot, or the current snapshot"""
+        return self._active_registry().agent_specs
+    
+    @property
+    def agents_registry(self) -> Dict[str, Any]:
+        """Registry data of the pinned consultation snapshot, or the current snapshot"""
+        return self._active_registry().registry
+    
+    @property
+    def intelligence_engine(self) -> Optional[IntelligenceEngine]:
+        """Intelligence Engine built for the pinned consultation snapshot, or for the current snapshot"""
+        return self._current_pin()[2]
+    
+    def _active_registry(self) -> AgentRegistrySnapshot:
+        """Snapshot pinned by the running consultation, falling back to the current one"""
+        return self._current_pin()[1]
+    
+    def _pin(self) -> tuple:
+        """Current snapshot and its Intelligence Engine, to pin for a consultation"""
+        return (self, self.registry, self._intelligence_engine)
+    
+    def _current_pin(self) -> tuple:
+        """Pin of the running consultation, falling back to the current snapshot"""
+        pinned = _pinned_registry.get()
+        if pinned is not None and pinned[0] is self:
+            return pinned
+        return self._pin()
+    
+    def _build_intelligence_engine(self, snapshot: AgentRegistrySnapshot) -> Optional[IntelligenceEngine]:
+        try:
+            return IntelligenceEngine(registry=snapshot)
+        except Exception as e:
+            logger.warning(f"Intelligence Engine initialization failed: {e}")
+            return None
+    
     def load_agent_registry(self):
-        """Load enhanced agent specifications from registry"""
-        registry_path = Path("enhanced-agent-registry.json")
-        if registry_path.exists():
-            with open(registry_path, 'r') as f:
-                registry_data = json.load(f)
-                self.agents_registry = registry_data
-        
-        # Load individual agent specs
-        self.agent_specs = {}
-        for agent_file in self.agents_directory.glob("enhanced-*.json"):
-            with open(agent_file, 'r') as f:
-                agent_data = json.load(f)
-                agent_name = agent_data['agent_identity']['name']
-                self.agent_specs[agent_name] = agent_data
+        """Fully reload enhanced agent specifications from disk and swap them in"""
+        snapshot = get_agent_registry(self.registry.registry_path, self.registry.agents_directory, reload=True)
+        self._swap_registry(snapshot)
+        self._registry_watcher = None
+    
+    def refresh_agent_registry(self) -> RegistryChanges:
+        """
+        Hot-reload agent specs edited since the last refresh
+        
+        Only changed files are re-parsed and the intelligence indexes are
+        patched incrementally. Consultations already running keep the
+        snapshot and Intelligence Engine they started with; new consultations
+        see the new ones.
+        """
+        if self._registry_watcher is None:
+            self._registry_watcher = RegistryWatcher(self.registry)
+        
+        changes = self._registry_watcher.poll()
+        if not changes.has_changes:
+            return changes
+        
+        try:
+            snapshot = apply_registry_changes(self.registry, changes)
+        except (OSError, ValueError, KeyError) as e:
+            # Usually a spec caught mid-save; the next refresh retries it
+            logger.warning(f"Agent registry reload failed, keeping current snapshot: {e}")
+            return RegistryChanges()
+        
+        self._registry_watcher.synchronize(changes)
+        self._swap_registry(snapshot)
+        publish_agent_registry(snapshot)
+        store_agent_registry_snapshot(snapshot, changes.signature)
+        return changes
+    
+    async def watch_agent_registry(self, interval: float = 2.0):
+        """Poll for edited agent specs and hot-reload them until cancelled"""
+        while True:
+            self.refresh_agent_registry()
+            await asyncio.sleep(interval)
+    
+    def _swap_registry(self, snapshot: AgentRegistrySnapshot):
+        """Switch this orchestrator and its Intelligence Engine to a new snapshot in one step"""
+        # Pinned consultations keep the previous engine, so a new one is built for the new snapshot
+        self._intelligence_engine = self._build_intelligence_engine(snapshot)
+        self.registry = snapshot
+        self.agents_directory = Path(snapshot.agents_directory)
+        
+        # Cached routing decisions were computed against the previous agent set
+        if self.analysis_cache is not None:
+            self.analysis_cache.clear()
     
     def analyze_consultation_request(self, request: ConsultationRequest) -> Dict[str, Any]:
         """
@@ -140,22 +290,126 @@ class MetaOrchestrator:
         Following article's task decomposition strategies:
         - Vertical Decomposition: Sequential multi-step tasks
         - Horizontal Decomposition: Parallel tasks with aggregation
+        
+        Results are cached per request fingerprint and registry snapshot.
         """
-        analysis = {
-            "complexity": self._assess_complexity(request),
-            "domains": self._identify_domains(request),
-            "agent_candidates": self._identify_candidate_agents(request),
-            "orchestration_pattern": self._select_orchestration_pattern(request),
-            "decomposition_strategy": self._plan_task_decomposition(request)
-        }
+        cache_key = None
+        if self.analysis_cache is not None:
+            cache_key = request_fingerprint(request.objective, request.context,
+                                            self._active_registry().fingerprint)
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Request analysis (cached): {cached['orchestration_pattern'].value} pattern "
+                            f"with {len(cached['agent_candidates'])} agents")
+                return _copy_analysis(cached)
+        
+        analysis = self._compute_analysis(request)
         
         logger.info(f"Request analysis: {analysis['orchestration_pattern'].value} pattern with {len(analysis['agent_candidates'])} agents")
+        if cache_key is not None:
+            self.analysis_cache.put(cache_key, _copy_analysis(analysis))
         return analysis
     
-    def _assess_complexity(self, request: ConsultationRequest) -> str:
+    def analyze_many(self, requests: Iterable[ConsultationRequest],
+                     chunk_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        Route a stream of requests, yielding analyses in input order
+        
+        Requests are consumed chunk_size at a time, so memory stays bounded
+        for arbitrarily long streams. Within a chunk the registry snapshot is
+        resolved once, duplicate requests are analyzed once, and requests
+        with a repeated objective or the same trigger tokens share the scan
+        and the ranking.
+        """
+        chunk = []
+        for request in requests:
+            chunk.append(request)
+            if len(chunk) >= chunk_size:
+                yield from self._analyze_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._analyze_chunk(chunk)
+    
+    def _analyze_chunk(self, requests: List[ConsultationRequest]) -> List[Dict[str, Any]]:
+        """Analyze one batch of requests against a single pinned snapshot"""
+        pin = self._current_pin()
+        registry = pin[1]
+        token = _pinned_registry.set(pin)
+        try:
+            memo = RoutingMemo()
+            analyses_by_key: Dict[Any, Dict[str, Any]] = {}
+            results = []
+            for request in requests:
+                if self.analysis_cache is not None:
+                    cache_key = request_fingerprint(request.objective, request.context, registry.fingerprint)
+                else:
+                    cache_key = (request.objective, str(request.context))
+                
+                # Results are only handed out once the chunk is done, so a fresh
+                # analysis goes out as-is and only reused ones are copied
+                analysis = analyses_by_key.get(cache_key)
+                if analysis is None and self.analysis_cache is not None:
+                    analysis = self.analysis_cache.get(cache_key)
+                if analysis is None:
+                    analysis = self._compute_analysis(request, memo)
+                    if self.analysis_cache is not None:
+                        self.analysis_cache.put(cache_key, _copy_analysis(analysis))
+                    analyses_by_key[cache_key] = analysis
+                    results.append(analysis)
+                else:
+                    analyses_by_key[cache_key] = analysis
+                    results.append(_copy_analysis(analysis))
+        finally:
+            _pinned_registry.reset(token)
+        
+        logger.debug(f"Routed batch of {len(requests)} requests ({len(analyses_by_key)} distinct)")
+        return results
+    
+    def _compute_analysis(self, request: ConsultationRequest,
+                          memo: Optional['RoutingMemo'] = None) -> Dict[str, Any]:
+        """Run feature extraction, pattern selection and decomposition for one request"""
+        features = self._extract_request_features(request, memo)
+        pattern = self._select_orchestration_pattern(features)
+        
+        return {
+            "complexity": features.complexity,
+            "domains": features.domains,
+            "agent_candidates": features.candidate_agents,
+            "agent_scores": features.agent_scores,
+            "orchestration_pattern": pattern,
+            "decomposition_strategy": self._plan_task_decomposition(features, pattern)
+        }
+    
+    def analysis_cache_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics of the routing decision cache"""
+        return self.analysis_cache.stats() if self.analysis_cache is not None else {}
+    
+    def response_cache_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics of the agent response cache"""
+        return self.response_cache.stats() if self.response_cache is not None else {}
+    
+    def _extract_request_features(self, request: ConsultationRequest,
+                                  memo: Optional['RoutingMemo'] = None) -> RequestFeatures:
+        """Lowercase and scan the request once; every routing decision reads from the result"""
+        context_repr = str(request.context)
+        objective_text = request.objective.lower()
+        context_text = context_repr.lower()
+        
+        features = RequestFeatures(
+            objective_text=objective_text,
+            context_text=context_text,
+            full_text=f"{objective_text} {context_text}",
+            context_size=len(context_repr)
+        )
+        features.complexity = self._assess_complexity(features)
+        features.domains = self._identify_domains(features)
+        features.candidate_agents = self._identify_candidate_agents(features, memo)
+        return features
+    
+    def _assess_complexity(self, features: RequestFeatures) -> str:
         """Assess consultation complexity to inform orchestration approach"""
-        objective = request.objective.lower()
-        context_size = len(str(request.context))
+        objective = features.objective_text
+        context_size = features.context_size
         
         # Multiple domain indicators
         domain_keywords = [
@@ -171,11 +425,9 @@ class MetaOrchestrator:
         else:
             return "simple"
     
-    def _identify_domains(self, request: ConsultationRequest) -> List[str]:
+    def _identify_domains(self, features: RequestFeatures) -> List[str]:
         """Identify which agent domains are relevant to the request"""
-        objective = request.objective.lower()
-        context_text = str(request.context).lower()
-        full_text = f"{objective} {context_text}"
+        full_text = features.full_text
         
         domains = []
         
@@ -201,47 +453,56 @@ class MetaOrchestrator:
         
         return domains if domains else ["business_strategy_sales"]  # Default fallback
     
-    def _identify_candidate_agents(self, request: ConsultationRequest) -> List[str]:
-        """Identify specific agents that could handle this request"""
-        objective = request.objective.lower()
-        context_text = str(request.context).lower()
-        full_text = f"{objective} {context_text}"
-        
-        candidates = []
-        
-        # Check each agent's usage triggers
-        for agent_name, agent_spec in self.agent_specs.items():
-            usage_triggers = agent_spec.get('usage_triggers', [])
+    def _identify_candidate_agents(self, features: RequestFeatures,
+                                   memo: Optional['RoutingMemo'] = None) -> List[str]:
+        """Identify specific agents that could handle this request, most relevant first"""
+        routing = self._active_registry().routing
+        
+        # One automaton scan finds the indexed tokens; only their postings are scored
+        if memo is None:
+            features.matched_trigger_words = routing.match_words(features.full_text)
+            ranked = routing.rank_agents(features.matched_trigger_words)
+        else:
+            # Tokens never contain whitespace, so matches cannot span the objective/context
+            # boundary and a repeated objective's scan can be reused across the batch
+            objective_words = memo.objective_matches.get(features.objective_text)
+            if objective_words is None:
+                objective_words = frozenset(routing.match_words(features.objective_text))
+                memo.objective_matches[features.objective_text] = objective_words
+            token_set = objective_words | routing.match_words(features.context_text)
+            features.matched_trigger_words = set(token_set)
             
-            # Check if any trigger keywords match the request
-            for trigger in usage_triggers:
-                trigger_words = trigger.lower().split()
-                if any(word in full_text for word in trigger_words if len(word) > 3):
-                    candidates.append(agent_name)
-                    break
+            # Batched requests with the same token set share one ranking
+            ranked = memo.rankings.get(token_set)
+            if ranked is None:
+                ranked = memo.rankings[token_set] = routing.rank_agents(token_set)
+        features.agent_scores = dict(ranked)
         
-        return candidates if candidates else ["sales-specialist"]  # Fallback
+        return [agent for agent, _ in ranked] if ranked else ["sales-specialist"]  # Fallback
     
-    def _select_orchestration_pattern(self, request: ConsultationRequest) -> OrchestrationPattern:
+    def _select_orchestration_pattern(self, features: RequestFeatures) -> OrchestrationPattern:
         """Select appropriate orchestration pattern based on request analysis"""
-        complexity = self._assess_complexity(request)
-        domain_count = len(self._identify_domains(request))
-        candidate_count = len(self._identify_candidate_agents(request))
+        complexity = features.complexity
+        domain_count = len(features.domains)
+        candidate_count = len(features.candidate_agents)
         
         # Pattern selection logic from article
-        if "compare" in request.objective.lower() or "validate" in request.objective.lower():
+        if "compare" in features.objective_text or "validate" in features.objective_text:
             return OrchestrationPattern.CONSENSUS
         elif candidate_count > 3 and domain_count > 2:
             return OrchestrationPattern.MAPREDUCE
         elif complexity == "complex" and domain_count > 1:
-            return OrchestrationPattern.SEQUENTIAL
+            return self._sequential_pattern()
         else:
-            return OrchestrationPattern.SEQUENTIAL  # Default for single agent or simple cases
+            return self._sequential_pattern()  # Default for single agent or simple cases
+    
+    def _sequential_pattern(self) -> OrchestrationPattern:
+        """Sequential pipeline, or its dependency-graph form when enabled"""
+        return OrchestrationPattern.DAG if self.dependency_graph_execution else OrchestrationPattern.SEQUENTIAL
     
-    def _plan_task_decomposition(self, request: ConsultationRequest) -> Dict[str, Any]:
+    def _plan_task_decomposition(self, features: RequestFeatures, pattern: OrchestrationPattern) -> Dict[str, Any]:
         """Plan how to decompose the task based on article's strategies"""
-        pattern = self._select_orchestration_pattern(request)
-        candidates = self._identify_candidate_agents(request)
+        candidates = features.candidate_agents  # Ranked, so each slice keeps the top-k by score
         
         if pattern == OrchestrationPattern.SEQUENTIAL:
             # Vertical decomposition - sequential steps
@@ -251,6 +512,18 @@ class MetaOrchestrator:
                          for i, agent in enumerate(candidates[:3])]  # Limit to 3 for efficiency
             }
         
+        elif pattern == OrchestrationPattern.DAG:
+            # Vertical decomposition along the agents' declared prerequisites
+            agents = candidates[:3]  # Same agents the sequential pipeline would consult
+            agent_specs = self._active_registry().agent_specs
+            prerequisites = build_dependency_graph(agents, agent_specs)
+            order = topological_order(prerequisites, agents)
+            return {
+                "type": "graph",
+                "nodes": [{"agent": agent, "depends_on": prerequisites[agent]} for agent in order],
+                "critical_path": critical_path(prerequisites, order)
+            }
+        
         elif pattern == OrchestrationPattern.MAPREDUCE:
             # Horizontal decomposition - parallel with aggregation
             return {
@@ -275,23 +548,198 @@ class MetaOrchestrator:
                 "workers": candidates[1:3]
             }
     
-    async def execute_consultation(self, request: ConsultationRequest) -> Dict[str, Any]:
+    async def execute_consultation(self, request: ConsultationRequest,
+                                   timeout: Optional[float] = None,
+                                   priority: Optional[str] = None,
+                                   tenant: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute consultation following article's orchestration patterns
         Enhanced with Intelligence Engine capabilities
         
         Main orchestration logic implementing the primary agent responsibilities
+        
+        timeout (default: consultation_timeout) bounds the whole consultation
+        once admitted; when it expires, outstanding agent calls are cancelled
+        and a partial synthesis of the agents that finished is returned.
+        
+        priority (a PRIORITY_CLASSES name) and tenant decide how the
+        consultation and its agent calls are queued against other work.
+        """
+        with priority_scope(priority, tenant):
+            async with self.scheduler.consultation_slot():
+                # Pin the current snapshot for this consultation and every task it spawns
+                token = _pinned_registry.set(self._pin())
+                run_token = _active_run.set(ConsultationRun())
+                try:
+                    with deadline_scope(timeout if timeout is not None else self.consultation_timeout):
+                        return await self._execute_pinned_consultation(request)
+                finally:
+                    _active_run.reset(run_token)
+                    _pinned_registry.reset(token)
+    
+    async def stream_consultation(self, request: ConsultationRequest,
+                                  timeout: Optional[float] = None,
+                                  priority: Optional[str] = None,
+                                  tenant: Optional[str] = None) -> AsyncIterator[ConsultationEvent]:
+        """
+        Execute a consultation, yielding results as they become available
+        
+        Emits the routing analysis, then each AgentResponse as its agent
+        finishes, with updated conflicts whenever a new response disagrees
+        with an earlier one, and finally the full (or, past the deadline,
+        partial) synthesis.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def run() -> Dict[str, Any]:
+            # Runs in its own task, so these bindings cover every agent call it spawns
+            with priority_scope(priority, tenant):
+                async with self.scheduler.consultation_slot():
+                    _active_run.set(ConsultationRun(events=queue))
+                    _pinned_registry.set(self._pin())
+                    with deadline_scope(timeout if timeout is not None else self.consultation_timeout):
+                        return await self._execute_pinned_consultation(request)
+        
+        consultation = asyncio.ensure_future(run())
+        completed: List[Dict[str, Any]] = []
+        conflicts: List[Dict[str, Any]] = []
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({next_event, consultation}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    if queue.empty():
+                        break
+                    event = queue.get_nowait()
+                else:
+                    event = next_event.result()
+                yield event
+                
+                # Incremental conflicts: only pairs involving the new response are compared
+                if event.kind == "agent_response":
+                    entry = {"agent": event.agent, "response": event.payload}
+                    new_conflicts = [conflict for previous in completed
+                                     for conflict in self._detect_conflicts([previous, entry])]
+                    completed.append(entry)
+                    if new_conflicts:
+                        conflicts.extend(new_conflicts)
+                        yield ConsultationEvent("conflicts", list(conflicts), event.agent)
+            
+            yield ConsultationEvent("synthesis", consultation.result())
+        finally:
+            if not consultation.done():
+                consultation.cancel()
+    
+    async def execute_many(self, requests: Iterable[ConsultationRequest],
+                           concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                           chunk_size: int = DEFAULT_BATCH_SIZE,
+                           timeout: Optional[float] = None,
+                           priority: Optional[str] = None,
+                           tenant: Optional[str] = None,
+                           stats: Optional[Dict[str, Any]] = None) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Execute a batch of consultations, yielding (input index, result) in completion order
+        
+        Requests are planned chunk_size at a time with analyze_many against one
+        pinned registry snapshot, and at most concurrency consultations run at
+        once; agent calls still go through the shared scheduler. Identical
+        agent calls in the batch are made once and overlap analysis runs once
+        per distinct context, as long as they are among the most recently
+        used entries of the batch's bounded tables, so memory stays flat over
+        long batches. priority and tenant apply to every
+        consultation of the batch. stats, if given, is kept up to date with
+        progress and throughput.
         """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        batch = ConsultationBatch()
+        pin = self._pin()
+        stats = stats if stats is not None else {}
+        stats.update({"submitted": 0, "completed": 0, "failed": 0, "agent_calls": 0, "shared_agent_calls": 0,
+                      "seconds": 0.0, "consultations_per_second": 0.0})
+        
+        async def run(request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
+            # Runs in its own task, so these bindings cover every agent call it spawns
+            with priority_scope(priority, tenant):
+                async with self.scheduler.consultation_slot():
+                    _active_batch.set(batch)
+                    _active_run.set(ConsultationRun())
+                    _pinned_registry.set(pin)
+                    with deadline_scope(timeout if timeout is not None else self.consultation_timeout):
+                        return await self._execute_pinned_consultation(request, analysis)
+        
+        def plan(chunk: List[ConsultationRequest]) -> List[Dict[str, Any]]:
+            context = contextvars.copy_context()
+            context.run(_pinned_registry.set, pin)
+            return context.run(self._analyze_chunk, chunk)
+        
+        remaining = iter(requests)
+        planned: deque = deque()
+        running: Dict[asyncio.Future, int] = {}
+        start = time.perf_counter()
+        try:
+            while True:
+                while len(running) < concurrency:
+                    if not planned:
+                        chunk = list(islice(remaining, chunk_size))
+                        if not chunk:
+                            break
+                        planned.extend(zip(range(stats["submitted"], stats["submitted"] + len(chunk)),
+                                           chunk, plan(chunk)))
+                        stats["submitted"] += len(chunk)
+                    index, request, analysis = planned.popleft()
+                    running[asyncio.ensure_future(run(request, analysis))] = index
+                if not running:
+                    break
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.__getitem__):
+                    index = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.warning(f"Consultation {index} failed: {e}")
+                        result = {"status": "failed", "errors": str(e)}
+                    
+                    stats["completed"] += 1
+                    if result.get("status") != "success":
+                        stats["failed"] += 1
+                    calls = batch.calls.metrics()
+                    stats["agent_calls"] = calls["executed"]
+                    stats["shared_agent_calls"] = calls["coalesced"]
+                    stats["seconds"] = time.perf_counter() - start
+                    stats["consultations_per_second"] = stats["completed"] / stats["seconds"] if stats["seconds"] else 0.0
+                    yield index, result
+        finally:
+            for task in running:
+                task.cancel()
+    
+    def _emit(self, kind: str, payload: Any = None, agent: Optional[str] = None):
+        """Record progress of the consultation running in this task and publish it when streaming"""
+        run = _active_run.get()
+        if run is None:
+            return
+        if kind == "agent_response":
+            run.completed.append({"agent": agent, "response": payload})
+        if run.events is not None:
+            run.events.put_nowait(ConsultationEvent(kind, payload, agent))
+    
+    async def _execute_pinned_consultation(self, request: ConsultationRequest,
+                                           analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run the consultation pipeline against the pinned registry snapshot, reusing a planned analysis"""
         logger.info(f"Executing consultation: {request.objective}")
         
         # Step 1: Enhanced analysis with overlap detection
-        analysis = self.analyze_consultation_request(request)
+        if analysis is None:
+            analysis = self.analyze_consultation_request(request)
+        self._emit("analysis", analysis)
         
         # Step 1.5: Intelligence Engine - Detect agent overlaps
         overlaps = []
         if self.intelligence_engine:
             try:
-                overlaps = await self.intelligence_engine.analyze_agent_overlap(request.context)
+                overlaps = await within_deadline(self._agent_overlaps(request.context))
                 if overlaps:
                     logger.info(f"Intelligence Engine detected {len(overlaps)} agent overlaps")
                     # Optimize agent selection based on overlaps
@@ -299,21 +747,21 @@ class MetaOrchestrator:
             except Exception as e:
                 logger.warning(f"Overlap detection failed: {e}")
         
-        # Step 2: Execute based on orchestration pattern
-        if analysis["orchestration_pattern"] == OrchestrationPattern.SEQUENTIAL:
-            result = await self._execute_sequential(request, analysis)
-        elif analysis["orchestration_pattern"] == OrchestrationPattern.MAPREDUCE:
-            result = await self._execute_mapreduce(request, analysis)
-        elif analysis["orchestration_pattern"] == OrchestrationPattern.CONSENSUS:
-            result = await self._execute_consensus(request, analysis)
-        else:
-            result = await self._execute_hierarchical(request, analysis)
+        # Step 2: Execute based on orchestration pattern; past the deadline, outstanding
+        # agent calls are cancelled and whatever completed is synthesized
+        try:
+            result = await within_deadline(self._execute_pattern(request, analysis))
+        except asyncio.TimeoutError:
+            final_result = self._synthesize_partial(analysis)
+            logger.warning(f"Consultation deadline exceeded with {len(final_result['contributing_agents'])} "
+                           f"of {len(final_result['contributing_agents']) + len(final_result['pending_agents'])} agents complete")
+            return final_result
         
         # Step 2.5: Intelligence Engine - Advanced conflict analysis
         conflicts = []
         if self.intelligence_engine and result.get("results"):
             try:
-                conflicts = await self.intelligence_engine.analyze_conflicts(result["results"])
+                conflicts = await within_deadline(self.intelligence_engine.analyze_conflicts(result["results"]))
                 if conflicts:
                     logger.info(f"Intelligence Engine detected {len(conflicts)} conflicts")
                     # Enhance result with conflict analysis
@@ -335,7 +783,7 @@ class MetaOrchestrator:
         # Step 4: Intelligence Engine - Quality assessment
         if self.intelligence_engine:
             try:
-                quality_metrics = await self.intelligence_engine.assess_quality(final_result)
+                quality_metrics = await within_deadline(self.intelligence_engine.assess_quality(final_result))
                 final_result["intelligence_assessment"] = {
                     "overlaps_detected": len(overlaps),
                     "conflicts_analyzed": len(conflicts),
@@ -353,6 +801,31 @@ class MetaOrchestrator:
         logger.info(f"Consultation completed with status: {final_result.get('status', 'unknown')}")
         return final_result
     
+    async def _agent_overlaps(self, context: Dict[str, Any]) -> List[AgentOverlap]:
+        """Overlaps for a consultation context, computed once per distinct context within a batch"""
+        batch = _active_batch.get()
+        if batch is None:
+            return await self.intelligence_engine.analyze_agent_overlap(context)
+        key = request_fingerprint("", context, self._active_registry().fingerprint)
+        overlaps = batch.overlaps.get(key)
+        if overlaps is None:
+            overlaps = await self.intelligence_engine.analyze_agent_overlap(context)
+            batch.overlaps.put(key, overlaps)
+        return overlaps
+    
+    async def _execute_pattern(self, request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch to the executor of the analysis' orchestration pattern"""
+        if analysis["orchestration_pattern"] == OrchestrationPattern.SEQUENTIAL:
+            return await self._execute_sequential(request, analysis)
+        elif analysis["orchestration_pattern"] == OrchestrationPattern.DAG:
+            return await self._execute_dag(request, analysis)
+        elif analysis["orchestration_pattern"] == OrchestrationPattern.MAPREDUCE:
+            return await self._execute_mapreduce(request, analysis)
+        elif analysis["orchestration_pattern"] == OrchestrationPattern.CONSENSUS:
+            return await self._execute_consensus(request, analysis)
+        else:
+            return await self._execute_hierarchical(request, analysis)
+    
     async def _execute_sequential(self, request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Execute sequential pipeline pattern from article"""
         logger.info("Executing sequential pipeline pattern")
@@ -375,7 +848,7 @@ class MetaOrchestrator:
             )
             
             # Simulate agent consultation (in real implementation, this would call actual agent)
-            agent_response = await self._consult_agent(agent_name, agent_request)
+            agent_response = await self._scheduled_consult(agent_name, agent_request)
             results.append({
                 "agent": agent_name,
                 "response": agent_response
@@ -391,6 +864,55 @@ class MetaOrchestrator:
             "final_context": context
         }
     
+    async def _execute_dag(self, request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a sequential workflow as a dependency graph; independent branches run concurrently"""
+        logger.info("Executing dependency graph pattern")
+        
+        nodes = analysis["decomposition_strategy"]["nodes"]
+        tasks: Dict[str, asyncio.Future] = {}
+        
+        async def run_node(node: Dict[str, Any]) -> AgentResponse:
+            # Each step sees the original context plus its own prerequisites' results
+            context = request.context.copy()
+            for upstream in node["depends_on"]:
+                try:
+                    upstream_response = await tasks[upstream]
+                except Exception:
+                    continue  # A failed prerequisite contributes nothing
+                if upstream_response.status in ["success", "partial"]:
+                    context.update(upstream_response.result)
+            
+            agent_request = ConsultationRequest(
+                objective=request.objective,
+                context=self._filter_context_for_agent(context, node["agent"]),
+                constraints=request.constraints,
+                output_format=request.output_format,
+                success_criteria=request.success_criteria
+            )
+            return await self._scheduled_consult(node["agent"], agent_request)
+        
+        # Nodes are in topological order, so every prerequisite's task already exists
+        for node in nodes:
+            tasks[node["agent"]] = asyncio.ensure_future(run_node(node))
+        agent_responses = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        
+        results = []
+        context = request.context.copy()
+        for node, response in zip(nodes, agent_responses):
+            if isinstance(response, Exception):
+                logger.error(f"Agent {node['agent']} failed: {response}")
+                continue
+            results.append({"agent": node["agent"], "depends_on": node["depends_on"], "response": response})
+            if response.status in ["success", "partial"]:
+                context.update(response.result)
+        
+        return {
+            "pattern": "dag",
+            "results": results,
+            "final_context": context,
+            "critical_path": analysis["decomposition_strategy"]["critical_path"]
+        }
+    
     async def _execute_mapreduce(self, request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Execute MapReduce parallel pattern from article"""
         logger.info("Executing MapReduce parallel pattern")
@@ -398,7 +920,7 @@ class MetaOrchestrator:
         parallel_agents = analysis["decomposition_strategy"]["parallel_agents"]
         
         # Map phase - parallel agent consultation
-        tasks = []
+        calls = []
         for agent_name in parallel_agents:
             agent_request = ConsultationRequest(
                 objective=request.objective,
@@ -407,10 +929,10 @@ class MetaOrchestrator:
                 output_format=request.output_format,
                 success_criteria=request.success_criteria
             )
-            tasks.append(self._consult_agent(agent_name, agent_request))
+            calls.append((agent_name, agent_request))
         
-        # Execute parallel consultations
-        agent_responses = await asyncio.gather(*tasks, return_exceptions=True)
+        # Execute parallel consultations within the scheduler's limits
+        agent_responses = await self._consult_agents(calls)
         
         # Reduce phase - aggregate results
         results = []
@@ -436,7 +958,7 @@ class MetaOrchestrator:
         consensus_agents = analysis["decomposition_strategy"]["agents"]
         
         # Get responses from all consensus agents
-        tasks = []
+        calls = []
         for agent_name in consensus_agents:
             agent_request = ConsultationRequest(
                 objective=request.objective,
@@ -445,9 +967,12 @@ class MetaOrchestrator:
                 output_format=request.output_format,
                 success_criteria=request.success_criteria
             )
-            tasks.append(self._consult_agent(agent_name, agent_request))
+            calls.append((agent_name, agent_request))
         
-        agent_responses = await asyncio.gather(*tasks, return_exceptions=True)
+        if self.consensus_quorum is not None:
+            return await self._execute_quorum_consensus(calls)
+        
+        agent_responses = await self._consult_agents(calls)
         
         # Analyze for consensus and conflicts
         valid_responses = []
@@ -468,6 +993,76 @@ class MetaOrchestrator:
             "resolution": "user_choice" if conflicts else "consensus_reached"
         }
     
+    async def _execute_quorum_consensus(self, calls: List[Tuple[str, ConsultationRequest]]) -> Dict[str, Any]:
+        """Consensus that stops once a quorum agrees or agreement can no longer be reached"""
+        quorum = max(1, min(self.consensus_quorum, len(calls)))
+        tasks = {asyncio.ensure_future(self._scheduled_consult(agent_name, agent_request)): agent_name
+                 for agent_name, agent_request in calls}
+        pending = set(tasks)
+        votes: Dict[str, List[str]] = {}
+        completed: Dict[str, AgentResponse] = {}
+        outcome = "exhausted"
+        agreed_agents: List[str] = []
+        
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled() or task.exception() is not None:
+                        continue  # Failed agents do not vote
+                    position = self._quorum_vote(task.result())
+                    if position is None:
+                        continue  # Failed or degraded responses count like raised errors
+                    agent_name = tasks[task]
+                    completed[agent_name] = task.result()
+                    votes.setdefault(position, []).append(agent_name)
+                
+                largest = max((len(voters) for voters in votes.values()), default=0)
+                if largest >= quorum:
+                    outcome = "agreed"
+                    agreed_agents = next(voters for voters in votes.values() if len(voters) >= quorum)
+                    break
+                if largest + len(pending) < quorum:
+                    outcome = "disagreement"  # No position can reach the quorum any more
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        pending_agents = {tasks[task] for task in pending}
+        cancelled = [agent_name for agent_name, _ in calls if agent_name in pending_agents]
+        if cancelled:
+            logger.info(f"Quorum {outcome} after {len(completed)} of {len(calls)} agents; cancelled {cancelled}")
+        
+        # Present results in planned order, as the waiting consensus does
+        valid_responses = [{"agent": agent_name, "response": completed[agent_name]}
+                           for agent_name, _ in calls if agent_name in completed]
+        conflicts = self._detect_conflicts(valid_responses)
+        
+        return {
+            "pattern": "consensus",
+            "results": valid_responses,
+            "conflicts": conflicts,
+            "resolution": "consensus_reached" if outcome == "agreed" or not conflicts else "user_choice",
+            "quorum": {
+                "required": quorum,
+                "outcome": outcome,
+                "agreed_agents": agreed_agents,
+                "cancelled_agents": cancelled
+            }
+        }
+    
+    def _recommendation_key(self, response: AgentResponse) -> str:
+        """Position an agent takes, compared the same way as in conflict detection"""
+        return response.result.get("primary_recommendation", "").lower()
+    
+    def _quorum_vote(self, response: AgentResponse) -> Optional[str]:
+        """Position a response votes for, or None when it carries no usable recommendation"""
+        if response.status not in ("success", "partial"):
+            return None
+        position = self._recommendation_key(response)
+        return position or None
+    
     async def _execute_hierarchical(self, request: ConsultationRequest, analysis: Dict[str, Any]) -> Dict[str, Any]:
         """Execute hierarchical delegation pattern (limited use as per article)"""
         logger.info("Executing hierarchical pattern")
@@ -484,10 +1079,13 @@ class MetaOrchestrator:
             success_criteria=request.success_criteria
         )
         
-        supervisor_response = await self._consult_agent(supervisor, supervisor_request)
+        if self.speculation_policy is not None:
+            return await self._execute_hierarchical_speculative(request, supervisor, supervisor_request, workers)
+        
+        supervisor_response = await self._scheduled_consult(supervisor, supervisor_request)
         
         # Then consult workers for detailed implementation
-        worker_tasks = []
+        worker_calls = []
         for worker in workers:
             worker_request = ConsultationRequest(
                 objective=request.objective,
@@ -496,9 +1094,9 @@ class MetaOrchestrator:
                 output_format=request.output_format,
                 success_criteria=request.success_criteria
             )
-            worker_tasks.append(self._consult_agent(worker, worker_request))
+            worker_calls.append((worker, worker_request))
         
-        worker_responses = await asyncio.gather(*worker_tasks, return_exceptions=True)
+        worker_responses = await self._consult_agents(worker_calls)
         
         return {
             "pattern": "hierarchical",
@@ -510,48 +1108,163 @@ class MetaOrchestrator:
             ]
         }
     
+    async def _execute_hierarchical_speculative(self, request: ConsultationRequest, supervisor: str,
+                                                supervisor_request: ConsultationRequest,
+                                                workers: List[str]) -> Dict[str, Any]:
+        """Run workers on the base context while the supervisor runs, re-running only those its guidance affects"""
+        def worker_request(context: Dict[str, Any]) -> ConsultationRequest:
+            return ConsultationRequest(
+                objective=request.objective,
+                context=context,
+                constraints=request.constraints,
+                output_format=request.output_format,
+                success_criteria=request.success_criteria
+            )
+        
+        async def publish(worker: str, task: asyncio.Future) -> AgentResponse:
+            # Speculative results are recorded and streamed only once accepted
+            try:
+                response = await task
+            except Exception as e:
+                self._emit("agent_failed", e, worker)
+                raise
+            self._emit("agent_response", response, worker)
+            return response
+        
+        supervisor_task = asyncio.ensure_future(self._scheduled_consult(supervisor, supervisor_request))
+        speculative = {worker: asyncio.ensure_future(
+                           self._scheduled_consult(worker, worker_request(request.context), emit=False))
+                       for worker in workers}
+        try:
+            supervisor_response = await supervisor_task
+        except BaseException:
+            for task in speculative.values():
+                task.cancel()
+            raise
+        
+        guidance = supervisor_response.result
+        guided_context = {**request.context, "supervisor_guidance": guidance}
+        final_tasks = {}
+        speculation = {}
+        for worker, task in speculative.items():
+            # Finished workers are judged on what they saw and produced, running ones on their input
+            if not task.done():
+                basis = request.context
+            elif not task.cancelled() and task.exception() is None:
+                basis = {"context": request.context, "result": task.result().result}
+            else:
+                basis = None
+            
+            if basis is not None and self.speculation_policy.accepts(guidance, basis):
+                final_tasks[worker] = asyncio.ensure_future(publish(worker, task))
+                speculation[worker] = "accepted"
+            else:
+                task.cancel()
+                final_tasks[worker] = asyncio.ensure_future(
+                    self._scheduled_consult(worker, worker_request(guided_context)))
+                speculation[worker] = "rerun"
+        
+        logger.info(f"Speculative workers: {speculation}")
+        worker_responses = await asyncio.gather(*final_tasks.values(), return_exceptions=True)
+        
+        return {
+            "pattern": "hierarchical",
+            "supervisor_result": {"agent": supervisor, "response": supervisor_response},
+            "worker_results": [
+                {"agent": workers[i], "response": resp}
+                for i, resp in enumerate(worker_responses)
+                if not isinstance(resp, BaseException)
+            ],
+            "speculation": speculation
+        }
+    
+    async def _scheduled_consult(self, agent_name: str, request: ConsultationRequest,
+                                 emit: bool = True) -> AgentResponse:
+        """
+        Consult an agent once the scheduler admits the call
+        
+        Cached responses skip admission, and a call identical to one already
+        in flight waits for that one instead of consulting the agent again.
+        With emit=False the outcome is not recorded or streamed; the caller
+        publishes it once it decides to keep it.
+        """
+        call_key = None
+        if self.response_cache is not None or self.single_flight is not None or _active_batch.get() is not None:
+            call_key = consultation_key(agent_name, request, self._active_registry().fingerprint)
+        
+        if self.response_cache is not None:
+            cached = await self.response_cache.get_async(agent_name, call_key)
+            if cached is not None:
+                logger.info(f"Consulting {agent_name} (cached)")
+                if emit:
+                    self._emit("agent_response", cached, agent_name)
+                return cached
+        
+        def admitted_consult():
+            return self.scheduler.run(agent_name, lambda: self._consult_agent(agent_name, request))
+        
+        # Within a batch, calls are shared with every consultation of the batch
+        batch = _active_batch.get()
+        flights = batch.calls if batch is not None else self.single_flight
+        shared = False
+        try:
+            if flights is not None:
+                response, shared = await flights.run(call_key, admitted_consult)
+            else:
+                response = await admitted_consult()
+        except CircuitOpenError as e:
+            logger.info(f"{e}; answering with a fallback response")
+            response = await self._fallback_response(agent_name, call_key, str(e))
+            if emit:
+                self._emit("agent_response", response, agent_name)
+            return response
+        except Exception as e:
+            if emit:
+                self._emit("agent_failed", e, agent_name)
+            raise
+        if shared:
+            # Callers own their responses (retaining flights already copy for every caller);
+            # only the first caller stores it
+            if not flights.retain:
+                response = copy.deepcopy(response)
+        elif self.response_cache is not None and response.status == "success":
+            await self.response_cache.put_async(agent_name, call_key, response)
+        if emit:
+            self._emit("agent_response", response, agent_name)
+        return response
+    
+    async def _fallback_response(self, agent_name: str, call_key: Optional[str], reason: str) -> AgentResponse:
+        """Stand-in while an agent's circuit is open: its last cached answer, or a degraded response"""
+        if self.response_cache is not None:
+            stale = await self.response_cache.get_stale_async(call_key)
+            if stale is not None:
+                stale.status = "partial"
+                stale.metadata["stale"] = True
+                return stale
+        return AgentResponse(
+            status="degraded",
+            metadata={"agent_name": agent_name, "degraded": True},
+            scope_boundaries=self.agent_specs.get(agent_name, {}).get('scope_boundaries', {}),
+            errors=reason
+        )
+    
+    async def _consult_agents(self, calls: List[Tuple[str, ConsultationRequest]]) -> List[Union[AgentResponse, Exception]]:
+        """Consult agents concurrently within the scheduler's limits; failures are returned, not raised"""
+        return await asyncio.gather(*(self._scheduled_consult(agent_name, agent_request)
+                                      for agent_name, agent_request in calls),
+                                    return_exceptions=True)
+    
     async def _consult_agent(self, agent_name: str, request: ConsultationRequest) -> AgentResponse:
         """
-        Consult individual agent (simulated for now)
+        Consult individual agent through the configured backend
         
-        In full implementation, this would:
-        1. Load agent specification
-        2. Apply agent's methodology 
-        3. Generate structured response
-        4. Validate against agent's framework
+        The default backend simulates agents in-process; a process pool or
+        HTTP backend runs the same patterns across cores or services.
         """
         logger.info(f"Consulting {agent_name}")
         
-        # Simulate agent processing time
-        await asyncio.sleep(0.1)
-        
-        # Get agent specification
         agent_spec = self.agent_specs.get(agent_name, {})
-        methodology = agent_spec.get('agent_identity', {}).get('methodology', 'Generic methodology')
-        
-        # Simulate agent response (in real implementation, this would use the agent's actual logic)
-        simulated_response = AgentResponse(
-            status="success",
-            result={
-                "primary_recommendation": f"Strategic recommendation from {agent_name} using {methodology}",
-                "methodology_applied": methodology,
-                "specific_guidance": f"Detailed guidance based on {methodology} framework"
-            },
-            metadata={
-                "confidence": 0.85,
-                "methodology_applied": methodology,
-                "agent_name": agent_name,
-                "processing_time": "0.1s"
-            },
-            recommendations={
-                "complementary_consultations": self._get_complementary_agents(agent_name),
-                "implementation_approach": "Follow methodology-specific implementation steps"
-            },
-            scope_boundaries=agent_spec.get('scope_boundaries', {}),
-            potential_conflicts=agent_spec.get('potential_conflicts', {})
-        )
-        
-        return simulated_response
+        return await self.backend.consult(agent_name, agent_spec, request)
     
     def _filter_context_for_agent(self, context: Dict[str, Any], agent_name: str) -> Dict[str, Any]:
         """Filter and optimize context for specific agent (following article's context management)"""
@@ -598,23 +1311,7 @@ class MetaOrchestrator:
     
     def _get_complementary_agents(self, agent_name: str) -> List[str]:
         """Get complementary agents based on orchestration patterns"""
-        # Get from agent spec if available
-        agent_spec = self.agent_specs.get(agent_name, {})
-        orchestration = agent_spec.get('orchestration_integration', {})
-        
-        complementary = []
-        
-        # Parallel collaboration agents
-        parallel_collabs = orchestration.get('parallel_collaboration', [])
-        for collab in parallel_collabs:
-            if 'agent' in collab:
-                complementary.append(collab['agent'])
-        
-        # Sequential workflow next steps
-        next_steps = orchestration.get('sequential_workflow', {}).get('next_steps', [])
-        complementary.extend(next_steps)
-        
-        return complementary[:3]  # Limit to 3 suggestions
+        return complementary_agents(self.agent_specs.get(agent_name, {}))
     
     def _detect_conflicts(self, agent_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Detect conflicts between agent responses"""
@@ -662,6 +1359,22 @@ class MetaOrchestrator:
                 "methodology_synthesis": self._synthesize_methodologies([r["response"] for r in results])
             }
         
+        elif pattern == "dag":
+            # For dependency graphs, the sinks carry the fully informed results
+            upstream_agents = {dep for r in results for dep in r["depends_on"]}
+            final_results = [r["response"] for r in results if r["agent"] not in upstream_agents]
+            primary_result = {}
+            for response in final_results:
+                primary_result.update(response.result)
+            synthesis = {
+                "status": "success" if final_results and all(r.status == "success" for r in final_results) else "partial",
+                "orchestration_pattern": pattern,
+                "primary_result": primary_result,
+                "agent_chain": [r["agent"] for r in results],
+                "critical_path": execution_result["critical_path"],
+                "methodology_synthesis": self._synthesize_methodologies([r["response"] for r in results])
+            }
+        
         elif pattern == "mapreduce":
             # For MapReduce, aggregate all successful results
             successful_results = [r["response"] for r in results if r["response"].status in ["success", "partial"]]
@@ -697,6 +1410,8 @@ class MetaOrchestrator:
                     "confidence": r["response"].metadata.get("confidence", 0.0)
                 } for r in results]
             }
+            if "quorum" in execution_result:
+                synthesis["quorum"] = execution_result["quorum"]
         
         else:  # hierarchical
             supervisor_result = execution_result.get("supervisor_result", {})
@@ -713,6 +1428,8 @@ class MetaOrchestrator:
                 "supervision_agent": supervisor_result.get("agent", ""),
                 "implementation_agents": [w["agent"] for w in worker_results]
             }
+            if "speculation" in execution_result:
+                synthesis["speculation"] = execution_result["speculation"]
         
         # Add meta-information
         synthesis.update({
@@ -727,6 +1444,40 @@ class MetaOrchestrator:
         
         return synthesis
     
+    def _synthesize_partial(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Synthesis of the agents that finished before the consultation deadline"""
+        run = _active_run.get()
+        completed = run.completed if run else []
+        responses = [entry["response"] for entry in completed]
+        finished = [entry["agent"] for entry in completed]
+        
+        strategy = analysis["decomposition_strategy"]
+        planned = ([step["agent"] for step in strategy.get("steps", [])] +
+                   [node["agent"] for node in strategy.get("nodes", [])] +
+                   strategy.get("parallel_agents", []) + strategy.get("agents", []) +
+                   ([strategy["supervisor"]] if "supervisor" in strategy else []) + strategy.get("workers", []))
+        
+        synthesis = {
+            "status": "partial" if responses else "failed",
+            "orchestration_pattern": analysis["orchestration_pattern"].value,
+            "deadline_exceeded": True,
+            "partial_results": {
+                "completed_results": {entry["agent"]: entry["response"].result for entry in completed},
+                "combined_recommendations": self._combine_recommendations(responses),
+                "methodology_synthesis": self._synthesize_methodologies(responses)
+            },
+            "contributing_agents": finished,
+            "pending_agents": [agent for agent in dict.fromkeys(planned) if agent not in finished]
+        }
+        synthesis["meta_orchestrator"] = {
+            "analysis": analysis,
+            "agents_consulted": len(completed),
+            "total_processing_time": "simulated",
+            "orchestration_success": False,
+            "quality_score": self._calculate_quality_score(synthesis)
+        }
+        return synthesis
+    
     def _optimize_agent_selection(self, analysis: Dict[str, Any], overlaps: List[AgentOverlap]) -> Dict[str, Any]:
         """Optimize agent selection based on detected overlaps"""
         optimized_analysis = analysis.copy()
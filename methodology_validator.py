@@ -4,12 +4,12 @@ Methodology Validation System for Enhanced Agent System
 Validates expert framework adherence and methodology integrity
 """
 
-import json
 import asyncio
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
+from agent_registry import AgentRegistrySnapshot, get_agent_registry
 
 logger = logging.getLogger(__name__)
 
@@ -56,22 +56,15 @@ class MethodologyValidationResult:
 class MethodologyValidator:
     """Expert methodology validation system"""
     
-    def __init__(self, agent_registry_path: str = "/workspaces/JoineryAgency/enhanced-agent-registry.json"):
-        self.agent_registry = self._load_agent_registry(agent_registry_path)
+    def __init__(self, agent_registry_path: Optional[str] = None,
+                 registry: Optional[AgentRegistrySnapshot] = None):
+        self.registry = registry or get_agent_registry(agent_registry_path)
+        self.agent_registry = self.registry.registry
         self.expert_frameworks = self._load_expert_frameworks()
         self.validation_rules = self._build_validation_rules()
         
         logger.info(f"Methodology Validator initialized with {len(self.expert_frameworks)} expert frameworks")
     
-    def _load_agent_registry(self, registry_path: str) -> Dict[str, Any]:
-        """Load the agent registry"""
-        try:
-            with open(registry_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning(f"Agent registry not found at {registry_path}")
-            return {}
-    
     def _load_expert_frameworks(self) -> Dict[str, Dict[str, Any]]:
         """Load expert framework specifications"""
         frameworks = {}
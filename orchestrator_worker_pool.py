@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Worker Pool for Enhanced Agent System
+Runs consultations across several orchestrator processes fed from one job queue
+
+Routing, intelligence analysis and synthesis are CPU work on the event loop,
+so a single MetaOrchestrator is bound to one core. The pool starts N worker
+processes, each with its own orchestrator and event loop, and dispatches
+consultation requests to them through a shared multiprocessing queue.
+
+The registry is loaded once in the parent before the workers start: forked
+workers inherit the compiled snapshot copy-on-write, and spawned workers
+warm-start from the content-hashed registry cache. A worker only takes a job
+from the queue when it has a free consultation slot, so idle workers pick up
+the backlog while busy ones are still working.
+
+Workers report every job they take, so when a worker process dies the parent
+fails the consultations it was holding instead of waiting for them forever;
+once no worker is left, every outstanding job fails. A worker can also die
+after taking a job but before its report is flushed. Once a worker has died,
+a job that nobody claims within LOST_JOB_GRACE, while some live worker has a
+free slot, is therefore counted as lost and failed too.
+
+The job queue has one reader lock shared by all workers. A worker killed
+inside jobs.get() can die holding it, and then no other worker can ever
+take a job again. The pool cannot recover from that. The lost-job rule
+still fails the stranded jobs so callers are not left waiting, but the pool
+has to be restarted.
+
+Usage:
+    with OrchestratorWorkerPool(workers=4) as pool:
+        for index, result in pool.execute(requests):
+            ...
+"""
+
+import asyncio
+import multiprocessing
+import os
+import pickle
+import queue
+import time
+from typing import Dict, List, Any, Deque, Iterable, Iterator, Optional, Set, Tuple
+import logging
+from collections import deque
+from agent_registry import get_agent_registry
+from consultation_protocol import ConsultationRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKER_CONCURRENCY = 32  # Consultations in flight per worker
+WORKER_START_TIMEOUT = 60.0  # seconds
+WORKER_STOP_TIMEOUT = 10.0
+WORKER_POLL_INTERVAL = 0.5  # How often a waiting parent checks that workers are alive
+LOST_JOB_GRACE = 2.0  # Seconds a job may go unclaimed while a worker is free, after a death, before it counts as lost
+
+# Messages from workers to the parent: (kind, key, payload)
+_READY = "ready"
+_TAKEN = "taken"
+_RESULT = "result"
+
+def _take_job(worker_id: int, jobs, results):
+    """Next job from the shared queue, reported to the parent as held by this worker"""
+    job = jobs.get()
+    if job is not None:
+        results.put((_TAKEN, job[0], worker_id))
+    return job
+
+def _worker_main(worker_id: int, jobs, results, concurrency: int,
+                 registry_path: Optional[str], agents_directory: Optional[str],
+                 orchestrator_options: Dict[str, Any]):
+    """Worker process entry point: consult until a None job arrives"""
+    logging.disable(logging.INFO)  # Per-consultation logging would dominate worker CPU
+    from meta_orchestrator import MetaOrchestrator
+
+    # Inherited from the parent when forked, loaded from the registry cache when spawned
+    registry = get_agent_registry(registry_path, agents_directory)
+    orchestrator = MetaOrchestrator(registry=registry, **orchestrator_options)
+    results.put((_READY, worker_id, None))
+    asyncio.run(_worker_loop(worker_id, orchestrator, jobs, results, concurrency))
+
+async def _worker_loop(worker_id: int, orchestrator, jobs, results, concurrency: int):
+    running: Dict[asyncio.Future, int] = {}
+    fetch: Optional[asyncio.Future] = None
+    stopping = False
+
+    while running or not stopping:
+        # Only ask for work while a slot is free, so queued jobs go to idle workers
+        if fetch is None and not stopping and len(running) < concurrency:
+            fetch = asyncio.ensure_future(asyncio.to_thread(_take_job, worker_id, jobs, results))
+
+        waiting = set(running) | ({fetch} if fetch is not None else set())
+        done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+        if fetch in done:
+            job = fetch.result()
+            fetch = None
+            if job is None:
+                stopping = True
+            else:
+                job_id, request = job
+                running[asyncio.ensure_future(orchestrator.execute_consultation(request))] = job_id
+
+        for task in done & set(running):
+            job_id = running.pop(task)
+            try:
+                payload = pickle.dumps(task.result(), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                # Failed consultations and unpicklable results alike come back as failures
+                payload = pickle.dumps({"status": "failed", "errors": str(e)})
+            results.put((_RESULT, job_id, (worker_id, payload)))
+
+class OrchestratorWorkerPool:
+    """
+    Pool of orchestrator processes consuming a shared job queue
+
+    orchestrator_options are passed to each worker's MetaOrchestrator and
+    must be picklable when workers are spawned rather than forked.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 concurrency: int = DEFAULT_WORKER_CONCURRENCY,
+                 registry_path: Optional[str] = None,
+                 agents_directory: Optional[str] = None,
+                 orchestrator_options: Optional[Dict[str, Any]] = None,
+                 start_method: Optional[str] = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.registry_path = registry_path
+        self.agents_directory = agents_directory
+        self.orchestrator_options = dict(orchestrator_options or {})
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._processes: List[multiprocessing.Process] = []
+        self._jobs = None
+        self._results = None
+        self._next_job_id = 0
+        self._outstanding: Set[int] = set()
+        self._held_by_worker: Dict[int, Set[int]] = {}
+        self._dead_workers: Set[int] = set()
+        self._failed: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self._unclaimed_since: Dict[int, float] = {}  # Jobs no live worker holds while one has a free slot
+        self._last_check = 0.0
+        self._completed_by_worker: Dict[int, int] = {}
+
+    def start(self) -> 'OrchestratorWorkerPool':
+        """Load the registry, start the workers and wait until every one is ready"""
+        get_agent_registry(self.registry_path, self.agents_directory)
+        self._jobs = self._context.Queue()
+        self._results = self._context.Queue()
+        for worker_id in range(self.workers):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(worker_id, self._jobs, self._results, self.concurrency,
+                      self.registry_path, self.agents_directory, self.orchestrator_options),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + WORKER_START_TIMEOUT
+        ready = 0
+        while ready < self.workers:
+            try:
+                kind, worker_id, _ = self._results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.stop()
+                raise RuntimeError(f"Only {ready} of {self.workers} orchestrator workers started")
+            if kind == _READY:
+                ready += 1
+                self._completed_by_worker[worker_id] = 0
+        logger.info(f"Orchestrator worker pool ready with {self.workers} workers")
+        return self
+
+    def submit(self, request: ConsultationRequest) -> int:
+        """Queue one consultation; returns its job id"""
+        if self._jobs is None:
+            raise RuntimeError("Worker pool is not started")
+        job_id = self._next_job_id
+        self._next_job_id += 1
+        self._outstanding.add(job_id)
+        self._jobs.put((job_id, request))
+        return job_id
+
+    def get_result(self, timeout: Optional[float] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Next finished consultation as (job id, result); raises queue.Empty after timeout
+
+        Jobs held by a worker process that died come back as failed results.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._failed:
+                return self._failed.popleft()
+            wait = WORKER_POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, max(0.0, deadline - time.monotonic()))
+            try:
+                kind, job_id, payload = self._results.get(timeout=wait)
+            except queue.Empty:
+                self._check_workers()
+                if not self._failed and deadline is not None and time.monotonic() >= deadline:
+                    raise
+                continue
+            if time.monotonic() - self._last_check >= WORKER_POLL_INTERVAL:
+                self._check_workers()  # Also while results keep arriving
+            if kind == _TAKEN:
+                if payload in self._dead_workers:
+                    self._fail_job(job_id, payload)  # Reported only after its worker was found dead
+                else:
+                    self._held_by_worker.setdefault(payload, set()).add(job_id)
+                continue
+            if kind != _RESULT or job_id not in self._outstanding:
+                continue
+            worker_id, result = payload
+            self._outstanding.discard(job_id)
+            self._held_by_worker.get(worker_id, set()).discard(job_id)
+            self._completed_by_worker[worker_id] = self._completed_by_worker.get(worker_id, 0) + 1
+            return job_id, pickle.loads(result)
+
+    def _check_workers(self):
+        """Fail the jobs of workers that died, jobs lost with them, and every outstanding job once none is left"""
+        self._last_check = time.monotonic()
+        for worker_id, process in enumerate(self._processes):
+            if worker_id in self._dead_workers or process.is_alive():
+                continue
+            self._dead_workers.add(worker_id)
+            held = self._held_by_worker.pop(worker_id, set())
+            logger.warning(f"Orchestrator worker {worker_id} exited with code {process.exitcode}; "
+                           f"failing {len(held)} consultations it held")
+            for job_id in sorted(held):
+                self._fail_job(job_id, worker_id)
+        if self._processes and len(self._dead_workers) == len(self._processes):
+            # Nobody is left to take the jobs still queued
+            for job_id in sorted(self._outstanding):
+                self._fail_job(job_id, None)
+        elif self._dead_workers:
+            self._fail_lost_jobs()
+
+    def _fail_lost_jobs(self):
+        """Fail jobs that stay unclaimed although a live worker is free to take them"""
+        live = [worker_id for worker_id in range(len(self._processes)) if worker_id not in self._dead_workers]
+        if all(len(self._held_by_worker.get(worker_id, ())) >= self.concurrency for worker_id in live):
+            self._unclaimed_since.clear()  # Every worker is busy, so queued jobs are simply waiting
+            return
+        held = set().union(*(self._held_by_worker.get(worker_id, set()) for worker_id in live))
+        now = time.monotonic()
+        self._unclaimed_since = {job_id: self._unclaimed_since.get(job_id, now)
+                                 for job_id in self._outstanding if job_id not in held}
+        for job_id, since in sorted(self._unclaimed_since.items()):
+            if now - since >= LOST_JOB_GRACE:
+                self._fail_job(job_id, None, "was lost with an orchestrator worker that exited")
+
+    def _fail_job(self, job_id: int, worker_id: Optional[int], reason: Optional[str] = None):
+        if job_id not in self._outstanding:
+            return
+        self._outstanding.discard(job_id)
+        self._unclaimed_since.pop(job_id, None)
+        if reason is not None:
+            reason = f"Consultation {reason}"
+        elif worker_id is None:
+            reason = "No orchestrator worker is left to run the consultation"
+        else:
+            reason = f"Orchestrator worker {worker_id} exited during the consultation"
+        self._failed.append((job_id, {"status": "failed", "errors": reason}))
+
+    def execute(self, requests: Iterable[ConsultationRequest]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Run requests across the pool, yielding (input index, result) in completion order
+
+        At most two jobs per worker slot are queued at a time, so long request
+        streams are consumed lazily.
+        """
+        window = 2 * self.workers * self.concurrency
+        job_index: Dict[int, int] = {}
+        for index, request in enumerate(requests):
+            job_index[self.submit(request)] = index
+            while len(job_index) >= window:
+                job_id, result = self.get_result()
+                yield job_index.pop(job_id), result
+        while job_index:
+            job_id, result = self.get_result()
+            yield job_index.pop(job_id), result
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker count, jobs still outstanding, and consultations completed per worker"""
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "outstanding": len(self._outstanding),
+            "dead_workers": sorted(self._dead_workers),
+            "completed_by_worker": dict(self._completed_by_worker)
+        }
+
+    def stop(self):
+        """Let workers finish their running consultations, then shut them down"""
+        if self._jobs is not None:
+            for _ in self._processes:
+                self._jobs.put(None)
+        for process in self._processes:
+            process.join(WORKER_STOP_TIMEOUT)
+            if process.is_alive():
+                logger.warning(f"Terminating unresponsive orchestrator worker {process.pid}")
+                process.terminate()
+                process.join()
+        self._processes = []
+        for channel in (self._jobs, self._results):
+            if channel is not None:
+                channel.close()
+                channel.join_thread()
+        self._jobs = self._results = None
+
+    def __enter__(self) -> 'OrchestratorWorkerPool':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Request Routing Indexes for Enhanced Agent System
+Compiled trigger matching used to identify candidate agents for a request
+
+The routing index is built once per registry snapshot: an inverted index from
+normalized trigger tokens to agent postings, plus an automaton over the token
+vocabulary. Identifying candidate agents is a single linear scan of the
+request text followed by postings lookups for the tokens found, so only
+agents sharing vocabulary with the request are ever touched.
+
+Candidates are ranked with BM25. Per-posting weights are precomputed when the
+index is built, so scoring a request is a sparse sum over the matched tokens'
+weight rows.
+"""
+
+from typing import Dict, List, Any, Iterable, Set, Tuple
+from dataclasses import dataclass
+import math
+import string
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Trigger words shorter than this are too generic to route on
+MIN_TRIGGER_WORD_LENGTH = 4
+
+# Punctuation stripped from token edges; inner hyphens ("mobile-first") are kept
+TOKEN_EDGE_PUNCTUATION = string.punctuation
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+class TriggerMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of patterns
+
+    Matching walks the trie once per input character and follows failure
+    links on mismatches, so a scan is linear in the text length (plus the
+    number of matches) regardless of how many patterns are compiled in.
+    Only trie edges are stored, which keeps the automaton small enough to
+    cache with the registry snapshot.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(sorted(set(patterns)))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[str, ...]] = [()]
+        self._build()
+
+    def _build(self):
+        """Build the trie and breadth-first failure links"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[str]] = [[]]
+
+        # Trie of all patterns
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern)
+
+        # Failure links point at the longest proper suffix that is also a trie path
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in goto[state].items():
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state].extend(outputs[fail[next_state]])
+                queue.append(next_state)
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = [tuple(output) for output in outputs]
+
+    def find(self, text: str) -> Set[str]:
+        """Return every pattern occurring anywhere in text"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+@dataclass(frozen=True)
+class RoutingIndex:
+    """Inverted index from trigger tokens to agent postings, with a compiled matcher"""
+    matcher: TriggerMatcher
+    postings: Dict[str, Dict[str, int]]          # token -> {agent name: term frequency}
+    weights: Dict[str, Dict[str, float]]         # token -> {agent name: BM25 weight}
+    agent_order: Dict[str, int]
+
+    def match_words(self, text: str) -> Set[str]:
+        """Indexed tokens present in the (lowercased) request text"""
+        return self.matcher.find(text)
+
+    def agents_for_words(self, words: Iterable[str]) -> List[str]:
+        """Agents whose postings intersect the given tokens, in registry order"""
+        agents = set()
+        for word in words:
+            agents.update(self.postings.get(word, ()))
+        return sorted(agents, key=self.agent_order.__getitem__)
+
+    def rank_agents(self, words: Iterable[str]) -> List[Tuple[str, float]]:
+        """BM25-scored agents for the given tokens, best first (registry order breaks ties)"""
+        scores: Dict[str, float] = {}
+        for word in sorted(words):  # Fixed summation order keeps scores bit-identical
+            for agent_name, weight in self.weights.get(word, {}).items():
+                scores[agent_name] = scores.get(agent_name, 0.0) + weight
+        order = self.agent_order
+        return sorted(scores.items(), key=lambda item: (-item[1], order[item[0]]))
+
+    def document_frequency(self, word: str) -> int:
+        """Number of agents whose vocabulary contains the token"""
+        return len(self.postings.get(word, ()))
+
+def routing_tokens(text: str) -> List[str]:
+    """Normalized routable tokens of a trigger or framework description"""
+    tokens = []
+    for word in text.lower().split():
+        word = word.strip(TOKEN_EDGE_PUNCTUATION)
+        if len(word) >= MIN_TRIGGER_WORD_LENGTH:
+            tokens.append(word)
+    return tokens
+
+def agent_routing_vocabulary(spec: Dict[str, Any]) -> List[str]:
+    """Tokens an agent is routed on: usage triggers, expert framework and declared scope"""
+    tokens = []
+    for trigger in spec.get("usage_triggers", []):
+        tokens.extend(routing_tokens(trigger))
+    tokens.extend(routing_tokens(spec.get("agent_identity", {}).get("expert_framework", "")))
+    tokens.extend(routing_tokens(spec.get("scope_boundaries", {}).get("covers", "")))
+    return tokens
+
+def bm25_weights(postings: Dict[str, Dict[str, int]],
+                 document_lengths: Dict[str, int]) -> Dict[str, Dict[str, float]]:
+    """Precompute the BM25 contribution of every (token, agent) posting"""
+    agent_count = len(document_lengths)
+    average_length = sum(document_lengths.values()) / agent_count if agent_count else 0.0
+
+    weights = {}
+    for token, agent_postings in postings.items():
+        frequency = len(agent_postings)
+        idf = math.log(1 + (agent_count - frequency + 0.5) / (frequency + 0.5))
+        row = {}
+        for agent_name, term_frequency in agent_postings.items():
+            length_ratio = document_lengths[agent_name] / average_length if average_length else 1.0
+            saturation = term_frequency + BM25_K1 * (1 - BM25_B + BM25_B * length_ratio)
+            row[agent_name] = idf * term_frequency * (BM25_K1 + 1) / saturation
+        weights[token] = row
+    return weights
+
+def build_routing_index(agent_specs: Dict[str, Dict[str, Any]]) -> RoutingIndex:
+    """Build the inverted index, BM25 weights and trigger matcher for all agents"""
+    postings: Dict[str, Dict[str, int]] = {}
+    document_lengths = {}
+    agent_order = {}
+
+    for position, (agent_name, spec) in enumerate(agent_specs.items()):
+        agent_order[agent_name] = position
+        vocabulary = agent_routing_vocabulary(spec)
+        document_lengths[agent_name] = len(vocabulary)
+        for token in vocabulary:
+            agent_postings = postings.setdefault(token, {})
+            agent_postings[agent_name] = agent_postings.get(agent_name, 0) + 1
+
+    return RoutingIndex(
+        matcher=TriggerMatcher(postings),
+        postings=postings,
+        weights=bm25_weights(postings, document_lengths),
+        agent_order=agent_order
+    )
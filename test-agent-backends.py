@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Agent Backends Test Suite
+Tests in-process, process-pool and HTTP agent execution
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from agent_registry import get_agent_registry
+from agent_backends import (InProcessBackend, ProcessPoolBackend, HTTPBackend, SimulatedAgentServer,
+                            simulated_agent_response)
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest
+
+REQUEST = ConsultationRequest(
+    objective="Website conversion optimization with comprehensive analysis",
+    context={"business_type": "SaaS", "current_conversion_rate": "2.1%"}
+)
+
+def cpu_bound_agent(agent_name, agent_spec, request):
+    """Stand-in for CPU-heavy local agent logic"""
+    digest = agent_name.encode()
+    for _ in range(200_000):
+        digest = hashlib.sha256(digest).digest()
+    return simulated_agent_response(agent_name, agent_spec, request)
+
+def test_backends_match_simulation():
+    """Test that every backend yields the same consultation as the default simulation"""
+    print("\n=== BACKEND EQUIVALENCE TEST ===")
+
+    baseline = asyncio.run(MetaOrchestrator().execute_consultation(REQUEST))
+
+    pool = ProcessPoolBackend(max_workers=2)
+    try:
+        pooled = asyncio.run(MetaOrchestrator(backend=pool).execute_consultation(REQUEST))
+    finally:
+        pool.close()
+
+    with SimulatedAgentServer(get_agent_registry().agent_specs) as server:
+        served = asyncio.run(MetaOrchestrator(backend=HTTPBackend(server.url)).execute_consultation(REQUEST))
+
+    for name, result in [("process pool", pooled), ("http", served)]:
+        print(f"{name}: {result['status']}, agents {result['contributing_agents']}")
+        assert result["aggregated_results"] == baseline["aggregated_results"]
+
+    # Unreachable services degrade to failed responses rather than raising
+    unreachable = HTTPBackend("http://127.0.0.1:9", timeout=1.0)
+    response = asyncio.run(unreachable.consult("copywriter", {}, REQUEST))
+    assert response.status == "failed" and response.errors
+
+def test_process_pool_uses_cores():
+    """Test that CPU-bound agents run in parallel across worker processes"""
+    print("\n=== PROCESS POOL PARALLELISM TEST ===")
+
+    print(f"CPU cores: {os.cpu_count()}")
+    timings = {}
+    pool = ProcessPoolBackend(cpu_bound_agent, max_workers=4)
+    try:
+        for name, backend in [("in-process", InProcessBackend(cpu_bound_agent)), ("process pool", pool)]:
+            orchestrator = MetaOrchestrator(backend=backend)
+            start = time.perf_counter()
+            result = asyncio.run(orchestrator.execute_consultation(REQUEST))
+            timings[name] = time.perf_counter() - start
+            assert result["status"] == "success"
+            print(f"{name}: {timings[name]:.2f}s for {result['agent_count']} agents")
+    finally:
+        pool.close()
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.WARNING)
+
+    test_backends_match_simulation()
+    test_process_pool_uses_cores()
+
+    print("\n✅ AGENT BACKEND TESTS COMPLETED")
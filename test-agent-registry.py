@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Agent Registry Test Suite
+Tests the shared compiled registry snapshot and its consumers
+"""
+
+import os
+import time
+import json
+import shutil
+import tempfile
+import pickle
+import asyncio
+import contextvars
+from agent_registry import get_agent_registry, compile_agent_registry, HOT_SPEC_SECTIONS
+from agent_bitsets import AgentBitIndex
+from request_routing import agent_routing_vocabulary
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest, _pinned_registry
+from intelligence_engine import OverlapDetector
+
+def test_shared_snapshot():
+    """Test that every consumer shares one compiled snapshot"""
+    print("\n=== SHARED SNAPSHOT TEST ===")
+
+    snapshot = get_agent_registry()
+    orchestrator = MetaOrchestrator()
+
+    assert get_agent_registry() is snapshot
+    assert orchestrator.registry is snapshot
+    assert orchestrator.intelligence_engine.registry is snapshot
+    assert orchestrator.intelligence_engine.methodology_validator.registry is snapshot
+    assert orchestrator.agent_specs is snapshot.agent_specs
+
+    print(f"Agent specs: {len(snapshot.agent_specs)}")
+    print(f"Registered specs: {len(snapshot.registered_specs)}")
+    print(f"Expert frameworks: {len(orchestrator.intelligence_engine.methodology_validator.expert_frameworks)}")
+
+    # Registered specs reuse the same parsed objects as the orchestrator view
+    pricing = snapshot.registered_specs["enhanced-pricing-strategist"]
+    assert pricing is snapshot.agent_specs["pricing-strategist"]
+
+def test_orchestrator_construction_cost():
+    """Compare per-request orchestrator construction against a full compile"""
+    print("\n=== CONSTRUCTION COST TEST ===")
+
+    iterations = 50
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        compile_agent_registry()
+    compile_time = (time.perf_counter() - start) / iterations
+
+    get_agent_registry()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        MetaOrchestrator()
+    construct_time = (time.perf_counter() - start) / iterations
+
+    print(f"Registry compile: {compile_time * 1000:.2f} ms")
+    print(f"Orchestrator construction (shared snapshot): {construct_time * 1000:.2f} ms")
+
+def test_lazy_cold_sections():
+    """Test that routing stays on hot sections and cold sections load on demand"""
+    print("\n=== LAZY HOT/COLD SPEC TEST ===")
+
+    snapshot = compile_agent_registry()
+    orchestrator = MetaOrchestrator(registry=snapshot)
+
+    request = ConsultationRequest(
+        objective="Help me price my design services",
+        context={"business_type": "design agency", "current_pricing": "hourly rates"}
+    )
+    asyncio.run(orchestrator.execute_consultation(request))
+
+    cold_loaded = [name for name, spec in snapshot.agent_specs.items() if spec.cold_loaded]
+    print(f"Specs with cold sections loaded after a consultation: {len(cold_loaded)}")
+    assert not cold_loaded
+
+    spec = snapshot.agent_specs["pricing-strategist"]
+    with open(spec.source_path) as f:
+        full_spec = json.load(f)
+    assert set(spec.keys()) == set(full_spec.keys())
+    assert spec["methodology_engine"] == full_spec["methodology_engine"]
+    assert spec.cold_loaded
+
+    hot_size = sum(len(json.dumps({k: s[k] for k in HOT_SPEC_SECTIONS if k in s}))
+                   for s in snapshot.agent_specs.values())
+    full_size = sum(len(open(s.source_path).read()) for s in snapshot.agent_specs.values())
+    print(f"Resident spec JSON: {hot_size / 1024:.1f} KB of {full_size / 1024:.1f} KB")
+    print(f"Pickled snapshot: {len(pickle.dumps(snapshot)) / 1024:.1f} KB")
+
+def test_routing_index():
+    """Test that postings lookups find exactly the agents sharing vocabulary with a request"""
+    print("\n=== ROUTING INDEX TEST ===")
+
+    snapshot = get_agent_registry()
+    routing = snapshot.routing
+    print(f"Indexed tokens: {len(routing.postings)}")
+
+    for text in ["help me price my design services",
+                 "wcag compliance and inclusive design for enterprise clients",
+                 "brand positioning, then a referral partnership program"]:
+        expected = [name for name, spec in snapshot.agent_specs.items()
+                    if any(token in text for token in agent_routing_vocabulary(spec))]
+        matched = routing.match_words(text)
+        assert routing.agents_for_words(matched) == expected
+        ranked = routing.rank_agents(matched)
+        assert sorted(agent for agent, _ in ranked) == sorted(expected)
+        assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+        print(f"{len(expected):2d} candidates from {len(matched)} tokens, top {ranked[0][0]}: {text}")
+
+    # Ranking puts the specialist first instead of whichever agent comes first in the registry
+    orchestrator = MetaOrchestrator(registry=snapshot)
+    analysis = orchestrator.analyze_consultation_request(
+        ConsultationRequest(objective="Improve WCAG compliance for our site", context={}))
+    assert analysis["agent_candidates"][0] == "accessibility-specialist"
+
+    # Term frequencies count every trigger and framework occurrence
+    pricing_vocabulary = agent_routing_vocabulary(snapshot.agent_specs["pricing-strategist"])
+    assert routing.postings["pricing"]["pricing-strategist"] == pricing_vocabulary.count("pricing")
+
+def test_incremental_reload():
+    """Test that editing one spec patches the running orchestrator incrementally"""
+    print("\n=== INCREMENTAL HOT RELOAD TEST ===")
+
+    source = get_agent_registry()
+    with tempfile.TemporaryDirectory() as workdir:
+        registry_path = os.path.join(workdir, "enhanced-agent-registry.json")
+        agents_dir = os.path.join(workdir, "agents")
+        shutil.copy(source.registry_path, registry_path)
+        shutil.copytree(source.agents_directory, agents_dir)
+
+        # Give one agent a declared scope for the edited spec to overlap with
+        analyst_path = os.path.join(agents_dir, "enhanced-financial-analyst.json")
+        with open(analyst_path) as f:
+            analyst = json.load(f)
+        analyst["scope_boundaries"] = {"covers": "cash flow, retainer pricing"}
+        with open(analyst_path, "w") as f:
+            json.dump(analyst, f)
+
+        orchestrator = MetaOrchestrator(registry=compile_agent_registry(registry_path, agents_dir))
+        before = orchestrator.registry
+        before_engine = orchestrator.intelligence_engine
+        # A consultation pinned before the reload, like one still running when it happens
+        pinned = contextvars.copy_context()
+        pinned.run(_pinned_registry.set, orchestrator._pin())
+        print(f"No-op refresh changes: {orchestrator.refresh_agent_registry().has_changes}")
+
+        # Edit a single spec
+        spec_path = os.path.join(agents_dir, "enhanced-pricing-strategist.json")
+        with open(spec_path) as f:
+            spec = json.load(f)
+        spec["usage_triggers"].append("Subscription retainer pricing")
+        spec["scope_boundaries"] = {"covers": "value pricing, retainer pricing"}
+        with open(spec_path, "w") as f:
+            json.dump(spec, f)
+        stat = os.stat(spec_path)
+        os.utime(spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        changes = orchestrator.refresh_agent_registry()
+        after = orchestrator.registry
+        print(f"Modified files: {[os.path.basename(path) for path in changes.modified]}")
+        assert len(changes.modified) == 1 and not changes.added and not changes.removed
+
+        # Only the edited spec was replaced; the previous snapshot is untouched
+        unchanged = [name for name in after.agent_specs if after.agent_specs[name] is before.agent_specs[name]]
+        print(f"Spec objects carried over unchanged: {len(unchanged)} of {len(after.agent_specs)}")
+        assert "Subscription retainer pricing" not in before.indexes.expertise_areas
+        assert after.indexes.expertise_areas["Subscription retainer pricing"] == ["enhanced-pricing-strategist"]
+
+        # Patched indexes match a full rebuild, down to key and list order, and the engine sees them
+        rebuilt = compile_agent_registry(registry_path, agents_dir).indexes
+        assert ordered_indexes(after.indexes) == ordered_indexes(rebuilt)
+        for field_name in ("expertise_areas", "methodology_families", "relevance_matrices", "scope_coverage"):
+            patched_index = getattr(after.indexes, field_name)
+            rebuilt_index = getattr(rebuilt, field_name)
+            assert {k: sorted(v) for k, v in patched_index.items()} == {k: sorted(v) for k, v in rebuilt_index.items()}
+        def overlap_pairs(indexes):
+            return {(frozenset((agent1, agent2)), tuple(areas)) for agent1, agent2, areas in indexes.scope_overlaps}
+        print(f"Patched scope overlaps: {after.indexes.scope_overlaps}, rebuilt: {rebuilt.scope_overlaps}")
+        assert overlap_pairs(after.indexes) == overlap_pairs(rebuilt)
+        assert after.indexes.scope_bits.shared_areas("enhanced-pricing-strategist",
+                                                     "enhanced-financial-analyst") == ["retainer pricing"]
+        assert (dict(after.indexes.expertise_bits.shared_area_masks()).keys()
+                == dict(rebuilt.expertise_bits.shared_area_masks()).keys())
+        assert not before.indexes.scope_overlaps
+        engine = orchestrator.intelligence_engine
+        assert engine.overlap_detector.expertise_areas is after.indexes.expertise_areas
+
+        # Context-free overlaps were rebuilt with the registry and are served without recomputation
+        scope_overlaps = [o for o in asyncio.run(engine.analyze_agent_overlap({})) if o.overlap_type == "scope_boundary"]
+        print(f"Scope overlaps after reload: {[(o.agents, o.overlap_areas) for o in scope_overlaps]}")
+        assert [o.overlap_areas for o in scope_overlaps] == [["retainer pricing"]]
+        assert scope_overlaps[0] is engine.overlap_detector.scope_overlaps[0]
+        assert engine.context_optimizer.relevance_matrices is after.indexes.relevance_matrices
+        assert orchestrator.agent_specs["pricing-strategist"]["usage_triggers"][-1] == "Subscription retainer pricing"
+
+        # The pinned consultation keeps the engine built for its snapshot, untouched by the reload
+        assert engine is not before_engine
+        assert pinned.run(lambda: orchestrator.intelligence_engine) is before_engine
+        assert pinned.run(lambda: orchestrator.agent_specs) is before.agent_specs
+        assert before_engine.registry is before and before_engine.conflict_analyzer.agent_specs is before.registered_specs
+        assert before_engine.quality_assessor.agent_specs is before.registered_specs
+
+        # Reordering the registry alone re-orders the indexes, flipping the overlap pair's orientation
+        with open(registry_path) as f:
+            registry = json.load(f)
+        for category_data in registry["agent_categories"].values():
+            if "enhanced-financial-analyst" in category_data["agents"]:
+                category_data["agents"].remove("enhanced-financial-analyst")
+        registry["agent_categories"]["business_strategy_sales"]["agents"].insert(0, "enhanced-financial-analyst")
+        with open(registry_path, "w") as f:
+            json.dump(registry, f)
+        stat = os.stat(registry_path)
+        os.utime(registry_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        changes = orchestrator.refresh_agent_registry()
+        assert changes.registry_changed and not changes.modified
+        reordered = orchestrator.registry.indexes
+        print(f"Reordered scope overlaps: {reordered.scope_overlaps}")
+        assert reordered.scope_overlaps[0][:2] == ("enhanced-financial-analyst", "enhanced-pricing-strategist")
+        assert ordered_indexes(reordered) == ordered_indexes(compile_agent_registry(registry_path, agents_dir).indexes)
+        print("Patched indexes match a full rebuild")
+
+def ordered_indexes(indexes):
+    """Indexes as nested lists, so comparisons also check dict key order"""
+    def items(value):
+        if isinstance(value, dict):
+            return [(key, items(entry)) for key, entry in value.items()]
+        if isinstance(value, (list, tuple)):
+            return [items(entry) for entry in value]
+        return value
+    return {field_name: items(getattr(indexes, field_name)) for field_name in
+            ("expertise_areas", "methodology_families", "conflict_patterns", "relevance_matrices",
+             "scope_coverage", "scope_overlaps")} | {
+        "scope_bits": (indexes.scope_bits.agents, indexes.scope_bits.areas, indexes.scope_bits.agent_masks),
+        "expertise_bits": (indexes.expertise_bits.agents, indexes.expertise_bits.areas,
+                           indexes.expertise_bits.agent_masks)
+    }
+
+def test_agent_bitsets():
+    """Test that bitset overlap queries agree with set intersection"""
+    print("\n=== AGENT BITSET TEST ===")
+
+    coverage = {
+        "agent-a": ["pricing", "positioning"],
+        "agent-b": ["positioning", "branding", "pricing"],
+        "agent-c": ["analytics"],
+        "agent-d": ["branding", "analytics"]
+    }
+    bits = AgentBitIndex.build(coverage)
+    expected = [(a, b, sorted(set(coverage[a]) & set(coverage[b])))
+                for i, a in enumerate(coverage) for b in list(coverage)[i+1:]
+                if set(coverage[a]) & set(coverage[b])]
+    print(f"Overlap pairs: {bits.overlap_pairs()}")
+    assert bits.overlap_pairs() == expected
+    assert bits.overlap_pairs(among={"agent-c"}) == [pair for pair in expected if "agent-c" in pair[:2]]
+    assert bits.agents_of(bits.overlapping_mask("agent-b")) == ["agent-a", "agent-d"]
+    assert bits.shared_areas("agent-a", "agent-c") == []
+    assert [area for area, _ in bits.shared_area_masks()] == ["pricing", "positioning", "branding", "analytics"]
+
+    # The registry's expertise bitsets mirror its trigger -> agents graph
+    snapshot = get_agent_registry()
+    expertise_bits = snapshot.indexes.expertise_bits
+    for trigger, agents in snapshot.indexes.expertise_areas.items():
+        assert expertise_bits.agents_of(expertise_bits.area_members[expertise_bits.area_bits[trigger]]) == agents
+
+    # The overlap detector answers per-agent queries from both bitsets
+    specs = {
+        "agent-a": {"usage_triggers": ["Pricing review"], "scope_boundaries": {"covers": "pricing"}},
+        "agent-b": {"usage_triggers": ["Pricing review", "Brand audit"]},
+        "agent-c": {"usage_triggers": ["Analytics"], "scope_boundaries": {"covers": "pricing, analytics"}},
+        "agent-d": {"usage_triggers": ["Hiring"]}
+    }
+    detector = OverlapDetector(specs)
+    print(f"Agents overlapping agent-a: {detector.overlapping_agents('agent-a')}")
+    assert detector.overlapping_agents("agent-a") == ["agent-b", "agent-c"]
+    assert detector.overlapping_agents("agent-d") == []
+    assert [area for area, _, _ in detector.shared_expertise_areas] == ["Pricing review"]
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    test_shared_snapshot()
+    test_orchestrator_construction_cost()
+    test_lazy_cold_sections()
+    test_routing_index()
+    test_incremental_reload()
+    test_agent_bitsets()
+
+    print("\n✅ AGENT REGISTRY TESTS COMPLETED")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Consultation Cache Test Suite
+Tests routing decision caching, fingerprinting, invalidation, batch routing
+and the two-tier agent response cache
+"""
+
+import os
+import json
+import time
+import pickle
+import asyncio
+import tempfile
+from consultation_cache import TTLCache, ResponseCache, request_fingerprint, consultation_key
+from agent_registry import compile_agent_registry
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest
+from batch_routing import route_jsonl
+
+def test_request_fingerprint():
+    """Test that equivalent requests share a fingerprint"""
+    print("\n=== REQUEST FINGERPRINT TEST ===")
+
+    base = request_fingerprint("Help me price my design services",
+                               {"business_type": "design agency", "current_pricing": "hourly rates"})
+    reordered = request_fingerprint("  help me price my design services",
+                                    {"current_pricing": "hourly rates", "business_type": "design agency"})
+    different = request_fingerprint("Help me price my design services", {"business_type": "law firm"})
+    scoped = request_fingerprint("Help me price my design services",
+                                 {"business_type": "design agency", "current_pricing": "hourly rates"}, "v2")
+
+    assert base == reordered
+    assert base != different and base != scoped
+    print(f"Fingerprint: {base}")
+
+def test_ttl_cache():
+    """Test LRU eviction, TTL expiry and hit-rate accounting"""
+    print("\n=== TTL CACHE TEST ===")
+
+    cache = TTLCache(max_entries=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1       # "a" becomes most recent
+    cache.put("c", 3)                # evicts "b"
+    assert cache.get("b") is None
+    time.sleep(0.06)
+    assert cache.get("a") is None    # expired
+
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["evictions"] == 1 and stats["expirations"] == 1
+
+def test_analysis_cache():
+    """Test that repeated requests reuse the routing decision until the registry changes"""
+    print("\n=== ANALYSIS CACHE TEST ===")
+
+    snapshot = compile_agent_registry()
+    orchestrator = MetaOrchestrator(registry=snapshot)
+    uncached = MetaOrchestrator(registry=snapshot, analysis_cache_size=0)
+    request = ConsultationRequest(
+        objective="Launch a complete brand identity and website for a tech startup",
+        context={"business_type": "B2B SaaS startup", "target_audience": "enterprise clients"}
+    )
+
+    first = orchestrator.analyze_consultation_request(request)
+    second = orchestrator.analyze_consultation_request(request)
+    assert first == second == uncached.analyze_consultation_request(request)
+
+    # Callers get their own containers
+    second["agent_candidates"].clear()
+    assert orchestrator.analyze_consultation_request(request)["agent_candidates"]
+
+    iterations = 500
+    start = time.perf_counter()
+    for _ in range(iterations):
+        uncached.analyze_consultation_request(request)
+    uncached_time = (time.perf_counter() - start) / iterations
+    start = time.perf_counter()
+    for _ in range(iterations):
+        orchestrator.analyze_consultation_request(request)
+    cached_time = (time.perf_counter() - start) / iterations
+    print(f"Analysis: {uncached_time * 1e6:.1f} us uncached, {cached_time * 1e6:.1f} us cached")
+
+    # Swapping in a new snapshot invalidates cached decisions
+    orchestrator._swap_registry(compile_agent_registry())
+    orchestrator.analyze_consultation_request(request)
+    stats = orchestrator.analysis_cache_stats()
+    print(f"Stats: {stats}")
+    assert stats["invalidations"] == 1 and stats["size"] == 1
+    assert stats["hit_rate"] > 0.9
+
+def test_batch_routing():
+    """Test that streamed batch routing matches per-request analysis"""
+    print("\n=== BATCH ROUTING TEST ===")
+
+    snapshot = compile_agent_registry()
+    records = [
+        {"request_id": f"req-{i}", "objective": objective, "context": {"business_type": business}}
+        for i, (objective, business) in enumerate(
+            [("Help me price my design services", "design agency"),
+             ("Improve WCAG compliance for our site", "e-commerce store"),
+             ("Build a referral partnership program", "consultancy")] * 200)
+    ]
+    records.append({"request_id": "work-order", "title": "Refresh brand identity", "body": "New logo and guidelines"})
+
+    requests = [ConsultationRequest.from_dict(record) for record in records]
+    expected = [MetaOrchestrator(registry=snapshot, analysis_cache_size=0).analyze_consultation_request(request)
+                for request in requests[:4]]
+    batched = list(MetaOrchestrator(registry=snapshot, analysis_cache_size=0).analyze_many(iter(requests), chunk_size=64))
+    assert len(batched) == len(requests)
+    assert batched[:3] == expected[:3] and batched[3] == expected[0]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        input_path = os.path.join(workdir, "requests.jsonl")
+        output_path = os.path.join(workdir, "decisions.jsonl")
+        with open(input_path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.write("not json\n")
+            # Wrongly typed records are skipped like malformed JSON instead of aborting the stream
+            for malformed in ({"objective": 5}, {"objective": None}, {"objective": "  "},
+                              {"objective": "Price my services", "context": "design agency"},
+                              {"title": ["Refresh"]}, ["Refresh brand identity"]):
+                f.write(json.dumps(malformed) + "\n")
+            f.write(json.dumps({"request_id": "after-malformed", "objective": "Refresh our brand identity"}) + "\n")
+
+        stats = route_jsonl(input_path, output_path, MetaOrchestrator(registry=snapshot), chunk_size=64)
+        with open(output_path) as f:
+            decisions = [json.loads(line) for line in f]
+
+    print(f"Routed {stats['routed']} requests, skipped {stats['skipped']}, "
+          f"{stats['requests_per_second']:.0f} requests/s")
+    assert stats["routed"] == len(records) + 1 and stats["skipped"] == 7
+    assert len(decisions) == stats["routed"]
+    assert decisions[0]["request_id"] == "req-0"
+    assert decisions[0]["agent_candidates"] == expected[0]["agent_candidates"]
+    assert [decision["request_id"] for decision in decisions[-2:]] == ["work-order", "after-malformed"]
+
+def test_response_cache():
+    """Test memory and disk tiers, size-based eviction, per-agent TTLs and orchestrator integration"""
+    print("\n=== RESPONSE CACHE TEST ===")
+
+    request = ConsultationRequest(objective="Refresh our brand identity", context={"business_type": "design agency"})
+    reordered = ConsultationRequest(objective="refresh our brand identity ", context={"business_type": "design agency"})
+    assert consultation_key("brand-strategist", request) == consultation_key("brand-strategist", reordered)
+    assert consultation_key("brand-strategist", request) != consultation_key("copywriter", request)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk_path = os.path.join(tmp, "responses.sqlite3")
+
+        # Memory tier is bounded by bytes, not entries
+        cache = ResponseCache(max_bytes=2048, disk_path=disk_path)
+        for i in range(10):
+            cache.put("agent", f"key-{i}", {"payload": "x" * 400, "i": i})
+        stats = cache.stats()
+        print(f"After 10 puts: {stats}")
+        assert stats["bytes"] <= 2048 and stats["evictions"] > 0 and stats["disk_size"] == 10
+
+        # Evicted entries come back from disk and are promoted
+        assert cache.get("agent", "key-0")["i"] == 0
+        assert cache.get("agent", "key-0")["i"] == 0
+        assert cache.stats()["disk_hits"] == 1 and cache.stats()["memory_hits"] == 1
+
+        # Hits are copies
+        cache.get("agent", "key-9")["i"] = -1
+        assert cache.get("agent", "key-9")["i"] == 9
+        cache.close()
+
+        # Disk tier survives a restart; per-agent TTLs expire entries in both tiers
+        restarted = ResponseCache(disk_path=disk_path, agent_ttls={"volatile": 0.01})
+        assert restarted.get("agent", "key-5")["i"] == 5
+        restarted.put("volatile", "short-lived", {"i": 0})
+        time.sleep(0.02)
+        assert restarted.get("volatile", "short-lived") is None
+        assert restarted.stats()["expirations"] == 1
+        restarted.close()
+
+        # The disk tier is pruned by age and entry count, expired or not
+        bounded = ResponseCache(disk_path=disk_path, disk_max_entries=4, disk_max_age=3600.0)
+        print(f"Pruned on open: {bounded.stats()}")
+        assert bounded.stats()["disk_size"] == 4
+        assert bounded.get("agent", "key-9")["i"] == 9 and bounded.get("agent", "key-0") is None
+        bounded._write_disk("agent", "ancient", time.time() - 7200, pickle.dumps({"i": -1}))
+        assert bounded.prune_disk() == 1 and bounded.get_stale("ancient") is None
+        assert bounded.stats()["disk_pruned"] == 8  # 11 rows cut to 4 on open, then the ancient one
+        bounded.close()
+
+        # Async access reads and writes the disk tier off the event loop
+        async def async_roundtrip():
+            cache = ResponseCache(max_bytes=1, disk_path=disk_path)  # Nothing fits in memory
+            await cache.put_async("agent", "async-key", {"i": 42})
+            hit = await cache.get_async("agent", "async-key")
+            stale = await cache.get_stale_async("async-key")
+            missing = await cache.get_async("agent", "absent")
+            stats = cache.stats()
+            cache.close()
+            return hit, stale, missing, stats
+        hit, stale, missing, stats = asyncio.run(async_roundtrip())
+        assert hit == stale == {"i": 42} and missing is None
+        assert stats["disk_hits"] == 1 and stats["misses"] == 1
+
+        # Orchestrator consults each agent once per distinct request
+        orchestrator = MetaOrchestrator(response_cache=ResponseCache(disk_path=disk_path))
+        first = asyncio.run(orchestrator.execute_consultation(request))
+        start = time.perf_counter()
+        second = asyncio.run(orchestrator.execute_consultation(reordered))
+        cached_seconds = time.perf_counter() - start
+        stats = orchestrator.response_cache_stats()
+        print(f"Cached consultation {cached_seconds:.3f}s, stats {stats}")
+        assert first["status"] == second["status"] == "success"
+        assert stats["memory_hits"] == stats["stores"] > 0
+        assert cached_seconds < 0.1  # No simulated agent latency
+        orchestrator.response_cache.close()
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    test_request_fingerprint()
+    test_ttl_cache()
+    test_analysis_cache()
+    test_batch_routing()
+    test_response_cache()
+
+    print("\n✅ CONSULTATION CACHE TESTS COMPLETED")
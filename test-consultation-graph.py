@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Consultation Graph Test Suite
+Tests prerequisite DAG construction, dependency-graph execution,
+speculative hierarchical execution and quorum consensus
+"""
+
+import time
+import asyncio
+from consultation_graph import build_dependency_graph, topological_order, critical_path
+from consultation_speculation import SpeculationPolicy
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest, OrchestrationPattern, ConsultationRun, _active_run
+from consultation_protocol import AgentResponse
+from agent_backends import SimulatedBackend, simulated_agent_response
+
+class VotingBackend(SimulatedBackend):
+    """Simulation in which each agent answers with a fixed position after its own latency"""
+
+    def __init__(self, votes):
+        super().__init__()
+        self.votes = votes  # agent -> (latency, recommendation[, status])
+
+    async def consult(self, agent_name, agent_spec, request):
+        latency, recommendation, *status = self.votes[agent_name]
+        await asyncio.sleep(latency)
+        if status and status[0] != "success":
+            return AgentResponse(status=status[0], metadata={"agent_name": agent_name})
+        response = simulated_agent_response(agent_name, agent_spec, request)
+        response.result["primary_recommendation"] = recommendation
+        return response
+
+def _spec(prerequisites=(), next_steps=()):
+    return {"orchestration_integration": {"sequential_workflow": {
+        "prerequisites": list(prerequisites), "next_steps": list(next_steps)}}}
+
+def test_dependency_graph():
+    """Test edges from prerequisites and next_steps, restricted to selected agents"""
+    print("\n=== DEPENDENCY GRAPH TEST ===")
+
+    specs = {
+        "strategist": _spec(next_steps=["designer", "writer"]),
+        "designer": _spec(prerequisites=["strategist", "researcher"]),
+        "writer": _spec(prerequisites=["designer"]),
+        "analyst": _spec()
+    }
+    agents = ["designer", "writer", "strategist", "analyst"]
+    graph = build_dependency_graph(agents, specs)
+    order = topological_order(graph, agents)
+    path = critical_path(graph, order)
+
+    print(f"Graph: {graph}")
+    print(f"Order: {order}, critical path: {path}")
+    assert graph == {"designer": ["strategist"], "writer": ["designer", "strategist"], "strategist": [], "analyst": []}
+    assert order == ["strategist", "designer", "writer", "analyst"]
+    assert path == ["strategist", "designer", "writer"]
+
+    # Declared cycles are broken rather than deadlocking
+    cyclic = {"a": _spec(prerequisites=["b"]), "b": _spec(prerequisites=["a"])}
+    graph = build_dependency_graph(["a", "b"], cyclic)
+    assert topological_order(graph, ["a", "b"]) == ["a", "b"]
+
+def test_dag_execution():
+    """Test that independent branches overlap and latency follows the critical path"""
+    print("\n=== DAG EXECUTION TEST ===")
+
+    request = ConsultationRequest(
+        objective="Launch a complete brand identity and website for a tech startup",
+        context={"business_type": "B2B SaaS startup"}
+    )
+    timings = {}
+    for dependency_graph_execution in (False, True):
+        orchestrator = MetaOrchestrator(dependency_graph_execution=dependency_graph_execution)
+        start = time.perf_counter()
+        result = asyncio.run(orchestrator.execute_consultation(request))
+        timings[result["orchestration_pattern"]] = time.perf_counter() - start
+        assert result["status"] == "success"
+
+    analysis = MetaOrchestrator(dependency_graph_execution=True).analyze_consultation_request(request)
+    strategy = analysis["decomposition_strategy"]
+    print(f"Nodes: {strategy['nodes']}")
+    print(f"Sequential {timings['sequential']:.2f}s, DAG {timings['dag']:.2f}s "
+          f"(critical path {len(strategy['critical_path'])} of {len(strategy['nodes'])} steps)")
+    assert analysis["orchestration_pattern"] == OrchestrationPattern.DAG
+    if len(strategy["critical_path"]) < len(strategy["nodes"]):
+        assert timings["dag"] < timings["sequential"]
+
+def test_sequential_default():
+    """Test that existing sequential callers keep the sequential pipeline unless the DAG mode is enabled"""
+    print("\n=== SEQUENTIAL DEFAULT TEST ===")
+
+    request = ConsultationRequest(
+        objective="Launch a complete brand identity and website for a tech startup",
+        context={"business_type": "B2B SaaS startup"}
+    )
+    orchestrator = MetaOrchestrator()
+    analysis = orchestrator.analyze_consultation_request(request)
+    assert analysis["orchestration_pattern"] == OrchestrationPattern.SEQUENTIAL
+    steps = analysis["decomposition_strategy"]["steps"]
+    assert analysis["decomposition_strategy"]["type"] == "vertical"
+    assert [step["depends_on"] for step in steps] == [None] + [step["agent"] for step in steps[:-1]]
+
+    # Every step still receives the output of the steps before it
+    result = asyncio.run(orchestrator._execute_pattern(request, analysis))
+    print(f"Pattern {result['pattern']}, agents {[r['agent'] for r in result['results']]}")
+    assert result["pattern"] == "sequential" and set(result) == {"pattern", "results", "final_context"}
+    assert [r["agent"] for r in result["results"]] == [step["agent"] for step in steps]
+    assert "primary_recommendation" in result["final_context"]
+
+    final = asyncio.run(orchestrator.execute_consultation(request))
+    assert final["orchestration_pattern"] == "sequential" and final["status"] == "success"
+
+def test_speculative_hierarchy():
+    """Test that speculative workers overlap the supervisor and are re-run only when rejected"""
+    print("\n=== SPECULATIVE HIERARCHY TEST ===")
+
+    request = ConsultationRequest(objective="Refresh our brand identity", context={"business_type": "design agency"})
+    analysis = {"decomposition_strategy": {"supervisor": "brand-strategist",
+                                           "workers": ["brand-designer", "copywriter"]}}
+
+    outcomes = {}
+    for name, policy in [("waiting", None),
+                         ("lenient", SpeculationPolicy(similarity_threshold=0.3)),
+                         ("strict", SpeculationPolicy(similarity_threshold=0.95))]:
+        orchestrator = MetaOrchestrator(speculation_policy=policy)
+        start = time.perf_counter()
+        result = asyncio.run(orchestrator._execute_hierarchical(request, analysis))
+        outcomes[name] = (time.perf_counter() - start, result)
+        print(f"{name}: {outcomes[name][0]:.2f}s, speculation {result.get('speculation')}")
+        assert [w["agent"] for w in result["worker_results"]] == ["brand-designer", "copywriter"]
+
+    lenient, strict = outcomes["lenient"][1], outcomes["strict"][1]
+    assert set(lenient["speculation"].values()) == {"accepted"}
+    assert set(strict["speculation"].values()) == {"rerun"}
+    assert outcomes["lenient"][0] < outcomes["waiting"][0]
+
+    # Rejected speculative results are neither recorded nor streamed; only their re-runs are
+    async def recorded(policy):
+        run = ConsultationRun(events=asyncio.Queue())
+        _active_run.set(run)
+        await MetaOrchestrator(speculation_policy=policy)._execute_hierarchical(request, analysis)
+        streamed = [run.events.get_nowait().agent for _ in range(run.events.qsize())]
+        return [entry["agent"] for entry in run.completed], streamed
+
+    for policy in (SpeculationPolicy(similarity_threshold=0.3), SpeculationPolicy(similarity_threshold=0.95)):
+        completed, streamed = asyncio.run(recorded(policy))
+        print(f"threshold {policy.similarity_threshold}: recorded {completed}")
+        assert sorted(completed) == ["brand-designer", "brand-strategist", "copywriter"]
+        assert completed == streamed
+
+def test_quorum_consensus():
+    """Test that consensus returns at the quorum or once agreement is impossible, cancelling stragglers"""
+    print("\n=== QUORUM CONSENSUS TEST ===")
+
+    request = ConsultationRequest(objective="Choose a positioning strategy", context={"business_type": "design agency"})
+    analysis = {"decomposition_strategy": {"agents": ["a", "b", "c", "d"]}}
+    # (quorum, agent -> (latency, recommendation)); d is always too slow to wait for
+    scenarios = {
+        "agreed": (2, {"a": (0.05, "Premium"), "b": (0.1, "premium"), "c": (0.15, "Value"), "d": (5, "Premium")}),
+        "disagreement": (3, {"a": (0.05, "Premium"), "b": (0.1, "Value"), "c": (0.15, "Niche"), "d": (5, "Premium")})
+    }
+
+    results = {}
+    for expected, (quorum, votes) in scenarios.items():
+        orchestrator = MetaOrchestrator(backend=VotingBackend(votes), consensus_quorum=quorum)
+        start = time.perf_counter()
+        result = results[expected] = asyncio.run(orchestrator._execute_consensus(request, analysis))
+        elapsed = time.perf_counter() - start
+        print(f"{expected}: {elapsed:.2f}s, quorum {result['quorum']}, resolution {result['resolution']}")
+        assert result["quorum"]["outcome"] == expected
+        assert elapsed < 1.0  # Never waits for the slow agent
+        assert "d" in result["quorum"]["cancelled_agents"]
+        assert orchestrator.scheduler.metrics()["in_flight"] == 0
+
+    # Agreement is matched case-insensitively, like conflict detection, and stops before c answers
+    agreed = results["agreed"]
+    assert agreed["quorum"]["agreed_agents"] == ["a", "b"]
+    assert set(agreed["quorum"]["cancelled_agents"]) == {"c", "d"}
+    assert agreed["resolution"] == "consensus_reached"
+    assert [r["agent"] for r in agreed["results"]] == ["a", "b"]
+
+    # Three distinct positions with one agent left cannot reach a quorum of 3
+    disagreement = results["disagreement"]
+    assert disagreement["resolution"] == "user_choice"
+    assert [r["agent"] for r in disagreement["results"]] == ["a", "b", "c"]
+
+def test_quorum_ignores_unusable_responses():
+    """Test that failed and degraded responses never vote, only shrinking the agents still pending"""
+    print("\n=== QUORUM UNUSABLE RESPONSES TEST ===")
+
+    request = ConsultationRequest(objective="Choose a positioning strategy", context={"business_type": "design agency"})
+    analysis = {"decomposition_strategy": {"agents": ["a", "b", "c", "d"]}}
+
+    # Two agents fail fast; the quorum must come from the healthy agents that answer later
+    votes = {"a": (0.05, "", "failed"), "b": (0.05, "", "degraded"), "c": (0.15, "Premium"), "d": (0.2, "premium")}
+    orchestrator = MetaOrchestrator(backend=VotingBackend(votes), consensus_quorum=2)
+    result = asyncio.run(orchestrator._execute_consensus(request, analysis))
+    print(f"quorum {result['quorum']}, resolution {result['resolution']}")
+    assert result["quorum"]["outcome"] == "agreed"
+    assert result["quorum"]["agreed_agents"] == ["c", "d"]
+    assert result["quorum"]["cancelled_agents"] == []
+    assert [r["agent"] for r in result["results"]] == ["c", "d"]
+
+    # With a quorum of 3, two unusable answers leave too few voters to agree
+    votes = {"a": (0.05, "", "failed"), "b": (0.05, "", "degraded"), "c": (5, "Premium")}
+    orchestrator = MetaOrchestrator(backend=VotingBackend(votes), consensus_quorum=3)
+    result = asyncio.run(orchestrator._execute_consensus(
+        request, {"decomposition_strategy": {"agents": ["a", "b", "c"]}}))
+    assert result["quorum"]["outcome"] == "disagreement"
+    assert result["quorum"]["cancelled_agents"] == ["c"]
+    assert result["results"] == []
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    test_dependency_graph()
+    test_dag_execution()
+    test_sequential_default()
+    test_speculative_hierarchy()
+    test_quorum_consensus()
+    test_quorum_ignores_unusable_responses()
+
+    print("\n✅ CONSULTATION GRAPH TESTS COMPLETED")
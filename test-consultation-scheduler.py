@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Consultation Scheduler Test Suite
+Tests bounded and adaptive concurrency, circuit breaking, priority and fair
+queueing, single-flight coalescing, batch execution, streaming and deadlines
+of agent consultations
+"""
+
+import time
+import asyncio
+from consultation_scheduler import (ConsultationScheduler, SingleFlight, CircuitBreakerPolicy, CircuitOpenError,
+                                    deadline_scope, priority_scope, time_remaining)
+from consultation_cache import ResponseCache
+from consultation_protocol import AgentResponse
+from agent_backends import SimulatedBackend
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest
+
+class StalledAgentBackend(SimulatedBackend):
+    """Simulation in which one agent never answers in time"""
+
+    def __init__(self, stalled_agent: str):
+        super().__init__()
+        self.stalled_agent = stalled_agent
+
+    async def consult(self, agent_name, agent_spec, request):
+        if agent_name == self.stalled_agent:
+            await asyncio.sleep(30)
+        return await super().consult(agent_name, agent_spec, request)
+
+class CountingBackend(SimulatedBackend):
+    """Simulation that counts how often each agent is actually consulted"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = {}
+
+    async def consult(self, agent_name, agent_spec, request):
+        self.calls[agent_name] = self.calls.get(agent_name, 0) + 1
+        return await super().consult(agent_name, agent_spec, request)
+
+def test_concurrency_limits():
+    """Test that global and per-agent caps hold under a burst of calls"""
+    print("\n=== CONCURRENCY LIMITS TEST ===")
+
+    scheduler = ConsultationScheduler(max_concurrency=3, per_agent_concurrency=2)
+    running = {"total": 0, "peak": 0, "brand-designer": 0, "brand-designer-peak": 0}
+
+    async def call(agent_name):
+        running["total"] += 1
+        running[agent_name] = running.get(agent_name, 0) + 1
+        running["peak"] = max(running["peak"], running["total"])
+        if agent_name == "brand-designer":
+            running["brand-designer-peak"] = max(running["brand-designer-peak"], running[agent_name])
+        await asyncio.sleep(0.01)
+        running["total"] -= 1
+        running[agent_name] -= 1
+        return agent_name
+
+    async def burst():
+        agents = ["brand-designer"] * 6 + ["copywriter", "seo-specialist", "pricing-strategist"] * 2
+        return await asyncio.gather(*(scheduler.run(agent, lambda a=agent: call(a)) for agent in agents))
+
+    results = asyncio.run(burst())
+    metrics = scheduler.metrics()
+    print(f"Peak in flight: {metrics['peak_in_flight']}, peak queued: {metrics['peak_queued']}")
+    print(f"brand-designer: {metrics['agents']['brand-designer']}")
+    assert len(results) == 12
+    assert running["peak"] == metrics["peak_in_flight"] == 3
+    assert running["brand-designer-peak"] <= 2
+    assert metrics["queued"] == 0 and metrics["in_flight"] == 0
+    assert metrics["agents"]["brand-designer"]["completed"] == 6
+
+    # The scheduler survives a fresh event loop
+    asyncio.run(burst())
+    assert scheduler.metrics()["agents"]["brand-designer"]["completed"] == 12
+
+def test_concurrent_consultations():
+    """Test many consultations on one event loop sharing the orchestrator's limits"""
+    print("\n=== CONCURRENT CONSULTATIONS TEST ===")
+
+    orchestrator = MetaOrchestrator(scheduler=ConsultationScheduler(max_concurrency=8, per_agent_concurrency=2))
+    requests = [
+        ConsultationRequest(
+            objective="Website conversion optimization with comprehensive analysis",
+            context={"business_type": f"client {i}", "current_conversion_rate": "2.1%"}
+        )
+        for i in range(10)
+    ]
+
+    async def run_all():
+        return await asyncio.gather(*(orchestrator.execute_consultation(r) for r in requests))
+
+    start = time.perf_counter()
+    results = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start
+
+    metrics = orchestrator.scheduler.metrics()
+    print(f"{len(results)} consultations in {elapsed:.2f}s; peak in flight {metrics['peak_in_flight']}, "
+          f"peak queued {metrics['peak_queued']}")
+    assert all(result["status"] == "success" for result in results)
+    assert metrics["peak_in_flight"] <= 8
+    assert all(agent["failed"] == 0 for agent in metrics["agents"].values())
+
+class SickAgentBackend(SimulatedBackend):
+    """Simulation in which chosen agents fail until they recover"""
+
+    def __init__(self):
+        super().__init__(latency=0.01)
+        self.sick = set()
+        self.calls = {}
+
+    async def consult(self, agent_name, agent_spec, request):
+        self.calls[agent_name] = self.calls.get(agent_name, 0) + 1
+        if agent_name in self.sick:
+            raise ConnectionError(f"{agent_name} is down")
+        return await super().consult(agent_name, agent_spec, request)
+
+def test_adaptive_limits():
+    """Test that an agent's limit halves when it slows down and grows back once it recovers"""
+    print("\n=== ADAPTIVE LIMITS TEST ===")
+
+    scheduler = ConsultationScheduler(max_concurrency=64, per_agent_concurrency=8, circuit_breaker=None)
+
+    def limit(agent_name):
+        return scheduler.metrics()["agents"][agent_name]["limit"]
+
+    async def phase(latency, calls=24):
+        lowest = [limit("pricing-strategist")] if "pricing-strategist" in scheduler.metrics()["agents"] else [8]
+
+        async def call():
+            await asyncio.sleep(latency)
+            lowest.append(limit("pricing-strategist"))
+        await asyncio.gather(*(scheduler.run("pricing-strategist", call) for _ in range(calls)))
+        return min(lowest), limit("pricing-strategist")
+
+    async def fast_neighbour():
+        async def call():
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*(scheduler.run("copywriter", call) for _ in range(24)))
+
+    async def scenario():
+        _, healthy = await phase(0.01)
+        slowed, _ = await asyncio.gather(phase(0.1), fast_neighbour())
+        for _ in range(3):
+            _, settled = await phase(0.1)
+        return healthy, slowed[0], settled
+
+    healthy, slowed, settled = asyncio.run(scenario())
+    print(f"Limit healthy {healthy}, lowest during slowdown {slowed}, after settling at the new latency {settled}")
+    assert healthy == 8
+    assert slowed <= healthy // 2
+    assert settled > slowed
+    assert limit("copywriter") == 8  # Only the slow agent is throttled
+
+def test_circuit_breaker():
+    """Test that a failing agent is short-circuited to cached or degraded responses and retried after cooldown"""
+    print("\n=== CIRCUIT BREAKER TEST ===")
+
+    backend = SickAgentBackend()
+    scheduler = ConsultationScheduler(circuit_breaker=CircuitBreakerPolicy(window=4, min_calls=3, cooldown=0.3))
+    orchestrator = MetaOrchestrator(backend=backend, scheduler=scheduler, response_cache=ResponseCache(ttl=0.0))
+    request = ConsultationRequest(objective="Price our new design retainer", context={"business_type": "design agency"})
+
+    async def consult_many(agent_name, count):
+        return [await orchestrator._scheduled_consult(agent_name, request) for _ in range(count)]
+
+    # A healthy answer is cached (and immediately expired), then the agent goes down
+    first = asyncio.run(consult_many("pricing-strategist", 1))[0]
+    assert first.status == "success"
+    backend.sick.add("pricing-strategist")
+
+    # Failures are raised until the breaker has seen enough of them
+    failures = 0
+    while scheduler.metrics()["agents"]["pricing-strategist"]["circuit"] == "closed":
+        try:
+            asyncio.run(orchestrator._scheduled_consult("pricing-strategist", request))
+        except ConnectionError:
+            failures += 1
+    calls_when_opened = backend.calls["pricing-strategist"]
+
+    # Open circuit: no backend calls, last cached answer served as stale
+    start = time.perf_counter()
+    fallbacks = asyncio.run(consult_many("pricing-strategist", 20))
+    elapsed = time.perf_counter() - start
+    metrics = scheduler.metrics()["agents"]["pricing-strategist"]
+    print(f"{failures} failures opened the circuit; 20 short-circuited calls in {elapsed * 1000:.1f} ms; {metrics}")
+    assert failures == 2 and metrics["circuit"] == "open"  # Two of the last three calls failed
+    assert backend.calls["pricing-strategist"] == calls_when_opened
+    assert all(r.status == "partial" and r.metadata["stale"] for r in fallbacks)
+    assert metrics["short_circuited"] == 20
+
+    # Without a cached answer the fallback is a degraded response
+    other = ConsultationRequest(objective="Something never asked before")
+    degraded = asyncio.run(orchestrator._scheduled_consult("pricing-strategist", other))
+    assert degraded.status == "degraded" and "Circuit open" in degraded.errors
+
+    # After the cooldown a trial call goes through and closes the circuit
+    backend.sick.clear()
+    time.sleep(0.35)
+    recovered = asyncio.run(orchestrator._scheduled_consult("pricing-strategist", request))
+    assert recovered.status == "success"
+    assert scheduler.metrics()["agents"]["pricing-strategist"]["circuit"] == "closed"
+
+    # The scheduler alone raises instead of falling back
+    async def refused():
+        broken = ConsultationScheduler(circuit_breaker=CircuitBreakerPolicy(min_calls=1, cooldown=60))
+        async def fail():
+            raise ConnectionError("down")
+        for _ in range(2):
+            try:
+                await broken.run("copywriter", fail)
+            except (ConnectionError, CircuitOpenError) as e:
+                last = e
+        return last
+    assert isinstance(asyncio.run(refused()), CircuitOpenError)
+
+    # Calls admitted before the circuit opened neither free nor settle the half-open trial
+    async def stragglers():
+        scheduler = ConsultationScheduler(circuit_breaker=CircuitBreakerPolicy(min_calls=1, cooldown=0.05))
+        straggler_done, trial_done = asyncio.Event(), asyncio.Event()
+        async def fail():
+            raise ConnectionError("down")
+        async def attempt():
+            try:
+                await scheduler.run("copywriter", trial_done.wait)
+                return "admitted"
+            except CircuitOpenError:
+                return "refused"
+        cancelled = asyncio.create_task(scheduler.run("copywriter", straggler_done.wait))
+        finished = asyncio.create_task(scheduler.run("copywriter", straggler_done.wait))
+        await asyncio.sleep(0)
+        try:
+            await scheduler.run("copywriter", fail)
+        except ConnectionError:
+            pass
+        await asyncio.sleep(0.06)
+        trial = asyncio.create_task(scheduler.run("copywriter", trial_done.wait))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        after_cancel = await asyncio.wait_for(attempt(), 1.0)
+        straggler_done.set()
+        await finished
+        after_straggler = await asyncio.wait_for(attempt(), 1.0)
+        state = scheduler.metrics()["agents"]["copywriter"]["circuit"]
+        trial_done.set()
+        await trial
+        return after_cancel, after_straggler, state, scheduler.metrics()["agents"]["copywriter"]["circuit"]
+    after_cancel, after_straggler, state, closed = asyncio.run(stragglers())
+    print(f"During the trial: {after_cancel} after a cancelled straggler, {after_straggler} after a finished one")
+    assert after_cancel == after_straggler == "refused"
+    assert state == "half_open" and closed == "closed"
+
+def test_fair_queueing():
+    """Test that priority classes go first and tenants share slots fairly by weight"""
+    print("\n=== FAIR QUEUEING TEST ===")
+
+    scheduler = ConsultationScheduler(max_concurrency=1, per_agent_concurrency=64, tenant_weights={"premium": 2.0})
+    order = []
+
+    async def call(label):
+        order.append(label)
+        await asyncio.sleep(0.001)
+
+    async def submit(label, priority=None, tenant=None):
+        with priority_scope(priority, tenant):
+            await scheduler.run(f"agent-{label}", lambda: call(label))
+
+    async def scenario():
+        # A large fan-out is queued first, then a small request from another tenant, then an urgent one
+        tasks = [asyncio.ensure_future(submit(f"big-{i}", tenant="bulk")) for i in range(8)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(submit(f"small-{i}", tenant="small")) for i in range(2)]
+        tasks.append(asyncio.ensure_future(submit("urgent", priority="interactive")))
+        tasks += [asyncio.ensure_future(submit(f"background-{i}", priority="batch")) for i in range(2)]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    print(f"Service order: {order}")
+    assert order.index("urgent") <= 1
+    assert order.index("small-1") < order.index("big-5")  # Interleaved, not queued behind the fan-out
+    assert order[-2:] == ["background-0", "background-1"]
+
+    # Weighted shares: premium gets two slots for every standard one
+    order.clear()
+
+    async def weighted():
+        tasks = [asyncio.ensure_future(submit(f"{tenant}-{i}", tenant=tenant))
+                 for i in range(6) for tenant in ("standard", "premium")]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(weighted())
+    first_six = order[1:7]
+    print(f"Weighted order: {order}")
+    assert sum(label.startswith("premium") for label in first_six) == 4
+
+    metrics = scheduler.metrics()["priority_classes"]
+    print(f"Class waits: {metrics}")
+    assert metrics["interactive"]["admitted"] == 1 and metrics["batch"]["admitted"] == 2
+    assert metrics["batch"]["average_wait_ms"] > metrics["interactive"]["average_wait_ms"]
+
+    # Whole consultations are admitted per class as well
+    orchestrator = MetaOrchestrator(scheduler=ConsultationScheduler(max_consultations=1))
+    request = ConsultationRequest(objective="Price our new design retainer", context={"business_type": "design agency"})
+
+    async def consultations():
+        return await asyncio.gather(orchestrator.execute_consultation(request, priority="batch", tenant="nightly"),
+                                    orchestrator.execute_consultation(request, priority="interactive"))
+
+    results = asyncio.run(consultations())
+    classes = orchestrator.scheduler.metrics()["consultation_classes"]
+    assert all(result["status"] == "success" for result in results)
+    assert classes["interactive"]["admitted"] == 1 and classes["batch"]["admitted"] == 1
+
+def test_same_agent_priority():
+    """Test that priority classes also order calls queued on one busy agent, and their waits are reported"""
+    print("\n=== SAME AGENT PRIORITY TEST ===")
+
+    scheduler = ConsultationScheduler(max_concurrency=16, per_agent_concurrency=1, aimd=None)
+    order = []
+
+    async def call(label):
+        order.append(label)
+        await asyncio.sleep(0.005)
+
+    async def submit(label, priority=None, tenant=None):
+        with priority_scope(priority, tenant):
+            await scheduler.run("pricing-strategist", lambda: call(label))
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(submit(f"batch-{i}", priority="batch")) for i in range(20)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(submit("urgent", priority="interactive")))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    print(f"Service order: {order[:4]}...")
+    assert order.index("urgent") == 1  # Right after the call already running
+
+    # Tenants share one busy agent fairly too
+    order.clear()
+
+    async def tenants():
+        tasks = [asyncio.ensure_future(submit(f"bulk-{i}", tenant="bulk")) for i in range(8)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.ensure_future(submit(f"small-{i}", tenant="small")) for i in range(2)]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(tenants())
+    assert order.index("small-1") < order.index("bulk-5")
+
+    # Class waits include the time spent queued for the agent
+    metrics = scheduler.metrics()["priority_classes"]
+    print(f"Class waits: {metrics}")
+    assert metrics["batch"]["average_wait_ms"] > metrics["interactive"]["average_wait_ms"] > 1.0
+
+def test_single_flight():
+    """Test that concurrent identical consultations share one call per agent"""
+    print("\n=== SINGLE-FLIGHT TEST ===")
+
+    request = ConsultationRequest(objective="Price our new design retainer", context={"business_type": "design agency"})
+
+    async def run_all(orchestrator):
+        return await asyncio.gather(*(orchestrator.execute_consultation(request) for _ in range(50)))
+
+    calls = {}
+    for single_flight in (False, True):
+        backend = CountingBackend()
+        orchestrator = MetaOrchestrator(backend=backend, single_flight=single_flight)
+        results = asyncio.run(run_all(orchestrator))
+        assert all(result["status"] == "success" for result in results)
+        calls[single_flight] = backend.calls
+        if single_flight:
+            print(f"Single-flight: {orchestrator.single_flight.metrics()}")
+    print(f"Backend calls without coalescing: {calls[False]}, with: {calls[True]}")
+    assert set(calls[True].values()) == {1}
+    assert all(count == 50 for count in calls[False].values())
+
+    # A cancelled waiter leaves the shared call running for the others; the last one cancels it
+    async def cancellation():
+        flights = SingleFlight()
+        started = []
+
+        async def slow_call():
+            started.append(1)
+            await asyncio.sleep(0.1)
+            return "done"
+
+        first = asyncio.ensure_future(flights.run("key", slow_call))
+        second = asyncio.ensure_future(flights.run("key", slow_call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == ("done", True)
+        assert len(started) == 1
+
+        lone = asyncio.ensure_future(flights.run("other", slow_call))
+        await asyncio.sleep(0.01)
+        lone.cancel()
+        await asyncio.sleep(0.01)
+        return flights.metrics()
+
+    metrics = asyncio.run(cancellation())
+    assert metrics == {"executed": 2, "coalesced": 1, "in_flight": 0, "retained": 0, "evicted": 0}
+
+    # Retained calls are reused after landing, but only the most recently used max_retained of them
+    async def retention():
+        flights = SingleFlight(retain=True, max_retained=2)
+        calls = []
+
+        async def call(key):
+            calls.append(key)
+            return key
+
+        for key in ("a", "b", "a", "c", "b", "a"):
+            await flights.run(key, lambda: call(key))
+        return calls, flights.metrics()
+
+    calls, metrics = asyncio.run(retention())
+    assert calls == ["a", "b", "c", "b", "a"]  # b was least recently used when c landed, and so on
+    assert metrics["retained"] == 2 and metrics["evicted"] == 3
+
+    # Failed results are not replayed, and no caller can change the retained result
+    async def retained_statuses():
+        flights = SingleFlight(retain=True)
+        calls = []
+
+        async def call(status):
+            calls.append(status)
+            return AgentResponse(status=status, result={"items": []})
+
+        for _ in range(2):
+            await flights.run("failed", lambda: call("failed"))
+        first, _ = await flights.run("success", lambda: call("success"))  # The caller that ran it
+        first.result["items"].append("mutated")
+        second, shared = await flights.run("success", lambda: call("success"))
+        return calls, second, shared
+
+    calls, second, shared = asyncio.run(retained_statuses())
+    assert calls == ["failed", "failed", "success"]  # The failure ran twice; success was reused
+    assert shared and second.result["items"] == []
+
+def test_single_flight_context():
+    """Test that a shared call runs under no caller's deadline, at the highest class among its callers"""
+    print("\n=== SINGLE FLIGHT CONTEXT TEST ===")
+
+    scheduler = ConsultationScheduler(max_concurrency=1, per_agent_concurrency=64)
+    flights = SingleFlight()
+    order = []
+
+    async def call(label):
+        order.append(label)
+        await asyncio.sleep(0.01)
+        return time_remaining()
+
+    async def submit(label, key=None, priority=None, timeout=None):
+        with priority_scope(priority), deadline_scope(timeout):
+            admitted = lambda: scheduler.run(f"agent-{label}", lambda: call(label))
+            if key is None:
+                return await admitted()
+            return await flights.run(key, admitted)
+
+    async def scenario():
+        blocker = asyncio.ensure_future(submit("blocker"))
+        await asyncio.sleep(0)
+        # A short-budget batch caller starts the shared call, then an interactive caller joins it
+        batch = asyncio.ensure_future(submit("shared", key="k", priority="batch", timeout=0.005))
+        normal = asyncio.ensure_future(submit("normal"))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(submit("shared", key="k", priority="interactive"))
+        await blocker  # The batch caller's budget ran out while the shared call was queued
+        return await asyncio.gather(batch, normal, interactive)
+
+    batch, normal, interactive = asyncio.run(scenario())
+    print(f"Service order: {order}, shared call saw deadline {interactive[0]}")
+    assert order == ["blocker", "shared", "normal"]  # Promoted past the normal call
+    assert batch == (None, False) and interactive == (None, True)  # Run without the first caller's budget
+    assert scheduler.metrics()["priority_classes"]["interactive"]["admitted"] == 1
+
+def test_execute_many():
+    """Test that a batch shares agent calls across consultations and streams results in completion order"""
+    print("\n=== EXECUTE MANY TEST ===")
+
+    templates = [
+        ("Price our new design retainer", {"business_type": "design agency"}),
+        ("Website conversion optimization with comprehensive analysis", {"business_type": "B2B SaaS"}),
+        ("Refresh our brand identity", {"business_type": "design agency"}),
+        ("Plan a content marketing calendar", {"business_type": "consultancy"})
+    ]
+    requests = [ConsultationRequest(objective=objective, context=dict(context))
+                for objective, context in templates * 50]
+
+    backend = CountingBackend()
+    orchestrator = MetaOrchestrator(backend=backend)
+
+    async def run_batch(stats):
+        return [item async for item in orchestrator.execute_many(requests, concurrency=32, stats=stats)]
+
+    stats = {}
+    results = asyncio.run(run_batch(stats))
+    print(f"Batch stats: {stats}")
+    print(f"Backend calls: {sum(backend.calls.values())} for {len(requests)} consultations")
+
+    assert sorted(index for index, _ in results) == list(range(len(requests)))
+    assert all(result["status"] == "success" for _, result in results)
+    assert stats["completed"] == stats["submitted"] == len(requests) and stats["failed"] == 0
+    assert sum(backend.calls.values()) == stats["agent_calls"]
+    assert stats["shared_agent_calls"] > stats["agent_calls"]
+
+    # Each distinct agent call was made once: as many calls as the templates need on their own
+    solo = CountingBackend()
+    solo_orchestrator = MetaOrchestrator(backend=solo)
+    solo_results = [asyncio.run(solo_orchestrator.execute_consultation(request)) for request in requests[:len(templates)]]
+    assert stats["agent_calls"] == sum(solo.calls.values())
+
+    by_index = dict(results)
+    for index, single in enumerate(solo_results):
+        assert by_index[index]["orchestration_pattern"] == single["orchestration_pattern"]
+
+def test_streaming_consultation():
+    """Test that agent responses stream out before the synthesis is ready"""
+    print("\n=== STREAMING CONSULTATION TEST ===")
+
+    orchestrator = MetaOrchestrator()
+    request = ConsultationRequest(
+        objective="Website conversion optimization with comprehensive analysis",
+        context={"business_type": "SaaS", "current_conversion_rate": "2.1%"}
+    )
+
+    async def collect():
+        start = time.perf_counter()
+        events = []
+        async for event in orchestrator.stream_consultation(request):
+            events.append((time.perf_counter() - start, event))
+        return events
+
+    events = asyncio.run(collect())
+    kinds = [event.kind for _, event in events]
+    first_response = next(elapsed for elapsed, event in events if event.kind == "agent_response")
+    synthesis_at, synthesis = events[-1][0], events[-1][1].payload
+    print(f"Events: {kinds}")
+    print(f"First agent response after {first_response * 1000:.0f} ms, synthesis after {synthesis_at * 1000:.0f} ms")
+
+    assert kinds[0] == "analysis" and kinds[-1] == "synthesis"
+    assert synthesis["status"] == "success"
+    streamed_agents = [event.agent for _, event in events if event.kind == "agent_response"]
+    assert sorted(streamed_agents) == sorted(synthesis["contributing_agents"])
+
+def test_consultation_deadline():
+    """Test that an expired deadline cancels stragglers and returns a partial synthesis"""
+    print("\n=== CONSULTATION DEADLINE TEST ===")
+
+    # Nested scopes can only tighten the budget
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert time_remaining() <= 10
+    assert time_remaining() is None
+
+    request = ConsultationRequest(
+        objective="Website conversion optimization with comprehensive analysis",
+        context={"business_type": "SaaS", "current_conversion_rate": "2.1%"}
+    )
+    planned = MetaOrchestrator().analyze_consultation_request(request)["decomposition_strategy"]["parallel_agents"]
+    orchestrator = MetaOrchestrator(backend=StalledAgentBackend(planned[0]), consultation_timeout=0.5)
+
+    start = time.perf_counter()
+    result = asyncio.run(orchestrator.execute_consultation(request))
+    elapsed = time.perf_counter() - start
+    print(f"Returned after {elapsed:.2f}s: {result['status']}, "
+          f"completed {result['contributing_agents']}, pending {result['pending_agents']}")
+    assert elapsed < 1.0
+    assert result["status"] == "partial" and result["deadline_exceeded"]
+    assert result["pending_agents"] == [planned[0]]
+    assert sorted(result["partial_results"]["completed_results"]) == sorted(planned[1:])
+    assert orchestrator.scheduler.metrics()["in_flight"] == 0
+
+    # A per-call timeout overrides the default, and streaming ends with the partial synthesis
+    async def stream():
+        return [event async for event in orchestrator.stream_consultation(request, timeout=0.3)]
+    events = asyncio.run(stream())
+    assert events[-1].kind == "synthesis" and events[-1].payload["deadline_exceeded"]
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    test_concurrency_limits()
+    test_concurrent_consultations()
+    test_adaptive_limits()
+    test_circuit_breaker()
+    test_fair_queueing()
+    test_same_agent_priority()
+    test_single_flight()
+    test_single_flight_context()
+    test_execute_many()
+    test_streaming_consultation()
+    test_consultation_deadline()
+
+    print("\n✅ CONSULTATION SCHEDULER TESTS COMPLETED")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Worker Pool Test Suite
+Tests multi-process consultation dispatch from a shared job queue
+"""
+
+import os
+import time
+import asyncio
+import orchestrator_worker_pool
+from orchestrator_worker_pool import OrchestratorWorkerPool
+from meta_orchestrator import MetaOrchestrator, ConsultationRequest
+from agent_backends import SimulatedBackend
+
+class CrashingBackend(SimulatedBackend):
+    """Simulation whose worker process dies on any consultation about a crash"""
+
+    async def consult(self, agent_name, agent_spec, request):
+        if "crash" in request.objective.lower():
+            os._exit(1)
+        return await super().consult(agent_name, agent_spec, request)
+
+REQUESTS = [
+    ConsultationRequest(objective="Help me price my design services",
+                        context={"business_type": "design agency", "current_pricing": "hourly rates"}),
+    ConsultationRequest(objective="Website conversion optimization with comprehensive analysis",
+                        context={"business_type": "B2B SaaS", "current_conversion_rate": "2.1%"}),
+    ConsultationRequest(objective="Refresh our brand identity", context={"business_type": "design agency"})
+]
+
+def test_worker_pool():
+    """Test that every request completes once, matching in-process results, with work spread across workers"""
+    print("\n=== WORKER POOL TEST ===")
+
+    requests = [ConsultationRequest(objective=template.objective,
+                                    context={**template.context, "client_reference": f"client-{i}"})
+                for i in range(60)
+                for template in (REQUESTS[i % len(REQUESTS)],)]
+
+    with OrchestratorWorkerPool(workers=2, concurrency=4) as pool:
+        start = time.perf_counter()
+        results = list(pool.execute(requests))
+        elapsed = time.perf_counter() - start
+        stats = pool.stats()
+
+    print(f"{len(results)} consultations in {elapsed:.2f}s across {stats['workers']} workers: "
+          f"{stats['completed_by_worker']}")
+    assert sorted(index for index, _ in results) == list(range(len(requests)))
+    assert all(result["status"] == "success" for _, result in results)
+    assert stats["outstanding"] == 0
+    assert all(count > 0 for count in stats["completed_by_worker"].values())
+
+    # Workers route exactly like an in-process orchestrator
+    by_index = dict(results)
+    orchestrator = MetaOrchestrator()
+    for index, request in enumerate(requests[:len(REQUESTS)]):
+        local = asyncio.run(orchestrator.execute_consultation(request))
+        assert by_index[index]["orchestration_pattern"] == local["orchestration_pattern"]
+        assert (by_index[index]["meta_orchestrator"]["analysis"]["agent_candidates"]
+                == local["meta_orchestrator"]["analysis"]["agent_candidates"])
+
+def test_worker_options():
+    """Test that orchestrator options reach the workers and failures come back as results"""
+    print("\n=== WORKER OPTIONS TEST ===")
+
+    with OrchestratorWorkerPool(workers=1, orchestrator_options={"consultation_timeout": 0.0}) as pool:
+        job_id = pool.submit(REQUESTS[0])
+        returned_id, result = pool.get_result(timeout=30)
+
+    print(f"Job {returned_id}: {result['status']}")
+    assert returned_id == job_id
+    assert result["status"] in ("partial", "failed") and result["deadline_exceeded"]
+
+def test_worker_death():
+    """Test that jobs held by a worker that dies fail instead of blocking the pool"""
+    print("\n=== WORKER DEATH TEST ===")
+
+    crash = ConsultationRequest(objective="Crash while pricing design services",
+                                context={"business_type": "design agency"})
+    requests = [REQUESTS[0], crash, REQUESTS[2], REQUESTS[1]]
+
+    with OrchestratorWorkerPool(workers=2, concurrency=1,
+                                orchestrator_options={"backend": CrashingBackend()}) as pool:
+        start = time.perf_counter()
+        results = dict(pool.execute(requests))
+        elapsed = time.perf_counter() - start
+        stats = pool.stats()
+
+    print(f"{len(results)} results in {elapsed:.2f}s, dead workers {stats['dead_workers']}: "
+          f"{ {index: result['status'] for index, result in results.items()} }")
+    assert sorted(results) == list(range(len(requests)))
+    assert results[1]["status"] == "failed" and "exited" in results[1]["errors"]
+    assert all(results[index]["status"] == "success" for index in (0, 2, 3))
+    assert len(stats["dead_workers"]) == 1 and stats["outstanding"] == 0
+
+    # With no worker left, queued jobs fail too
+    with OrchestratorWorkerPool(workers=1, concurrency=1,
+                                orchestrator_options={"backend": CrashingBackend()}) as pool:
+        results = dict(pool.execute([crash, REQUESTS[0], REQUESTS[2]]))
+    assert [results[index]["status"] for index in range(3)] == ["failed"] * 3
+
+def _take_job_and_die(worker_id, jobs, results):
+    """Worker 1 dies right after taking a job, before it can report taking it"""
+    job = jobs.get()
+    if worker_id == 1 and job is not None:
+        os._exit(1)
+    if job is not None:
+        results.put((orchestrator_worker_pool._TAKEN, job[0], worker_id))
+    return job
+
+def test_lost_job():
+    """Test that a job taken by a worker that died before reporting it fails instead of hanging"""
+    print("\n=== LOST JOB TEST ===")
+
+    take_job = orchestrator_worker_pool._take_job
+    orchestrator_worker_pool._take_job = _take_job_and_die  # Inherited by forked workers
+    try:
+        with OrchestratorWorkerPool(workers=2, concurrency=1, start_method="fork") as pool:
+            start = time.perf_counter()
+            results = dict(pool.execute(REQUESTS + REQUESTS[:1]))
+            elapsed = time.perf_counter() - start
+            stats = pool.stats()
+    finally:
+        orchestrator_worker_pool._take_job = take_job
+
+    statuses = {index: result["status"] for index, result in results.items()}
+    print(f"{len(results)} results in {elapsed:.2f}s, dead workers {stats['dead_workers']}: {statuses}")
+    assert sorted(results) == list(range(len(REQUESTS) + 1))
+    lost = [result for result in results.values() if result["status"] == "failed"]
+    assert len(lost) == 1 and "lost" in lost[0]["errors"]
+    assert stats["dead_workers"] == [1] and stats["outstanding"] == 0
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+
+    test_worker_pool()
+    test_worker_options()
+    test_worker_death()
+    test_lost_job()
+
+    print("\n✅ ORCHESTRATOR WORKER POOL TESTS COMPLETED")